@@ -5,3 +5,7 @@ class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.analytics'
     verbose_name = 'Analytics y Reportes'
+    
+    def ready(self):
+        """Importar signals cuando la app esté lista."""
+        import apps.analytics.signals  # noqa
@@ -0,0 +1,171 @@
+"""
+Cache versionado de las secciones del dashboard ejecutivo.
+
+Cada sección se guarda bajo su propia clave junto con la versión con la que fue
+calculada. Los signals de los modelos de los que depende la sección actualizan
+la versión (ver apps.analytics.signals); una entrada con versión vieja se sirve
+igualmente (stale-while-revalidate) mientras una tarea Celery la recalcula, de
+modo que el usuario solo espera un cálculo cuando la cache está completamente fría.
+
+Los reportes parametrizados (CACHED_REPORTS) usan las mismas versiones, pero la
+versión forma parte de la clave: un cambio en los datos simplemente deja de
+encontrar la entrada anterior.
+"""
+import logging
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import services
+
+logger = logging.getLogger(__name__)
+
+# Sección -> (función de cálculo, modelos de los que depende)
+DASHBOARD_SECTIONS = {
+    'projects': (services.compute_projects_stats, ['projects.Project']),
+    'financials': (
+        services.compute_financials,
+        ['projects.Project', 'projects.Task', 'projects.TimeLog', 'projects.TimeEntry'],
+    ),
+    'resources': (services.compute_resources_stats, ['resources.Resource']),
+    'tasks': (services.compute_tasks_stats, ['projects.Task']),
+    'standups': (services.compute_standups_stats, ['standups.StandupLog']),
+    'allocations': (services.compute_allocations_stats, ['projects.Allocation']),
+}
+
+# Reporte -> modelos de los que depende (cacheado por parámetros, ver cached_report)
+CACHED_REPORTS = {
+    'team_mood': ['standups.StandupLog', 'projects.Project', 'resources.Resource'],
+}
+
+KEY_PREFIX = 'analytics:dashboard'
+REFRESH_LOCK_TIMEOUT = 60
+
+
+def _version_key(section: str) -> str:
+    return f'{KEY_PREFIX}:{section}:version'
+
+
+def _entry_key(section: str) -> str:
+    return f'{KEY_PREFIX}:{section}:entry'
+
+
+def _lock_key(section: str) -> str:
+    return f'{KEY_PREFIX}:{section}:refreshing'
+
+
+def _entry_timeout() -> int:
+    return getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def sections_for_model(label: str) -> list:
+    """Secciones y reportes que dependen del modelo `app_label.ModelName`."""
+    names = [name for name, (_, models) in DASHBOARD_SECTIONS.items() if label in models]
+    names.extend(name for name, models in CACHED_REPORTS.items() if label in models)
+    return names
+
+
+def tracked_models() -> set:
+    """Modelos cuyos cambios invalidan alguna sección o reporte."""
+    labels = {label for _, models in DASHBOARD_SECTIONS.values() for label in models}
+    labels.update(label for models in CACHED_REPORTS.values() for label in models)
+    return labels
+
+
+def bump_versions(sections: Iterable[str]):
+    """Invalida las secciones indicadas asignándoles una versión nueva."""
+    version = time.time_ns()
+    cache.set_many({_version_key(section): version for section in sections}, timeout=None)
+
+
+def clear_sections(sections: Iterable[str] = None):
+    """Elimina las entradas cacheadas (por defecto todas): la próxima lectura las calcula en frío."""
+    cache.delete_many([_entry_key(section) for section in (sections or DASHBOARD_SECTIONS)])
+
+
+def compute_section(section: str, version: int = None) -> Any:
+    """Calcula una sección y la guarda junto con la versión vigente al iniciar el cálculo."""
+    if version is None:
+        version = cache.get(_version_key(section))
+    compute, _ = DASHBOARD_SECTIONS[section]
+    value = compute()
+    cache.set(
+        _entry_key(section),
+        {'version': version, 'day': date.today(), 'value': value},
+        timeout=_entry_timeout(),
+    )
+    return value
+
+
+def _schedule_refresh(section: str):
+    """Encola el recálculo de una sección una sola vez (lock en cache)."""
+    if not cache.add(_lock_key(section), 1, timeout=REFRESH_LOCK_TIMEOUT):
+        return
+    from .tasks import refresh_dashboard_section
+    try:
+        refresh_dashboard_section.delay(section)
+    except Exception as e:
+        cache.delete(_lock_key(section))
+        logger.error(f"❌ No se pudo encolar el refresco de '{section}': {e}")
+
+
+def get_dashboard_sections() -> Dict[str, Any]:
+    """
+    Retorna todas las secciones del dashboard leyendo la cache en dos round-trips.
+    Entradas vigentes se devuelven tal cual; entradas viejas (versión o día distinto)
+    se devuelven y se refrescan en background; secciones sin entrada se calculan.
+    """
+    names = list(DASHBOARD_SECTIONS)
+    versions = cache.get_many([_version_key(name) for name in names])
+    entries = cache.get_many([_entry_key(name) for name in names])
+    today = date.today()
+
+    # Versiones desalojadas de la cache: asignar una nueva invalida las entradas previas
+    missing_versions = [name for name in names if _version_key(name) not in versions]
+    if missing_versions:
+        bump_versions(missing_versions)
+        versions.update(cache.get_many([_version_key(name) for name in missing_versions]))
+
+    result = {}
+    for name in names:
+        version = versions.get(_version_key(name))
+        entry = entries.get(_entry_key(name))
+
+        if entry is None:
+            result[name] = compute_section(name, version)
+            continue
+
+        if entry['version'] != version or entry['day'] != today:
+            _schedule_refresh(name)
+        result[name] = entry['value']
+
+    return result
+
+
+def cached_report(name: str, params: tuple, compute: Callable[[], Any]) -> Any:
+    """
+    Retorna un reporte cacheado bajo (nombre, parámetros, versión de datos).
+
+    Args:
+        name: Reporte registrado en CACHED_REPORTS
+        params: Parámetros que identifican la variante (ej: (ventana, día))
+        compute: Callable que calcula el reporte ante un fallo de cache
+    """
+    version = cache.get(_version_key(name))
+    if version is None:
+        bump_versions([name])
+        version = cache.get(_version_key(name))
+
+    key = ':'.join([KEY_PREFIX, name, *(str(p) for p in params), str(version)])
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=_entry_timeout())
+    return value
+
+
+def release_refresh_lock(section: str):
+    cache.delete(_lock_key(section))
@@ -0,0 +1,515 @@
+"""
+Cálculo de las secciones del dashboard ejecutivo.
+Cada función calcula una sección independiente para poder cachearla por separado
+(ver apps.analytics.cache). Los contadores usan agregación condicional: una
+consulta por modelo.
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from apps.core.stats import count_by
+from apps.projects.models import Allocation, Project, Task, TimeEntry, TimeLog
+from apps.resources.capacity import prorated_capacity
+from apps.resources.models import Resource, Role
+from apps.standups.dedup import weighted_avg_sentiment
+from apps.standups.models import StandupLog
+
+
+def compute_projects_stats():
+    """Conteo de proyectos por estado (1 query)."""
+    return count_by(Project.objects.all(), 'status', ['active', 'planning', 'completed', 'on_hold'])
+
+
+def compute_financials():
+    """
+    Métricas financieras agregadas, proyectos activos y proyectos en riesgo.
+    Totales: 1 query por tabla de tiempo. Proyectos activos: 1 query anotada.
+    """
+    zero = Decimal('0.00')
+    totals = [
+        model.objects.aggregate(cost=Sum('cost'), billable=Sum('billable_amount'), hours=Sum('hours'))
+        for model in (TimeLog, TimeEntry)
+    ]
+    total_cost = sum((t['cost'] or zero for t in totals), zero)
+    total_billable = sum((t['billable'] or zero for t in totals), zero)
+    total_hours = sum((t['hours'] or zero for t in totals), zero)
+
+    total_profit = total_billable - total_cost
+    profit_margin = float((total_profit / total_billable * 100)) if total_billable > 0 else 0
+
+    financial_stats = {
+        'total_cost': total_cost,
+        'total_billable': total_billable,
+        'total_profit': total_profit,
+        'profit_margin': profit_margin,
+        'total_hours': total_hours,
+    }
+
+    # Proyectos activos con métricas anotadas en SQL
+    active_projects = []
+    for project in Project.objects.filter(status='active').with_financials().with_completion():
+        active_projects.append({
+            'project': project,
+            'cost': project.sum_cost,
+            'billable': project.sum_billable,
+            'profit': project.sum_billable - project.sum_cost,
+            'margin': float(project.margin_pct),
+            'completion': float(project.completion_pct),
+            'is_over_budget': project_is_over_budget(project, project.sum_cost),
+        })
+
+    # Ordenar por margen (menor a mayor para identificar problemas)
+    active_projects.sort(key=lambda x: x['margin'])
+
+    return {
+        'financial_stats': financial_stats,
+        'active_projects': active_projects,
+        'projects_at_risk': [p for p in active_projects if p['margin'] < 15 or p['is_over_budget']],
+    }
+
+
+def project_is_over_budget(project, total_cost: Decimal) -> bool:
+    """Equivalente a Project.is_over_budget usando un costo ya calculado."""
+    if project.project_type == 'fixed' and project.budget_limit:
+        return total_cost > project.budget_limit
+    elif project.project_type == 't_and_m' and project.max_budget:
+        return total_cost > project.max_budget
+    return False
+
+
+def compute_resources_stats():
+    """Conteo de recursos activos por estado (1 query)."""
+    return count_by(
+        Resource.objects.filter(is_active=True),
+        'status',
+        ['available', 'partially_allocated', 'fully_allocated', 'on_leave'],
+    )
+
+
+def compute_tasks_stats():
+    """Conteo de tareas por estado (1 query)."""
+    return count_by(
+        Task.objects.all(),
+        'status',
+        ['backlog', 'in_progress', 'in_review', 'blocked', 'completed'],
+    )
+
+
+def compute_standups_stats():
+    """Sentimiento de los standups de los últimos 7 días (1 query)."""
+    seven_days_ago = datetime.now().date() - timedelta(days=7)
+
+    stats = count_by(
+        StandupLog.objects.filter(date__gte=seven_days_ago),
+        'sentiment_label',
+        ['positive', 'neutral', 'negative', 'very_negative'],
+        extra={'avg_sentiment': weighted_avg_sentiment()},
+    )
+    stats['total_recent'] = stats.pop('total')
+    stats['avg_sentiment'] = stats['avg_sentiment'] or 0
+    return stats
+
+
+def compute_allocations_stats():
+    """Asignaciones vigentes hoy y horas semanales comprometidas (1 query)."""
+    today = datetime.now().date()
+
+    stats = Allocation.objects.filter(
+        is_active=True,
+        start_date__lte=today,
+        end_date__gte=today
+    ).aggregate(
+        total_active=Count('pk'),
+        total_hours_per_week=Sum('hours_per_week'),
+    )
+    stats['total_hours_per_week'] = stats['total_hours_per_week'] or 0
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Reporte financiero
+# ---------------------------------------------------------------------------
+
+FINANCIAL_BREAKDOWNS = ('client', 'month')
+
+
+def _with_profit(row: dict, cost_key: str = 'cost', billable_key: str = 'billable') -> dict:
+    """Agrega utilidad y margen (%) a un dict con costo y facturación."""
+    cost, billable = row[cost_key], row[billable_key]
+    row['profit'] = billable - cost
+    row['margin'] = float(row['profit'] / billable * 100) if billable > 0 else 0
+    return row
+
+
+def grouped_time_totals(timelog_key, entry_key) -> dict:
+    """
+    Suma horas, costo y facturación de TimeLog + TimeEntry agrupando por una clave.
+    Ejecuta una consulta agrupada por tabla de tiempo (2 queries en total).
+
+    Args:
+        timelog_key: Campo o expresión de agrupación sobre TimeLog (ej: 'task__project__client_name')
+        entry_key: Campo o expresión equivalente sobre TimeEntry (ej: 'project__client_name')
+
+    Returns:
+        Dict {clave: {'hours', 'cost', 'billable'}}
+    """
+    zero = Decimal('0.00')
+    totals = {}
+    for model, key in ((TimeLog, timelog_key), (TimeEntry, entry_key)):
+        key = F(key) if isinstance(key, str) else key
+        rows = model.objects.order_by().annotate(group_key=key).values('group_key').annotate(
+            hours=Sum('hours'),
+            cost=Sum('cost'),
+            billable=Sum('billable_amount'),
+        )
+        for row in rows:
+            bucket = totals.setdefault(row['group_key'], {'hours': zero, 'cost': zero, 'billable': zero})
+            bucket['hours'] += row['hours'] or zero
+            bucket['cost'] += row['cost'] or zero
+            bucket['billable'] += row['billable'] or zero
+    return totals
+
+
+def compute_project_type_stats() -> dict:
+    """
+    Métricas por tipo de proyecto (fixed / t_and_m): cantidad, presupuesto,
+    costo, facturación, utilidad y margen. 3 queries.
+    """
+    zero = Decimal('0.00')
+    totals = grouped_time_totals('task__project__project_type', 'project__project_type')
+    counts = {
+        row['project_type']: row
+        for row in Project.objects.order_by().values('project_type').annotate(
+            count=Count('pk'),
+            total_budget=Sum('budget_limit'),
+        )
+    }
+
+    stats = {}
+    for project_type in ('fixed', 't_and_m'):
+        row = counts.get(project_type, {})
+        money = totals.get(project_type, {})
+        stats[project_type] = _with_profit({
+            'count': row.get('count', 0),
+            'total_budget': row.get('total_budget') or zero,
+            'total_cost': money.get('cost', zero),
+            'total_billable': money.get('billable', zero),
+        }, cost_key='total_cost', billable_key='total_billable')
+    return stats
+
+
+def compute_roles_profitability() -> list:
+    """
+    Rentabilidad por rol requerido de la tarea, ordenada por margen descendente.
+    1 query agrupada sobre TimeLog + 1 query para los roles.
+    """
+    rows = TimeLog.objects.order_by().filter(task__required_role__isnull=False).values(
+        'task__required_role'
+    ).annotate(
+        hours=Sum('hours'),
+        cost=Sum('cost'),
+        billable=Sum('billable_amount'),
+    ).filter(hours__gt=0)
+    rows = list(rows)
+
+    roles = Role.objects.in_bulk([row['task__required_role'] for row in rows])
+    zero = Decimal('0.00')
+    roles_profitability = [
+        _with_profit({
+            'role': roles[row['task__required_role']],
+            'hours': row['hours'],
+            'cost': row['cost'] or zero,
+            'billable': row['billable'] or zero,
+        })
+        for row in rows
+        if row['task__required_role'] in roles
+    ]
+    roles_profitability.sort(key=lambda x: x['margin'], reverse=True)
+    return roles_profitability
+
+
+def compute_margin_ranking(limit: int = 5):
+    """Proyectos activos/completados con mejor y peor margen (1 query anotada)."""
+    projects = Project.objects.filter(status__in=['active', 'completed']).with_financials().order_by(
+        '-margin_pct', 'pk'
+    )
+    ranking = [
+        {
+            'project': project,
+            'cost': project.sum_cost,
+            'billable': project.sum_billable,
+            'profit': project.sum_billable - project.sum_cost,
+            'margin': float(project.margin_pct),
+        }
+        for project in projects
+    ]
+    best_margin = ranking[:limit]
+    worst_margin = ranking[-limit:] if len(ranking) >= limit else []
+    return best_margin, worst_margin
+
+
+def compute_client_breakdown() -> list:
+    """Costo, facturación y margen por cliente, ordenado por facturación (2 queries)."""
+    totals = grouped_time_totals('task__project__client_name', 'project__client_name')
+    rows = [_with_profit({'client': client, **values}) for client, values in totals.items()]
+    rows.sort(key=lambda x: x['billable'], reverse=True)
+    return rows
+
+
+def compute_month_breakdown() -> list:
+    """Costo, facturación y margen por mes calendario, en orden cronológico (2 queries)."""
+    totals = grouped_time_totals(TruncMonth('date'), TruncMonth('date'))
+    rows = [_with_profit({'month': month, **values}) for month, values in totals.items() if month]
+    rows.sort(key=lambda x: x['month'])
+    return rows
+
+
+def compute_financial_report(breakdowns=()) -> dict:
+    """
+    Contexto del reporte financiero con una cantidad de queries constante,
+    independiente de la cantidad de roles y proyectos.
+
+    Args:
+        breakdowns: Desgloses opcionales a incluir ('client', 'month')
+    """
+    type_stats = compute_project_type_stats()
+    best_margin, worst_margin = compute_margin_ranking()
+
+    report = {
+        'fixed_stats': type_stats['fixed'],
+        'tm_stats': type_stats['t_and_m'],
+        'best_margin': best_margin,
+        'worst_margin': worst_margin,
+        'roles_profitability': compute_roles_profitability(),
+        'client_breakdown': None,
+        'month_breakdown': None,
+    }
+    if 'client' in breakdowns:
+        report['client_breakdown'] = compute_client_breakdown()
+    if 'month' in breakdowns:
+        report['month_breakdown'] = compute_month_breakdown()
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Utilización de recursos
+# ---------------------------------------------------------------------------
+
+UTILIZATION_GRANULARITIES = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+OPEN_TASK_STATUSES = ['todo', 'in_progress', 'in_review', 'blocked']
+
+
+def _period_starts(start_date, end_date, granularity: str) -> list:
+    """Inicio de cada período (lunes o día 1) que intersecta la ventana."""
+    if granularity == 'week':
+        current = start_date - timedelta(days=start_date.weekday())
+    else:
+        current = start_date.replace(day=1)
+
+    starts = []
+    while current <= end_date:
+        starts.append(current)
+        if granularity == 'week':
+            current += timedelta(days=7)
+        else:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return starts
+
+
+def compute_resources_utilization(start_date, end_date, granularity: str = 'week') -> dict:
+    """
+    Utilización, costo y facturación por recurso activo en una ventana de fechas,
+    con serie por período (semana o mes).
+
+    Además de los recursos, ejecuta tres consultas agrupadas por recurso
+    (horas por período, proyectos asignados y proyectos con tareas abiertas) que
+    se combinan con búsquedas en diccionarios. La capacidad de la ventana y de
+    cada período recortado se prorratea por días (ver prorated_capacity).
+
+    Args:
+        start_date: Inicio de la ventana (inclusive)
+        end_date: Fin de la ventana (inclusive)
+        granularity: 'week' o 'month'
+    """
+    trunc = UTILIZATION_GRANULARITIES[granularity]
+    resources = list(Resource.objects.filter(is_active=True).select_related('primary_role'))
+
+    # 1) Horas registradas por recurso y período
+    hours_by_resource = {}
+    rows = TimeLog.objects.order_by().filter(date__gte=start_date, date__lte=end_date).annotate(
+        period=trunc('date')
+    ).values('resource', 'period').annotate(hours=Sum('hours'))
+    for row in rows:
+        period = row['period'].date() if isinstance(row['period'], datetime) else row['period']
+        hours_by_resource.setdefault(row['resource'], {})[period] = row['hours'] or Decimal('0.00')
+
+    # 2) Proyectos con asignaciones activas que se solapan con la ventana
+    projects_by_resource = {}
+    for resource_id, project_id in Allocation.objects.order_by().filter(
+        is_active=True,
+        start_date__lte=end_date,
+        end_date__gte=start_date,
+    ).values_list('resource', 'project').distinct():
+        projects_by_resource.setdefault(resource_id, set()).add(project_id)
+
+    # 3) Proyectos desde tareas abiertas asignadas (sin importar Allocation)
+    for resource_id, project_id in Task.objects.order_by().filter(
+        assigned_resource__isnull=False,
+        status__in=OPEN_TASK_STATUSES,
+    ).values_list('assigned_resource', 'project').distinct():
+        projects_by_resource.setdefault(resource_id, set()).add(project_id)
+
+    periods = _period_starts(start_date, end_date, granularity)
+    resources_data = []
+    for resource in resources:
+        by_period = hours_by_resource.get(resource.pk, {})
+        hours_logged = sum(by_period.values(), Decimal('0.00'))
+
+        capacity = prorated_capacity(resource, start_date, end_date)
+        utilization = float((hours_logged / capacity * 100)) if capacity > 0 else 0
+
+        # Serie por período, recortando cada período a la ventana solicitada y
+        # prorrateando su capacidad por los días que quedan dentro
+        series = []
+        for i, period_start in enumerate(periods):
+            next_start = periods[i + 1] if i + 1 < len(periods) else end_date + timedelta(days=1)
+            window_start = max(period_start, start_date)
+            window_end = min(next_start - timedelta(days=1), end_date)
+            period_cap = prorated_capacity(resource, window_start, window_end)
+            period_hours = by_period.get(period_start, Decimal('0.00'))
+            series.append({
+                'period': period_start,
+                'hours': period_hours,
+                'utilization': float(period_hours / period_cap * 100) if period_cap > 0 else 0,
+            })
+
+        # Costos y facturación usando effective_rate
+        cost = hours_logged * resource.internal_cost
+        billable = hours_logged * resource.effective_rate
+        profit = billable - cost
+
+        resources_data.append({
+            'resource': resource,
+            'hours_logged': hours_logged,
+            'capacity': capacity,
+            'utilization': utilization,
+            'series': series,
+            'cost': cost,
+            'billable': billable,
+            'profit': profit,
+            'margin': float((profit / billable * 100)) if billable > 0 else 0,
+            'active_projects': len(projects_by_resource.get(resource.pk, ())),
+            'status': resource.status,
+        })
+
+    # Ordenar por utilización (menor a mayor)
+    resources_data.sort(key=lambda x: x['utilization'])
+
+    return {
+        'resources_data': resources_data,
+        'periods': periods,
+        'avg_utilization': (
+            sum(r['utilization'] for r in resources_data) / len(resources_data) if resources_data else 0
+        ),
+        'total_cost': sum((r['cost'] for r in resources_data), Decimal('0.00')),
+        'total_billable': sum((r['billable'] for r in resources_data), Decimal('0.00')),
+        'total_profit': sum((r['profit'] for r in resources_data), Decimal('0.00')),
+        'underutilized': [r for r in resources_data if r['utilization'] < 60],
+        'optimal': [r for r in resources_data if 60 <= r['utilization'] <= 90],
+        'overutilized': [r for r in resources_data if r['utilization'] > 90],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Estado de ánimo del equipo
+# ---------------------------------------------------------------------------
+
+SENTIMENT_LABELS = ['positive', 'neutral', 'negative', 'very_negative']
+
+
+def _mood_aggregates(with_counts: bool = True) -> dict:
+    """Agregados de sentimiento para values().annotate()."""
+    aggregates = {
+        'avg_sentiment': weighted_avg_sentiment(),
+        'total_standups': Count('pk'),
+    }
+    if with_counts:
+        for label in SENTIMENT_LABELS:
+            aggregates[label] = Count('pk', filter=Q(sentiment_label=label))
+    return aggregates
+
+
+def compute_team_mood(window_days: int = 30, today=None) -> dict:
+    """
+    Sentimiento por proyecto, por recurso y tendencias diaria/semanal de una ventana.
+    Cada bloque es una sola consulta agrupada con conteos condicionales.
+
+    Args:
+        window_days: Días hacia atrás desde `today`
+        today: Fecha de referencia (por defecto hoy)
+    """
+    today = today or datetime.now().date()
+    standups = StandupLog.objects.order_by().filter(date__gte=today - timedelta(days=window_days))
+
+    # Mood por proyecto activo
+    project_rows = list(
+        standups.filter(project__status='active').values('project').annotate(**_mood_aggregates())
+    )
+    projects = Project.objects.in_bulk([row['project'] for row in project_rows])
+    projects_mood = [
+        {
+            'project': projects[row['project']],
+            'avg_sentiment': row['avg_sentiment'] or 0,
+            'total_standups': row['total_standups'],
+            'mood_counts': {label: row[label] for label in SENTIMENT_LABELS},
+        }
+        for row in project_rows
+        if row['project'] in projects
+    ]
+    projects_mood.sort(key=lambda x: x['avg_sentiment'])
+
+    # Mood por recurso activo
+    resource_rows = list(
+        standups.filter(resource__is_active=True).values('resource').annotate(
+            **_mood_aggregates(with_counts=False)
+        )
+    )
+    resources = Resource.objects.in_bulk([row['resource'] for row in resource_rows])
+    resources_mood = [
+        {
+            'resource': resources[row['resource']],
+            'avg_sentiment': row['avg_sentiment'] or 0,
+            'total_standups': row['total_standups'],
+        }
+        for row in resource_rows
+        if row['resource'] in resources
+    ]
+    resources_mood.sort(key=lambda x: x['avg_sentiment'])
+
+    # Tendencias temporales
+    mood_by_day = list(
+        standups.values('date').annotate(
+            avg_sentiment=weighted_avg_sentiment(),
+            count=Count('pk'),
+        ).order_by('date')
+    )
+    mood_by_week = list(
+        standups.annotate(week=TruncWeek('date')).values('week').annotate(
+            **_mood_aggregates()
+        ).order_by('week')
+    )
+
+    return {
+        'projects_mood': projects_mood,
+        'resources_mood': resources_mood,
+        'mood_by_day': mood_by_day,
+        'mood_by_week': mood_by_week,
+        'overall_avg': standups.aggregate(avg=weighted_avg_sentiment())['avg'] or 0,
+    }
@@ -0,0 +1,30 @@
+"""
+Signals para invalidar el cache versionado del dashboard y de los reportes cuando cambian los datos.
+"""
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .cache import bump_versions, sections_for_model, tracked_models
+
+
+def invalidate_dashboard_sections(sender, **kwargs):
+    """
+    Incrementa la versión de las secciones y reportes que dependen del modelo modificado.
+    Se ejecuta tras el commit para que el recálculo no lea datos sin confirmar.
+    """
+    sections = sections_for_model(sender._meta.label)
+    if sections:
+        transaction.on_commit(lambda: bump_versions(sections))
+
+
+for _label in tracked_models():
+    _model = apps.get_model(_label)
+    post_save.connect(
+        invalidate_dashboard_sections, sender=_model,
+        dispatch_uid=f'analytics_dashboard_save_{_label}',
+    )
+    post_delete.connect(
+        invalidate_dashboard_sections, sender=_model,
+        dispatch_uid=f'analytics_dashboard_delete_{_label}',
+    )
@@ -0,0 +1,23 @@
+"""
+Celery tasks for analytics app.
+"""
+from celery import shared_task
+
+
+@shared_task
+def refresh_dashboard_section(section: str):
+    """
+    Recalcula una sección del dashboard y la guarda con la versión vigente.
+    Invocada en background cuando se sirve una entrada desactualizada.
+    """
+    from .cache import DASHBOARD_SECTIONS, compute_section, release_refresh_lock
+
+    if section not in DASHBOARD_SECTIONS:
+        return f"Unknown dashboard section {section}"
+
+    try:
+        compute_section(section)
+    finally:
+        release_refresh_lock(section)
+
+    return f"Refreshed dashboard section {section}"
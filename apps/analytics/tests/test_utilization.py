@@ -0,0 +1,31 @@
+"""Tests del reporte de utilización de recursos."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from apps.analytics.services import compute_resources_utilization
+
+
+@pytest.mark.django_db
+def test_clipped_periods_prorate_capacity_by_days(make_role, make_resource, make_project):
+    from apps.projects.models import TimeLog
+
+    role = make_role()
+    resource = make_resource(primary_role=role, availability_percentage=100)
+    task = make_project().tasks.create(title='Tarea', required_role=role, estimated_hours=Decimal('80.00'))
+    TimeLog.objects.create(task=task, resource=resource, date=date(2025, 1, 2), hours=Decimal('20.00'))
+    TimeLog.objects.create(task=task, resource=resource, date=date(2025, 1, 13), hours=Decimal('8.00'))
+
+    # Miércoles 1 a lunes 13: 5 días de la primera semana, una completa y 1 día de la última
+    report = compute_resources_utilization(date(2025, 1, 1), date(2025, 1, 13))
+    row = next(r for r in report['resources_data'] if r['resource'] == resource)
+
+    assert round(row['capacity'], 2) == Decimal('74.29')  # 40h × 13/7
+    assert [(p['period'], p['hours']) for p in row['series']] == [
+        (date(2024, 12, 30), Decimal('20.00')),
+        (date(2025, 1, 6), Decimal('0.00')),
+        (date(2025, 1, 13), Decimal('8.00')),
+    ]
+    assert [round(p['utilization'], 1) for p in row['series']] == [70.0, 0.0, 140.0]
+    assert round(row['utilization'], 1) == 37.7
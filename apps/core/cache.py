@@ -0,0 +1,26 @@
+"""
+Backend de cache Redis instrumentado para métricas de aciertos/fallos por request.
+"""
+from django.core.cache.backends.redis import RedisCache
+
+from .performance import record_cache_access
+
+_MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """RedisCache que reporta hits/misses al middleware de rendimiento."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            record_cache_access(misses=1)
+            return default
+        record_cache_access(hits=1)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        result = super().get_many(keys, version)
+        record_cache_access(hits=len(result), misses=len(keys) - len(result))
+        return result
@@ -0,0 +1,335 @@
+"""
+Comando para generar un dataset sintético realista a escala configurable.
+Útil para benchmarks de rendimiento (ver benchmarks/conftest.py).
+
+Todas las inserciones usan bulk_create por lotes: no se disparan signals
+(p.ej. sincronización con Qdrant) y los campos auto-calculados (cost,
+billable_amount, logged_hours) se calculan aquí mismo.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.projects.models import Allocation, Project, Stage, Task, TimeEntry, TimeLog
+from apps.resources.models import Resource, Role
+from apps.standups.models import StandupLog
+
+SKILLS = [
+    'Python', 'Django', 'React', 'TypeScript', 'Java', 'SQL', 'PostgreSQL', 'AWS',
+    'Docker', 'Kubernetes', 'GraphQL', 'Scrum', 'Selenium', 'Figma', 'Terraform',
+]
+
+FIRST_NAMES = ['Ana', 'Carlos', 'Laura', 'Andrés', 'María', 'Juan', 'Camila', 'Felipe', 'Sofía', 'Diego']
+LAST_NAMES = ['Gómez', 'Rodríguez', 'Martínez', 'López', 'García', 'Pérez', 'Ramírez', 'Torres']
+
+DID_TEMPLATES = [
+    'Terminé la integración de {skill} con el módulo de pagos',
+    'Completé las pruebas del servicio de {skill}',
+    'Avance en la migración a {skill}, buen progreso',
+    'Revisé el código del equipo y corregí un error en {skill}',
+    'Trabajé en la documentación de la API',
+]
+WILL_DO_TEMPLATES = [
+    'Continuar con la implementación en {skill}',
+    'Preparar la demo para el cliente',
+    'Refactorizar el módulo de reportes',
+    'Desplegar a staging',
+]
+BLOCKER_TEMPLATES = [
+    '', '', '', '', 'Sin bloqueos',
+    'Bloqueado por cliente, esperando credenciales',
+    'Problema con el ambiente de pruebas, muy lento',
+    'Retraso en la entrega del diseño',
+]
+
+
+class Command(BaseCommand):
+    help = 'Genera un dataset sintético (roles, recursos, proyectos, tareas, asignaciones, horas y standups)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--roles', type=int, default=40)
+        parser.add_argument('--resources', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=5000)
+        parser.add_argument('--stages-per-project', type=int, default=4)
+        parser.add_argument('--tasks-per-project', type=int, default=20)
+        parser.add_argument('--team-size', type=int, default=4, help='Asignaciones por proyecto')
+        parser.add_argument('--timelogs', type=int, default=5_000_000)
+        parser.add_argument('--timeentries-per-project', type=int, default=10)
+        parser.add_argument('--standups', type=int, default=500_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--prefix',
+            default='SYN',
+            help='Prefijo de códigos generados (permite varias cargas en la misma base)',
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        self.today = date.today()
+
+        roles = self._create_roles(options['roles'])
+        resources = self._create_resources(options['resources'], roles)
+        projects = self._create_projects(options['projects'])
+        stages = self._create_stages(projects, options['stages_per_project'])
+        allocations = self._create_allocations(projects, resources, options['team_size'])
+        tasks = self._create_tasks(projects, stages, roles, allocations, options['tasks_per_project'])
+        self._create_timelogs(tasks, resources, options['timelogs'])
+        self._create_timeentries(projects, allocations, resources, options['timeentries_per_project'])
+        self._create_standups(allocations, options['standups'])
+
+        self.stdout.write(self.style.SUCCESS('✓ Dataset sintético generado'))
+
+    # --- helpers -------------------------------------------------------------
+
+    def _bulk_create(self, model, objects):
+        """Inserta en lotes dentro de una transacción por lote."""
+        created = []
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                created.extend(model.objects.bulk_create(objects[start:start + self.batch_size]))
+        self.stdout.write(f'  - {model._meta.verbose_name_plural}: {len(created)}')
+        return created
+
+    def _stream_bulk_create(self, model, generator):
+        """Inserta objetos de un generador sin materializarlos todos en memoria."""
+        total = 0
+        batch = []
+        for obj in generator:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+                if total % (self.batch_size * 20) == 0:
+                    self.stdout.write(f'    {model._meta.verbose_name_plural}: {total}...')
+        if batch:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            total += len(batch)
+        self.stdout.write(f'  - {model._meta.verbose_name_plural}: {total}')
+        return total
+
+    def _random_date(self, start: date, end: date) -> date:
+        span = max((end - start).days, 0)
+        return start + timedelta(days=self.rng.randint(0, span))
+
+    # --- generadores por entidad ---------------------------------------------
+
+    def _create_roles(self, count):
+        categories = [c for c, _ in Role.CATEGORY_CHOICES]
+        seniorities = [s for s, _ in Role.SENIORITY_CHOICES]
+        roles = [
+            Role(
+                name=f'{self.prefix} Role {i}',
+                code=f'{self.prefix}-R{i}',
+                category=self.rng.choice(categories),
+                seniority=self.rng.choice(seniorities),
+                standard_rate=Decimal(self.rng.randint(60, 250) * 1000),
+                required_skills=self.rng.sample(SKILLS, 3),
+            )
+            for i in range(count)
+        ]
+        return self._bulk_create(Role, roles)
+
+    def _create_resources(self, count, roles):
+        statuses = [s for s, _ in Resource.STATUS_CHOICES]
+        resources = []
+        for i in range(count):
+            role = self.rng.choice(roles)
+            resources.append(Resource(
+                primary_role=role,
+                employee_id=f'{self.prefix}-E{i}',
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f'{self.prefix.lower()}.{i}@example.com',
+                internal_cost=(role.standard_rate * Decimal(self.rng.uniform(0.4, 0.8))).quantize(Decimal('0.01')),
+                skills_vector=[
+                    {'name': skill, 'level': self.rng.randint(1, 5)}
+                    for skill in self.rng.sample(SKILLS, self.rng.randint(2, 6))
+                ],
+                status=self.rng.choice(statuses),
+                availability_percentage=self.rng.choice([50, 80, 100, 100]),
+            ))
+        return self._bulk_create(Resource, resources)
+
+    def _create_projects(self, count):
+        statuses = ['draft', 'planning', 'active', 'active', 'active', 'on_hold', 'completed', 'cancelled']
+        clients = [f'Cliente {i}' for i in range(max(count // 20, 1))]
+        projects = []
+        for i in range(count):
+            start = self.today - timedelta(days=self.rng.randint(0, 720))
+            end = start + timedelta(days=self.rng.randint(60, 365))
+            project_type = self.rng.choice(['fixed', 'fixed', 't_and_m'])
+            fixed_price = Decimal(self.rng.randint(50, 800) * 1_000_000)
+            projects.append(Project(
+                code=f'{self.prefix}-{i:06d}',
+                name=f'Proyecto sintético {i}',
+                client_name=self.rng.choice(clients),
+                project_type=project_type,
+                status=self.rng.choice(statuses),
+                priority=self.rng.choice(['low', 'medium', 'high', 'critical']),
+                fixed_price=fixed_price if project_type == 'fixed' else None,
+                budget_limit=fixed_price * Decimal('0.7') if project_type == 'fixed' else None,
+                hourly_rate=Decimal(self.rng.randint(80, 200) * 1000) if project_type == 't_and_m' else None,
+                max_budget=Decimal(self.rng.randint(50, 500) * 1_000_000) if project_type == 't_and_m' else None,
+                start_date=start,
+                end_date=end,
+            ))
+        return self._bulk_create(Project, projects)
+
+    def _create_stages(self, projects, per_project):
+        stages = [
+            Stage(project=project, name=f'Sprint {n + 1}', order=n, status='planned')
+            for project in projects
+            for n in range(per_project)
+        ]
+        created = self._bulk_create(Stage, stages)
+        by_project = {}
+        for stage in created:
+            by_project.setdefault(stage.project_id, []).append(stage)
+        return by_project
+
+    def _create_allocations(self, projects, resources, team_size):
+        allocations = []
+        for project in projects:
+            for resource in self.rng.sample(resources, min(team_size, len(resources))):
+                allocations.append(Allocation(
+                    project=project,
+                    resource=resource,
+                    start_date=project.start_date,
+                    end_date=project.end_date,
+                    hours_per_week=Decimal(self.rng.choice([8, 10, 16, 20])),
+                    is_active=project.status not in ('completed', 'cancelled'),
+                ))
+        created = self._bulk_create(Allocation, allocations)
+        by_project = {}
+        for allocation in created:
+            by_project.setdefault(allocation.project_id, []).append(allocation)
+        return by_project
+
+    def _create_tasks(self, projects, stages, roles, allocations, per_project):
+        statuses = [s for s, _ in Task.STATUS_CHOICES]
+        tasks = []
+        for project in projects:
+            team = allocations.get(project.pk, [])
+            project_stages = stages.get(project.pk, [])
+            for n in range(per_project):
+                allocation = self.rng.choice(team) if team and self.rng.random() < 0.8 else None
+                tasks.append(Task(
+                    project=project,
+                    stage=self.rng.choice(project_stages) if project_stages else None,
+                    title=f'Tarea {n} de {project.code}',
+                    status=self.rng.choice(statuses),
+                    priority=self.rng.choice(['low', 'medium', 'high', 'critical']),
+                    required_role=allocation.resource.primary_role if allocation else self.rng.choice(roles),
+                    estimated_hours=Decimal(self.rng.randint(4, 120)),
+                    assigned_resource=allocation.resource if allocation else None,
+                    due_date=self._random_date(project.start_date, project.end_date),
+                ))
+        return self._bulk_create(Task, tasks)
+
+    def _create_timelogs(self, tasks, resources, total):
+        """Genera TimeLogs en streaming y actualiza Task.logged_hours con bulk_update."""
+        resources_by_id = {r.pk: r for r in resources}
+        roles_rate = {}
+        for task in tasks:
+            roles_rate[task.pk] = task.required_role.standard_rate
+
+        assigned = [t for t in tasks if t.assigned_resource_id] or tasks
+        logged = {}
+
+        def generate():
+            for _ in range(total):
+                task = self.rng.choice(assigned)
+                resource = resources_by_id.get(task.assigned_resource_id) or self.rng.choice(resources)
+                hours = Decimal(self.rng.choice([1, 2, 2, 3, 4, 4, 6, 8]))
+                logged[task.pk] = logged.get(task.pk, Decimal('0.00')) + hours
+                yield TimeLog(
+                    task_id=task.pk,
+                    resource_id=resource.pk,
+                    date=self._random_date(self.today - timedelta(days=365), self.today),
+                    hours=hours,
+                    cost=hours * resource.internal_cost,
+                    billable_amount=hours * roles_rate[task.pk],
+                )
+
+        self._stream_bulk_create(TimeLog, generate())
+
+        for task in tasks:
+            task.logged_hours = logged.get(task.pk, Decimal('0.00'))
+        Task.objects.bulk_update(tasks, ['logged_hours'], batch_size=self.batch_size)
+
+    def _create_timeentries(self, projects, allocations, resources, per_project):
+        def generate():
+            for project in projects:
+                team = allocations.get(project.pk) or []
+                for _ in range(per_project):
+                    resource = self.rng.choice(team).resource if team else self.rng.choice(resources)
+                    hours = Decimal(self.rng.choice([1, 2, 4]))
+                    if project.project_type == 't_and_m' and project.hourly_rate:
+                        rate = project.hourly_rate
+                    else:
+                        rate = resource.primary_role.standard_rate
+                    yield TimeEntry(
+                        project=project,
+                        resource=resource,
+                        date=self._random_date(project.start_date, min(project.end_date, self.today)),
+                        hours=hours,
+                        cost=hours * resource.internal_cost,
+                        billable_amount=hours * rate,
+                        category=self.rng.choice(['Gestión', 'Reuniones', 'Overhead']),
+                    )
+
+        self._stream_bulk_create(TimeEntry, generate())
+
+    def _create_standups(self, allocations, total):
+        """Genera standups únicos por (recurso, proyecto, fecha) en días hábiles."""
+        pairs = [a for team in allocations.values() for a in team]
+        if not pairs:
+            return
+
+        labels = [
+            (0.6, 'positive'), (0.35, 'positive'), (0.0, 'neutral'),
+            (-0.05, 'neutral'), (-0.3, 'negative'), (-0.7, 'very_negative'),
+        ]
+        per_pair = max(total // len(pairs), 1)
+
+        def generate():
+            produced = 0
+            for allocation in pairs:
+                end = min(allocation.end_date, self.today)
+                day = end
+                count = 0
+                while count < per_pair and day >= allocation.start_date and produced < total:
+                    if day.weekday() < 5:
+                        skill = self.rng.choice(SKILLS)
+                        blockers = self.rng.choice(BLOCKER_TEMPLATES)
+                        score, label = self.rng.choice(labels)
+                        yield StandupLog(
+                            resource_id=allocation.resource_id,
+                            project_id=allocation.project_id,
+                            date=day,
+                            what_i_did=self.rng.choice(DID_TEMPLATES).format(skill=skill),
+                            what_i_will_do=self.rng.choice(WILL_DO_TEMPLATES).format(skill=skill),
+                            blockers=blockers,
+                            has_blockers=bool(blockers.strip()),
+                            hours_logged=Decimal(self.rng.choice([6, 7, 8])),
+                            sentiment_score=score,
+                            sentiment_label=label,
+                            sentiment_confidence=0.5,
+                            keywords=[skill.lower()],
+                            nlp_processed=True,
+                            requires_attention=label in ('negative', 'very_negative'),
+                        )
+                        count += 1
+                        produced += 1
+                    day -= timedelta(days=1)
+
+        self._stream_bulk_create(StandupLog, generate())
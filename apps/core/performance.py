@@ -0,0 +1,324 @@
+"""
+Instrumentación de rendimiento por request.
+Registra cantidad de queries SQL, tiempo de DB, aciertos/fallos de cache y latencia
+por nombre de URL, detecta N+1 (queries duplicados) y expone histogramas agregados
+en formato de texto Prometheus.
+
+Agregación entre workers: cada proceso (worker de gunicorn) acumula sus métricas en
+memoria y publica periódicamente una instantánea en la cache compartida (Redis). El
+endpoint /metrics/ suma las instantáneas de todos los workers vivos, así que cada
+scrape ve el total del despliegue sin importar qué worker responda. La instantánea de
+un worker que terminó expira a los PERF_METRICS_WORKER_TTL segundos; los contadores
+agregados bajan en ese momento y Prometheus lo trata como un reinicio de contador.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('apps.core.performance')
+
+# Buckets de los histogramas (segundos para tiempos, unidades para queries)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_current_stats: ContextVar[Optional['RequestStats']] = ContextVar('perf_request_stats', default=None)
+
+
+class RequestStats:
+    """Contadores acumulados durante un request instrumentado."""
+
+    __slots__ = ('query_count', 'db_time', 'cache_hits', 'cache_misses', 'statements')
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.statements: Counter = Counter()
+
+    def top_duplicates(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Retorna las sentencias SQL repetidas más de una vez (candidatas a N+1)."""
+        return [(sql, count) for sql, count in self.statements.most_common(limit) if count > 1]
+
+
+def record_cache_access(hits: int = 0, misses: int = 0):
+    """Registra accesos a cache en el request instrumentado actual (si existe)."""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+class QueryRecorder:
+    """
+    Wrapper de ejecución SQL (connection.execute_wrapper).
+    Django entrega el SQL con placeholders, por lo que sentencias idénticas con
+    distintos parámetros se agrupan naturalmente para detectar N+1.
+    """
+
+    def __init__(self, stats: RequestStats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.db_time += time.perf_counter() - start
+            self.stats.query_count += 1
+            self.stats.statements[sql] += 1
+
+
+class Histogram:
+    """Histograma acumulativo compatible con el formato Prometheus."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Registro en memoria de métricas por vista del proceso actual.
+    publish() guarda una instantánea en la cache compartida y render() suma las de
+    todos los workers (ver el docstring del módulo).
+    """
+
+    METRICS = (
+        ('sigrp_request_duration_seconds', 'Tiempo total del request', DURATION_BUCKETS),
+        ('sigrp_request_db_seconds', 'Tiempo acumulado en la base de datos', DURATION_BUCKETS),
+        ('sigrp_request_queries', 'Cantidad de queries SQL por request', QUERY_COUNT_BUCKETS),
+    )
+    COUNTERS = (
+        ('sigrp_cache_hits_total', 'Aciertos de cache por vista'),
+        ('sigrp_cache_misses_total', 'Fallos de cache por vista'),
+    )
+
+    WORKERS_KEY = 'perf:metrics:workers'
+    SNAPSHOT_KEY = 'perf:metrics:worker:{}'
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], float] = {}
+        self._worker_id = worker_id
+        self._next_publish = 0.0
+
+    @property
+    def worker_id(self) -> str:
+        """Host y pid del proceso (calculado en cada llamada: el pid cambia tras un fork)."""
+        return self._worker_id or f'{socket.gethostname()}:{os.getpid()}'
+
+    def observe(self, view: str, stats: RequestStats, wall_time: float):
+        values = (wall_time, stats.db_time, stats.query_count)
+        with self._lock:
+            for (name, _, buckets), value in zip(self.METRICS, values):
+                histogram = self._histograms.get((name, view))
+                if histogram is None:
+                    histogram = self._histograms[(name, view)] = Histogram(buckets)
+                histogram.observe(value)
+            for name, value in (
+                ('sigrp_cache_hits_total', stats.cache_hits),
+                ('sigrp_cache_misses_total', stats.cache_misses),
+            ):
+                self._counters[(name, view)] = self._counters.get((name, view), 0) + value
+
+        if time.monotonic() >= self._next_publish:
+            self.publish()
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict:
+        """Copia serializable de las métricas del proceso."""
+        with self._lock:
+            return {
+                'histograms': {
+                    key: (list(h.counts), h.total, h.count) for key, h in self._histograms.items()
+                },
+                'counters': dict(self._counters),
+            }
+
+    def publish(self):
+        """
+        Guarda la instantánea del proceso en la cache compartida y lo anota en el índice
+        de workers. Se llama cada PERF_METRICS_PUBLISH_INTERVAL segundos desde observe()
+        y antes de cada render(). Un fallo de la cache se registra y no afecta al request.
+        """
+        from django.core.cache import cache
+
+        ttl = getattr(settings, 'PERF_METRICS_WORKER_TTL', 300)
+        self._next_publish = time.monotonic() + getattr(settings, 'PERF_METRICS_PUBLISH_INTERVAL', 10)
+        worker_id = self.worker_id
+        try:
+            cache.set(self.SNAPSHOT_KEY.format(worker_id), self.snapshot(), timeout=ttl)
+            # Read-modify-write sin lock: una entrada perdida por una carrera se
+            # recupera en la siguiente publicación de ese worker
+            now = time.time()
+            workers = {
+                worker: seen for worker, seen in (cache.get(self.WORKERS_KEY) or {}).items()
+                if seen >= now - ttl
+            }
+            workers[worker_id] = now
+            cache.set(self.WORKERS_KEY, workers, timeout=None)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron publicar las métricas del worker {worker_id}: {e}")
+
+    def collect(self) -> Tuple[Dict, Dict, int]:
+        """
+        Suma las instantáneas de todos los workers vivos.
+        Si la cache no responde, devuelve solo las métricas de este proceso.
+
+        Returns:
+            (histogramas {(métrica, vista): (counts, total, count)}, contadores, workers sumados)
+        """
+        from django.core.cache import cache
+
+        self.publish()
+        try:
+            workers = cache.get(self.WORKERS_KEY) or {}
+            snapshots = list(cache.get_many([self.SNAPSHOT_KEY.format(w) for w in workers]).values())
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron leer las métricas de los workers: {e}")
+            snapshots = []
+        if not snapshots:
+            snapshots = [self.snapshot()]
+
+        histograms: Dict[Tuple[str, str], Tuple[List[int], float, int]] = {}
+        counters: Dict[Tuple[str, str], float] = {}
+        for snapshot in snapshots:
+            for key, (counts, total, count) in snapshot['histograms'].items():
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = (list(counts), total, count)
+                else:
+                    histograms[key] = (
+                        [a + b for a, b in zip(merged[0], counts)], merged[1] + total, merged[2] + count,
+                    )
+            for key, value in snapshot['counters'].items():
+                counters[key] = counters.get(key, 0) + value
+        return histograms, counters, len(snapshots)
+
+    def render(self) -> str:
+        """Serializa las métricas agregadas de todos los workers en formato de texto Prometheus 0.0.4."""
+        histograms, counters, worker_count = self.collect()
+        lines = [
+            '# HELP sigrp_metrics_workers Workers cuyas métricas se agregaron en este scrape',
+            '# TYPE sigrp_metrics_workers gauge',
+            f'sigrp_metrics_workers {worker_count}',
+        ]
+        for name, help_text, buckets in self.METRICS:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for (metric, view), (counts, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                labels = f'view="{view}"'
+                for bound, bucket_count in zip(buckets, counts):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {bucket_count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'{name}_sum{{{labels}}} {total}')
+                lines.append(f'{name}_count{{{labels}}} {count}')
+        for name, help_text in self.COUNTERS:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for (metric, view), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{{view="{view}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+# Instancia global del registro (por proceso; render() agrega todos los workers)
+registry = MetricsRegistry()
+
+
+class PerformanceMonitoringMiddleware:
+    """
+    Middleware de instrumentación apto para producción.
+
+    Solo instrumenta una fracción de los requests (PERF_SAMPLE_RATE) para mantener
+    el overhead despreciable. Los requests que exceden los presupuestos configurados
+    (PERF_QUERY_BUDGET, PERF_DB_TIME_BUDGET_MS, PERF_WALL_TIME_BUDGET_MS) se registran
+    en el log con los SQL más duplicados.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PERF_MONITORING_ENABLED', True)
+        self.sample_rate = float(getattr(settings, 'PERF_SAMPLE_RATE', 1.0))
+        self.query_budget = int(getattr(settings, 'PERF_QUERY_BUDGET', 50))
+        self.db_time_budget = float(getattr(settings, 'PERF_DB_TIME_BUDGET_MS', 500)) / 1000
+        self.wall_time_budget = float(getattr(settings, 'PERF_WALL_TIME_BUDGET_MS', 1000)) / 1000
+        self.top_duplicates = int(getattr(settings, 'PERF_TOP_DUPLICATES', 5))
+
+    def __call__(self, request):
+        if not self.enabled or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(QueryRecorder(stats)))
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        wall_time = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else 'unresolved'
+
+        registry.observe(view, stats, wall_time)
+        self._check_budgets(request, view, stats, wall_time)
+
+        return response
+
+    def _check_budgets(self, request, view: str, stats: RequestStats, wall_time: float):
+        """Registra en el log los requests que exceden algún presupuesto."""
+        if (
+            stats.query_count <= self.query_budget
+            and stats.db_time <= self.db_time_budget
+            and wall_time <= self.wall_time_budget
+        ):
+            return
+
+        duplicates = stats.top_duplicates(self.top_duplicates)
+        duplicates_text = '\n'.join(f'  {count}x {sql[:300]}' for sql, count in duplicates)
+        logger.warning(
+            "⚠️ Request lento %s %s (%s): %d queries, DB %.1fms, total %.1fms, "
+            "cache %d hits / %d misses%s",
+            request.method,
+            request.path,
+            view,
+            stats.query_count,
+            stats.db_time * 1000,
+            wall_time * 1000,
+            stats.cache_hits,
+            stats.cache_misses,
+            f"\nQueries duplicados (posible N+1):\n{duplicates_text}" if duplicates else '',
+        )
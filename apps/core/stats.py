@@ -0,0 +1,33 @@
+"""
+Helpers de estadísticas reutilizables por las vistas (contadores por estado, etc.).
+"""
+from typing import Dict, Iterable, Optional
+
+from django.db.models import Count, Q, QuerySet
+
+
+def count_by(
+    queryset: QuerySet,
+    field: str,
+    values: Iterable[str],
+    extra: Optional[Dict] = None,
+) -> Dict:
+    """
+    Cuenta registros por valor de un campo en UNA sola consulta (agregación condicional).
+
+    Args:
+        queryset: QuerySet base (ya filtrado)
+        field: Campo a discriminar (ej: 'status', 'sentiment_label')
+        values: Valores a contar; cada uno se convierte en una clave del resultado
+        extra: Agregados adicionales a calcular en la misma consulta (ej: {'avg': Avg(...)})
+
+    Returns:
+        Dict con 'total', una clave por cada valor y las claves de `extra`
+        Ejemplo: {'total': 10, 'active': 4, 'completed': 6}
+    """
+    aggregates = {'total': Count('pk')}
+    for value in values:
+        aggregates[value] = Count('pk', filter=Q(**{field: value}))
+    if extra:
+        aggregates.update(extra)
+    return queryset.order_by().aggregate(**aggregates)
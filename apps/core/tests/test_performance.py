@@ -0,0 +1,62 @@
+import pytest
+
+from apps.core.performance import MetricsRegistry, RequestStats
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    from django.core.cache import cache
+    cache.clear()
+
+
+def make_stats(queries, cache_hits=0):
+    stats = RequestStats()
+    stats.query_count = queries
+    stats.db_time = 0.01
+    stats.cache_hits = cache_hits
+    return stats
+
+
+def test_render_aggregates_every_worker():
+    worker_a = MetricsRegistry(worker_id='web-1:100')
+    worker_b = MetricsRegistry(worker_id='web-1:101')
+    worker_a.observe('dashboard', make_stats(3, cache_hits=2), 0.02)
+    worker_b.observe('dashboard', make_stats(7, cache_hits=1), 0.2)
+    worker_b.observe('project_detail', make_stats(12), 0.3)
+    worker_b.publish()
+
+    output = worker_a.render()
+
+    assert 'sigrp_metrics_workers 2' in output
+    assert 'sigrp_request_queries_count{view="dashboard"} 2' in output
+    assert 'sigrp_request_queries_sum{view="dashboard"} 10' in output
+    assert 'sigrp_request_queries_bucket{view="dashboard",le="5"} 1' in output
+    assert 'sigrp_request_queries_count{view="project_detail"} 1' in output
+    assert 'sigrp_cache_hits_total{view="dashboard"} 3' in output
+    assert 'pid=' not in output
+
+
+def test_render_publishes_latest_local_observations():
+    worker = MetricsRegistry(worker_id='web-1:100')
+    worker.observe('dashboard', make_stats(3), 0.02)
+    # Dentro del intervalo de publicación: solo queda en memoria
+    worker.observe('dashboard', make_stats(4), 0.02)
+
+    assert 'sigrp_request_queries_count{view="dashboard"} 2' in worker.render()
+
+
+def test_expired_worker_is_dropped(settings):
+    from django.core.cache import cache
+
+    settings.PERF_METRICS_WORKER_TTL = 1
+    worker_a = MetricsRegistry(worker_id='web-1:100')
+    worker_b = MetricsRegistry(worker_id='web-1:101')
+    worker_a.observe('dashboard', make_stats(3), 0.02)
+    worker_b.observe('dashboard', make_stats(4), 0.02)
+    cache.delete(MetricsRegistry.SNAPSHOT_KEY.format('web-1:101'))
+
+    output = worker_a.render()
+
+    assert 'sigrp_metrics_workers 1' in output
+    assert 'sigrp_request_queries_count{view="dashboard"} 1' in output
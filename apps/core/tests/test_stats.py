@@ -0,0 +1,58 @@
+"""Tests de count_by (agregación condicional en una sola consulta)."""
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import Avg, Sum
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.stats import count_by
+from apps.projects.models import Project
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def projects(make_project):
+    statuses = ['active', 'active', 'active', 'completed', 'on_hold']
+    return [
+        make_project(status=status, budget_limit=Decimal(1000 * (i + 1)))
+        for i, status in enumerate(statuses)
+    ]
+
+
+def test_count_by_counts_each_value_in_one_query(projects):
+    with CaptureQueriesContext(connection) as ctx:
+        counts = count_by(Project.objects.all(), 'status', ['active', 'completed', 'on_hold'])
+
+    assert counts == {'total': 5, 'active': 3, 'completed': 1, 'on_hold': 1}
+    assert len(ctx.captured_queries) == 1
+
+
+def test_count_by_values_without_rows_are_zero(projects):
+    counts = count_by(Project.objects.all(), 'status', ['cancelled', 'draft'])
+    assert counts == {'total': 5, 'cancelled': 0, 'draft': 0}
+
+
+def test_count_by_respects_queryset_filter(projects):
+    queryset = Project.objects.exclude(status='completed')
+    assert count_by(queryset, 'status', ['active', 'completed']) == {'total': 4, 'active': 3, 'completed': 0}
+
+
+def test_count_by_ignores_queryset_ordering(projects):
+    counts = count_by(Project.objects.order_by('-budget_limit'), 'status', ['active'])
+    assert counts == {'total': 5, 'active': 3}
+
+
+def test_count_by_adds_extra_aggregates(projects):
+    counts = count_by(
+        Project.objects.all(), 'status', ['active'],
+        extra={'budget': Sum('budget_limit'), 'avg_budget': Avg('budget_limit')},
+    )
+    assert counts['active'] == 3
+    assert counts['budget'] == Decimal('15000')
+    assert counts['avg_budget'] == Decimal('3000')
+
+
+def test_count_by_on_empty_queryset():
+    assert count_by(Project.objects.none(), 'status', ['active']) == {'total': 0, 'active': 0}
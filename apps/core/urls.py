@@ -8,4 +8,5 @@ app_name = 'core'
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
@@ -1,10 +1,27 @@
 """
 Core views - Home y páginas generales.
 """
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 
+from .performance import registry
+
 
 def home(request):
     """Vista principal del sistema."""
     return render(request, 'core/home.html')
+
+
+def metrics(request):
+    """
+    Endpoint de métricas en formato Prometheus.
+    Accesible para usuarios staff o IPs listadas en PERF_METRICS_ALLOWED_IPS.
+    """
+    allowed_ips = getattr(settings, 'PERF_METRICS_ALLOWED_IPS', settings.INTERNAL_IPS)
+    is_staff = request.user.is_authenticated and request.user.is_staff
+    if not is_staff and request.META.get('REMOTE_ADDR') not in allowed_ips:
+        return HttpResponseForbidden()
+
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
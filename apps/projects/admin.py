@@ -77,33 +77,42 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """Anota las métricas financieras en SQL para evitar consultas por fila."""
+        return super().get_queryset(request).with_financials().with_completion()
+    
     def display_total_cost(self, obj):
         """Muestra el costo total con formato."""
-        return f"${obj.total_cost:,.2f}"
+        return f"${obj.sum_cost:,.2f}"
     display_total_cost.short_description = 'Costo Total'
+    display_total_cost.admin_order_field = 'sum_cost'
     
     def display_profit_margin(self, obj):
         """Muestra el margen de ganancia con formato."""
-        margin = obj.profit_margin
+        margin = obj.margin_pct
         color = 'green' if margin > obj.profit_margin_target else 'red'
         return f'<span style="color: {color};">{margin:.2f}%</span>'
     display_profit_margin.short_description = 'Margen'
+    display_profit_margin.admin_order_field = 'margin_pct'
     display_profit_margin.allow_tags = True
     
     def display_total_logged_hours(self, obj):
         """Muestra horas registradas."""
-        return f"{obj.total_logged_hours:.2f}h"
+        return f"{obj.sum_hours:.2f}h"
     display_total_logged_hours.short_description = 'Horas Registradas'
+    display_total_logged_hours.admin_order_field = 'sum_hours'
     
     def display_total_billable(self, obj):
         """Muestra monto facturable."""
-        return f"${obj.total_billable:,.2f}"
+        return f"${obj.sum_billable:,.2f}"
     display_total_billable.short_description = 'Total Facturable'
+    display_total_billable.admin_order_field = 'sum_billable'
     
     def display_completion(self, obj):
         """Muestra porcentaje de completitud."""
-        return f"{obj.completion_percentage:.1f}%"
+        return f"{obj.completion_pct:.1f}%"
     display_completion.short_description = 'Completitud'
+    display_completion.admin_order_field = 'completion_pct'
 
 
 @admin.register(Stage)
@@ -134,17 +143,22 @@ class StageAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """Anota horas y progreso de las tareas en un solo query."""
+        return super().get_queryset(request).select_related('project').with_progress()
+    
     def display_progress(self, obj):
         """Muestra progreso de la etapa."""
-        return f"{obj.progress_percentage:.1f}%"
+        return f"{obj.progress_pct:.1f}%"
     display_progress.short_description = 'Progreso'
+    display_progress.admin_order_field = 'progress_pct'
     
     def display_total_logged_hours(self, obj):
-        return f"{obj.total_logged_hours:.2f}h"
+        return f"{obj.sum_logged_hours:.2f}h"
     display_total_logged_hours.short_description = 'Horas Registradas'
     
     def display_total_planned_hours(self, obj):
-        return f"{obj.total_planned_hours:.2f}h"
+        return f"{obj.sum_planned_hours:.2f}h"
     display_total_planned_hours.short_description = 'Horas Planificadas'
     
     def display_actual_cost(self, obj):
@@ -196,6 +210,12 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """Carga rol/recurso con JOIN y anota completitud y variación de costo."""
+        return super().get_queryset(request).select_related(
+            'project', 'stage__project', 'required_role', 'assigned_resource__primary_role'
+        ).with_costs()
+    
     def display_planned_value(self, obj):
         return f"${obj.planned_value:,.2f}"
     display_planned_value.short_description = 'Valor Planificado'
@@ -219,16 +239,18 @@ class TaskAdmin(admin.ModelAdmin):
     display_hours_variance.allow_tags = True
     
     def display_completion(self, obj):
-        pct = obj.completion_percentage
+        pct = obj.completion_pct
         return f"{pct:.1f}%"
     display_completion.short_description = 'Completitud'
+    display_completion.admin_order_field = 'completion_pct'
     
     def display_variance(self, obj):
         """Muestra si estÃ¡ sobre/bajo presupuesto."""
-        if obj.is_over_budget:
+        if obj.cost_variance_value > 0:
             return 'âš ï¸ Sobre presupuesto'
         return 'âœ… En presupuesto'
     display_variance.short_description = 'Estado'
+    display_variance.admin_order_field = 'cost_variance_value'
 
 
 @admin.register(TimeLog)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:37
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0004_add_manual_progress_percentage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="actual_cost",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=Decimal("0.00"),
+                help_text="Auto-calculado por update_project_metrics: costo de TimeLog + TimeEntry",
+                max_digits=14,
+                verbose_name="Costo Real Acumulado (COP)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="actual_hours_logged",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=Decimal("0.00"),
+                help_text="Auto-calculado por update_project_metrics: horas de TimeLog + TimeEntry",
+                max_digits=12,
+                verbose_name="Horas Reales Registradas",
+            ),
+        ),
+    ]
@@ -3,6 +3,8 @@ Modelos para la gestión de proyectos con lógica financiera dual.
 Implementa la separación entre Planificado (Role-based) y Real (Resource-based).
 """
 from django.db import models
+from django.db.models import Case, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Least, NullIf
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from decimal import Decimal
@@ -10,6 +12,132 @@ from apps.core.models import AuditableModel
 from apps.resources.models import Role, Resource
 
 
+# Tipos de salida para anotaciones financieras calculadas en la base de datos
+MONEY_OUTPUT = models.DecimalField(max_digits=16, decimal_places=2)
+PERCENT_OUTPUT = models.DecimalField(max_digits=9, decimal_places=2)
+
+
+def _sum_subquery(queryset, group_field: str, sum_field: str):
+    """
+    Subquery correlacionada que suma `sum_field` agrupando por `group_field`.
+    Evita el fan-out de JOINs al combinar varias relaciones en una anotación.
+    """
+    subquery = queryset.values(group_field).annotate(
+        total=Sum(sum_field)
+    ).values('total').order_by()
+
+    return Coalesce(Subquery(subquery, output_field=MONEY_OUTPUT), Value(Decimal('0.00')),
+                    output_field=MONEY_OUTPUT)
+
+
+def task_completion_expression(prefix: str = ''):
+    """
+    Expresión SQL equivalente a Task.completion_percentage.
+    Usa el porcentaje manual si existe, sino (logged_hours / estimated_hours) * 100 con tope 100.
+    """
+    return Case(
+        When(**{f'{prefix}manual_progress_percentage__isnull': False},
+             then=F(f'{prefix}manual_progress_percentage')),
+        When(**{f'{prefix}estimated_hours': 0}, then=Value(Decimal('0.00'))),
+        default=Least(
+            F(f'{prefix}logged_hours') * Value(Decimal('100')) / F(f'{prefix}estimated_hours'),
+            Value(Decimal('100.00')),
+        ),
+        output_field=PERCENT_OUTPUT,
+    )
+
+
+class ProjectQuerySet(models.QuerySet):
+    """QuerySet con anotaciones financieras para evitar N+1 en listados."""
+
+    def with_financials(self):
+        """
+        Anota métricas equivalentes a las propiedades calculadas de Project:
+            - sum_hours: total_logged_hours
+            - sum_cost: total_cost
+            - sum_billable: total_billable
+            - margin_pct: profit_margin
+        """
+        timelogs = TimeLog.objects.filter(task__project=OuterRef('pk'))
+        entries = TimeEntry.objects.filter(project=OuterRef('pk'))
+
+        return self.annotate(
+            sum_hours=_sum_subquery(timelogs, 'task__project', 'hours')
+            + _sum_subquery(entries, 'project', 'hours'),
+            sum_cost=_sum_subquery(timelogs, 'task__project', 'cost')
+            + _sum_subquery(entries, 'project', 'cost'),
+            sum_billable=_sum_subquery(timelogs, 'task__project', 'billable_amount')
+            + _sum_subquery(entries, 'project', 'billable_amount'),
+        ).annotate(
+            margin_pct=Case(
+                When(sum_billable__gt=0, then=(
+                    (F('sum_billable') - F('sum_cost')) * Value(Decimal('100')) / F('sum_billable')
+                )),
+                default=Value(Decimal('0.00')),
+                output_field=PERCENT_OUTPUT,
+            ),
+        )
+
+    def with_completion(self):
+        """Anota completion_pct: promedio de avance de tareas ponderado por horas estimadas."""
+        weighted = Task.objects.filter(project=OuterRef('pk')).values('project').annotate(
+            pct=Sum(task_completion_expression() * F('estimated_hours'))
+            / NullIf(Sum('estimated_hours'), Value(Decimal('0.00')))
+        ).values('pct').order_by()
+
+        return self.annotate(
+            completion_pct=Coalesce(
+                Subquery(weighted, output_field=PERCENT_OUTPUT),
+                Value(Decimal('0.00')),
+                output_field=PERCENT_OUTPUT,
+            )
+        )
+
+
+class StageQuerySet(models.QuerySet):
+    """QuerySet de etapas con horas agregadas de sus tareas."""
+
+    def with_progress(self):
+        """Anota sum_logged_hours, sum_planned_hours y progress_pct (equivale a progress_percentage)."""
+        return self.annotate(
+            sum_logged_hours=Coalesce(Sum('tasks__logged_hours'), Value(Decimal('0.00')),
+                                      output_field=MONEY_OUTPUT),
+            sum_planned_hours=Coalesce(Sum('tasks__estimated_hours'), Value(Decimal('0.00')),
+                                       output_field=MONEY_OUTPUT),
+        ).annotate(
+            progress_pct=Case(
+                When(sum_planned_hours__gt=0, then=(
+                    F('sum_logged_hours') * Value(Decimal('100')) / F('sum_planned_hours')
+                )),
+                default=Value(Decimal('0.00')),
+                output_field=PERCENT_OUTPUT,
+            ),
+        )
+
+
+class TaskQuerySet(models.QuerySet):
+    """QuerySet de tareas con la lógica dual de costos calculada en SQL."""
+
+    def with_costs(self):
+        """
+        Anota:
+            - completion_pct: completion_percentage
+            - cost_variance_value: cost_variance (actual_cost_projection - planned_value)
+        Requiere los JOINs a required_role y assigned_resource (un solo query).
+        """
+        actual_cost = F('logged_hours') * Coalesce(
+            F('assigned_resource__internal_cost'), Value(Decimal('0.00'))
+        )
+        planned_value = F('estimated_hours') * F('required_role__standard_rate')
+
+        return self.annotate(
+            completion_pct=task_completion_expression(),
+            cost_variance_value=models.ExpressionWrapper(
+                actual_cost - planned_value, output_field=MONEY_OUTPUT
+            ),
+        )
+
+
 class Project(AuditableModel):
     """
     Proyecto con arquitectura financiera dual: Fixed Price vs Time & Materials.
@@ -140,7 +268,25 @@ class Project(AuditableModel):
         verbose_name="Margen de Ganancia Objetivo (%)",
         help_text="Porcentaje de margen esperado"
     )
-    
+
+    # --- MÉTRICAS DESNORMALIZADAS (actualizadas por Celery) ---
+
+    actual_hours_logged = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name="Horas Reales Registradas",
+        help_text="Auto-calculado por update_project_metrics: horas de TimeLog + TimeEntry"
+    )
+
+    actual_cost = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name="Costo Real Acumulado (COP)",
+        help_text="Auto-calculado por update_project_metrics: costo de TimeLog + TimeEntry"
+    )
+
     # Fechas
     start_date = models.DateField(
         null=True,
@@ -178,6 +324,8 @@ class Project(AuditableModel):
         verbose_name="Activo"
     )
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Proyecto"
         verbose_name_plural = "Proyectos"
@@ -397,6 +545,8 @@ class Stage(AuditableModel):
         verbose_name="Notas"
     )
 
+    objects = StageQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Etapa"
         verbose_name_plural = "Etapas"
@@ -597,6 +747,8 @@ class Task(AuditableModel):
         verbose_name="Notas"
     )
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Tarea"
         verbose_name_plural = "Tareas"
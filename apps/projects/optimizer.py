@@ -0,0 +1,524 @@
+"""
+Optimizador de composición de equipo bajo presupuesto.
+
+A partir de la demanda pendiente del proyecto (horas de tareas no cerradas por
+required_role, repartidas en la ventana del proyecto) y del pool de recursos
+elegibles por rol (rol principal o candidatos precalculados en RoleCandidate),
+arma un plan de horas/semana por recurso que minimiza el costo (o maximiza el
+margen Σ (tarifa del rol − costo interno) × horas) respetando:
+
+- capacidad: horas libres en la ventana (weekly_capacity menos asignaciones solapadas)
+- fragmentación: a lo sumo `max_projects` proyectos concurrentes por recurso
+  (incluido este; por defecto FRAGMENTATION_THRESHOLD - 1, el máximo que
+  calculate_availability no marca como fragmentado) y ninguna asignación nueva
+  menor a `min_weekly_hours`
+- presupuesto: costo del plan + costo comprometido por las asignaciones vigentes al
+  proyecto en la ventana <= presupuesto restante (budget_limit / max_budget menos
+  el costo real acumulado)
+
+Heurística: construcción greedy por rol (roles más escasos primero, recursos de
+mejor valor primero: menor costo o mayor margen por hora) y búsqueda local con dos
+movimientos — mover horas a un recurso de mejor valor y liberar a un recurso
+multi-rol para cubrir demanda insatisfecha — hasta que ninguna mejora el objetivo
+(demanda sin cubrir, valor). Al aprobar, apply_team_plan amplía las asignaciones
+vigentes al proyecto y crea el resto con un solo bulk_create.
+"""
+import hashlib
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.resources.capacity import weekly_capacity, weeks_in_period
+from apps.resources.models import Resource, Role, RoleCandidate
+
+from .models import Allocation
+from .services import FRAGMENTATION_THRESHOLD
+from .staffing import CLOSED_STATUSES
+
+OBJECTIVES = ('cost', 'margin')
+DEFAULT_MIN_WEEKLY_HOURS = 4.0
+DEFAULT_WINDOW_WEEKS = 12
+HOURS_STEP = 0.5
+MAX_LOCAL_SEARCH_ROUNDS = 50
+EPSILON = 1e-6
+
+
+def _step_down(hours: float) -> float:
+    return int(hours / HOURS_STEP + EPSILON) * HOURS_STEP
+
+
+def _step_up(hours: float) -> float:
+    return math.ceil(hours / HOURS_STEP - EPSILON) * HOURS_STEP
+
+
+@dataclass
+class PlannedAllocation:
+    """Horas/semana propuestas para un recurso, con su reparto por rol."""
+
+    resource: Resource
+    hours_per_week: float
+    roles: Dict[int, float] = field(default_factory=dict)
+
+    @property
+    def weekly_cost(self) -> float:
+        return self.hours_per_week * float(self.resource.internal_cost)
+
+
+@dataclass
+class TeamPlan:
+    """Resultado del optimizador para un proyecto."""
+
+    project: object
+    start_date: date
+    end_date: date
+    weeks: int
+    objective: str
+    budget: Optional[float]
+    committed_cost: float
+    roles: Dict[int, Role]
+    demand: Dict[int, float]
+    allocations: List[PlannedAllocation] = field(default_factory=list)
+    unmet: Dict[int, float] = field(default_factory=dict)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(a.weekly_cost for a in self.allocations) * self.weeks
+
+    @property
+    def total_billable(self) -> float:
+        return sum(
+            hours * float(self.roles[role_id].standard_rate)
+            for a in self.allocations for role_id, hours in a.roles.items()
+        ) * self.weeks
+
+    @property
+    def margin_percentage(self) -> float:
+        if not self.total_billable:
+            return 0.0
+        return round((self.total_billable - self.total_cost) / self.total_billable * 100, 1)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.budget is None or self.committed_cost + self.total_cost <= self.budget + EPSILON
+
+    @property
+    def role_summary(self) -> List[Dict]:
+        """Demanda, cobertura y faltante (h/sem) por rol, para mostrar el plan."""
+        covered = defaultdict(float)
+        for allocation in self.allocations:
+            for role_id, hours in allocation.roles.items():
+                covered[role_id] += hours
+        return [
+            {
+                'role': self.roles[role_id],
+                'demand': demand,
+                'covered': covered[role_id],
+                'unmet': self.unmet.get(role_id, 0.0),
+            }
+            for role_id, demand in sorted(self.demand.items(), key=lambda item: self.roles[item[0]].name)
+        ]
+
+    @property
+    def allocation_rows(self) -> List[Dict]:
+        """Asignaciones propuestas con el reparto por rol y su costo en la ventana."""
+        return [
+            {
+                'resource': a.resource,
+                'hours_per_week': a.hours_per_week,
+                'roles': [(self.roles[role_id], hours) for role_id, hours in sorted(a.roles.items())],
+                'total_cost': a.weekly_cost * self.weeks,
+            }
+            for a in self.allocations
+        ]
+
+    @property
+    def signature(self) -> str:
+        """Huella del plan: permite verificar al aprobar que no cambió desde que se mostró."""
+        key = ';'.join(
+            f'{a.resource.pk}:{a.hours_per_week:.2f}'
+            for a in sorted(self.allocations, key=lambda a: a.resource.pk)
+        )
+        return hashlib.sha256(f'{self.start_date}|{self.end_date}|{key}'.encode()).hexdigest()[:16]
+
+
+class _Solver:
+    """
+    Greedy + búsqueda local sobre horas/semana por (recurso, rol).
+
+    `value[(recurso, rol)]` es lo que aporta al objetivo cada hora/semana: -costo
+    para minimizar costo, tarifa - costo para maximizar margen. `eligible[rol]`
+    debe venir ordenado de mayor a menor valor.
+    """
+
+    def __init__(self, demand, eligible, cost, value, free, min_hours, budget_weekly):
+        self.demand = demand
+        self.eligible = eligible
+        self.cost = cost
+        self.value = value
+        self.free = free
+        self.min_hours = min_hours
+        self.budget_weekly = budget_weekly
+        self.assign: Dict[int, Dict[int, float]] = defaultdict(dict)  # recurso -> {rol: h/sem}
+        self.used: Dict[int, float] = defaultdict(float)
+        self.covered: Dict[int, float] = defaultdict(float)
+        self.weekly_cost = 0.0
+        self.weekly_value = 0.0
+
+    # --- Estado
+    def unmet(self, role_id: int) -> float:
+        return max(0.0, self.demand[role_id] - self.covered[role_id])
+
+    def objective(self) -> Tuple[float, float]:
+        """Orden lexicográfico: primero la demanda sin cubrir, después el valor (a minimizar)."""
+        return round(sum(self.unmet(r) for r in self.demand), 6), round(-self.weekly_value, 6)
+
+    def _move(self, resource_id: int, role_id: int, hours: float):
+        split = self.assign[resource_id]
+        split[role_id] = split.get(role_id, 0.0) + hours
+        if split[role_id] <= EPSILON:
+            del split[role_id]
+        self.used[resource_id] += hours
+        self.covered[role_id] += hours
+        self.weekly_cost += hours * self.cost[resource_id]
+        self.weekly_value += hours * self.value[resource_id, role_id]
+
+    def _budget_hours(self, resource_id: int) -> float:
+        if self.budget_weekly is None:
+            return float('inf')
+        return max(0.0, self.budget_weekly - self.weekly_cost) / max(self.cost[resource_id], EPSILON)
+
+    def _feasible_hours(self, resource_id: int, wanted: float) -> float:
+        """
+        Horas (múltiplo de HOURS_STEP) que el recurso puede tomar según capacidad
+        libre y presupuesto. Una asignación nueva se completa al mínimo de horas
+        si cabe, o no se crea (0).
+        """
+        limit = min(self.free[resource_id] - self.used[resource_id], self._budget_hours(resource_id))
+        hours = _step_down(min(wanted, limit))
+        if self.used[resource_id] <= EPSILON and hours < self.min_hours:
+            hours = self.min_hours if limit >= self.min_hours else 0.0
+        return hours if hours > EPSILON else 0.0
+
+    def _valid_load(self, resource_id: int) -> bool:
+        """Un recurso queda sin asignación o con al menos el mínimo de horas."""
+        used = self.used[resource_id]
+        return used <= EPSILON or used >= self.min_hours - EPSILON
+
+    # --- Construcción
+    def fill(self, role_id: int):
+        """Cubre la demanda pendiente del rol con los elegibles más baratos."""
+        for resource_id in self.eligible[role_id]:
+            need = _step_up(self.unmet(role_id))
+            if need <= EPSILON:
+                return
+            hours = self._feasible_hours(resource_id, need)
+            if hours:
+                self._move(resource_id, role_id, hours)
+
+    def greedy(self):
+        """Roles más escasos (demanda / capacidad elegible) primero."""
+        supply = {
+            role_id: sum(self.free[r] for r in resources) or EPSILON
+            for role_id, resources in self.eligible.items()
+        }
+        for role_id in sorted(self.demand, key=lambda r: (-self.demand[r] / supply[r], r)):
+            self.fill(role_id)
+
+    # --- Búsqueda local
+    def shift_to_better(self) -> bool:
+        """Mueve horas de un recurso a otro de mejor valor elegible para el mismo rol."""
+        improved = False
+        for resource_id in sorted(self.assign, key=lambda r: (-self.cost[r], r)):
+            for role_id, hours in list(self.assign[resource_id].items()):
+                for other_id in self.eligible[role_id]:
+                    if hours <= EPSILON or self.value[other_id, role_id] <= self.value[resource_id, role_id]:
+                        break
+                    if other_id == resource_id:
+                        continue
+                    # Liberar tentativamente todas las horas y ver cuántas toma el otro
+                    self._move(resource_id, role_id, -hours)
+                    moved = self._feasible_hours(other_id, hours)
+                    if moved and moved <= hours + EPSILON:
+                        self._move(other_id, role_id, moved)
+                        self._move(resource_id, role_id, hours - moved)
+                        if self._valid_load(resource_id):
+                            hours -= moved
+                            improved = True
+                            continue
+                        self._move(other_id, role_id, -moved)
+                        self._move(resource_id, role_id, moved)
+                    else:
+                        self._move(resource_id, role_id, hours)
+        return improved
+
+    def free_multi_role(self) -> bool:
+        """
+        Cubre demanda insatisfecha de un rol con horas de un recurso que hoy sirve
+        a otro rol, reemplazándolo allí por otro recurso elegible con capacidad.
+        """
+        improved = False
+        for role_id in sorted(self.demand):
+            for resource_id in self.eligible[role_id]:
+                for other_role, hours in list(self.assign[resource_id].items()):
+                    moved = _step_down(min(self.unmet(role_id), hours))
+                    if other_role == role_id or moved <= EPSILON:
+                        continue
+                    for replacement_id in self.eligible[other_role]:
+                        if replacement_id == resource_id:
+                            continue
+                        if abs(self._feasible_hours(replacement_id, moved) - moved) <= EPSILON:
+                            self._move(resource_id, other_role, -moved)
+                            self._move(resource_id, role_id, moved)
+                            self._move(replacement_id, other_role, moved)
+                            improved = True
+                            break
+        return improved
+
+    def local_search(self):
+        best = self.objective()
+        for _ in range(MAX_LOCAL_SEARCH_ROUNDS):
+            self.shift_to_better()
+            self.free_multi_role()
+            for role_id in sorted(self.demand):
+                self.fill(role_id)
+            current = self.objective()
+            if current >= best:
+                return
+            best = current
+
+
+def _demand_by_role(project) -> Dict[int, float]:
+    """Horas pendientes (estimadas - registradas) de las tareas no cerradas, por rol."""
+    demand = defaultdict(float)
+    for role_id, estimated, logged in project.tasks.exclude(status__in=CLOSED_STATUSES).values_list(
+        'required_role_id', 'estimated_hours', 'logged_hours'
+    ):
+        demand[role_id] += max(float(estimated - logged), 0.0)
+    return demand
+
+
+def plan_window(project, today: Optional[date] = None) -> Tuple[date, date]:
+    """Ventana del plan: desde hoy (o el inicio del proyecto) hasta su fin o el último vencimiento."""
+    today = today or date.today()
+    start = max(today, project.start_date or today)
+    last_due = project.tasks.exclude(status__in=CLOSED_STATUSES).order_by('-due_date').values_list(
+        'due_date', flat=True
+    ).first()
+    end = project.end_date or last_due or start + timedelta(weeks=DEFAULT_WINDOW_WEEKS)
+    return start, max(end, start + timedelta(days=7))
+
+
+def remaining_budget(project) -> Optional[float]:
+    """Presupuesto interno (fixed: budget_limit, T&M: max_budget) menos el costo real acumulado."""
+    budget = project.budget_limit if project.project_type == 'fixed' else project.max_budget
+    if not budget:
+        return None
+    return max(0.0, float(budget - project.total_cost))
+
+
+def optimize_team(
+    project,
+    objective: str = 'cost',
+    budget: Optional[float] = None,
+    min_weekly_hours: float = DEFAULT_MIN_WEEKLY_HOURS,
+    max_projects: int = FRAGMENTATION_THRESHOLD - 1,
+    today: Optional[date] = None,
+) -> TeamPlan:
+    """
+    Propone la composición del equipo para la demanda pendiente del proyecto.
+
+    Args:
+        project: Proyecto
+        objective: 'cost' (cubrir la demanda al menor costo) o 'margin' (maximizar
+            Σ (tarifa del rol - costo interno) × horas; un recurso con costo >= tarifa
+            solo restaría margen y no es elegible)
+        budget: Presupuesto disponible (por defecto remaining_budget); lo que aún
+            costarán las asignaciones vigentes al proyecto en la ventana se descuenta
+        min_weekly_hours: Mínimo de horas/semana de una asignación nueva
+        max_projects: Máximo de proyectos concurrentes por recurso, incluido este
+            (por defecto, uno menos que el umbral de fragmentación)
+        today: Fecha de referencia (por defecto hoy)
+
+    Returns:
+        TeamPlan con las asignaciones propuestas y la demanda sin cubrir por rol
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Objetivo inválido: {objective}")
+
+    start, end = plan_window(project, today)
+    weeks = weeks_in_period(start, end)
+    if budget is None:
+        budget = remaining_budget(project)
+
+    overlap = Q(
+        allocations__is_active=True,
+        allocations__start_date__lte=end,
+        allocations__end_date__gte=start,
+    )
+    resources = {
+        resource.pk: resource
+        for resource in Resource.objects.filter(is_active=True).select_related('primary_role').annotate(
+            allocated_hours=Coalesce(
+                Sum('allocations__hours_per_week', filter=overlap),
+                Value(Decimal('0.00')),
+                output_field=DecimalField(max_digits=7, decimal_places=2),
+            ),
+            own_hours=Coalesce(
+                Sum('allocations__hours_per_week', filter=overlap & Q(allocations__project=project)),
+                Value(Decimal('0.00')),
+                output_field=DecimalField(max_digits=7, decimal_places=2),
+            ),
+            other_projects=Count(
+                'allocations__project', filter=overlap & ~Q(allocations__project=project), distinct=True
+            ),
+        )
+    }
+
+    # Demanda neta semanal: las asignaciones vigentes al proyecto cubren el rol principal del recurso
+    demand = {role_id: hours / weeks for role_id, hours in _demand_by_role(project).items() if hours > 0}
+    for resource in resources.values():
+        if resource.own_hours and resource.primary_role_id in demand:
+            demand[resource.primary_role_id] -= float(resource.own_hours)
+    demand = {role_id: _step_up(hours) for role_id, hours in demand.items() if hours > EPSILON}
+    roles = Role.objects.in_bulk(list(demand))
+
+    # Elegibles por rol: rol principal o candidato precalculado, dentro del límite de fragmentación
+    candidates = defaultdict(set)
+    for role_id, resource_id in RoleCandidate.objects.filter(role_id__in=list(demand)).values_list(
+        'role_id', 'resource_id'
+    ):
+        candidates[role_id].add(resource_id)
+    free = {
+        pk: max(0.0, float(weekly_capacity(resource) - resource.allocated_hours))
+        for pk, resource in resources.items()
+    }
+    cost = {pk: float(resource.internal_cost) for pk, resource in resources.items()}
+    committed_weekly = sum(float(resource.own_hours) * cost[pk] for pk, resource in resources.items())
+    eligible, value = {}, {}
+    for role_id, role in roles.items():
+        for pk, resource in resources.items():
+            if (
+                (resource.primary_role_id == role_id or pk in candidates[role_id])
+                and free[pk] > EPSILON
+                and resource.other_projects + 1 <= max_projects
+            ):
+                value[pk, role_id] = -cost[pk] if objective == 'cost' else float(role.standard_rate) - cost[pk]
+        pool = [pk for (pk, r), v in value.items() if r == role_id and (objective == 'cost' or v > 0)]
+        eligible[role_id] = sorted(pool, key=lambda pk: (-value[pk, role_id], -free[pk], pk))
+
+    solver = _Solver(
+        demand=demand,
+        eligible=eligible,
+        cost=cost,
+        value=value,
+        free=free,
+        min_hours=min_weekly_hours,
+        budget_weekly=None if budget is None else max(0.0, budget / weeks - committed_weekly),
+    )
+    solver.greedy()
+    solver.local_search()
+
+    allocations = sorted(
+        (
+            PlannedAllocation(resource=resources[pk], hours_per_week=sum(split.values()), roles=split)
+            for pk, split in solver.assign.items() if split
+        ),
+        key=lambda a: (a.resource.primary_role.name, a.resource.pk),
+    )
+
+    return TeamPlan(
+        project=project,
+        start_date=start,
+        end_date=end,
+        weeks=weeks,
+        objective=objective,
+        budget=budget,
+        committed_cost=committed_weekly * weeks,
+        roles=roles,
+        demand=demand,
+        allocations=allocations,
+        unmet={role_id: solver.unmet(role_id) for role_id in demand if solver.unmet(role_id) > EPSILON},
+    )
+
+
+def apply_team_plan(plan: TeamPlan) -> List[Allocation]:
+    """
+    Escribe el plan: un recurso con asignación vigente al proyecto en la ventana la
+    amplía (fechas que cubren la ventana y horas sumadas); el resto se crea con un
+    solo bulk_create. Los recursos se bloquean (select_for_update, en orden de id),
+    se re-verifica la capacidad y cada fila pasa por Allocation.clean, por lo que un
+    plan desactualizado falla con ValidationError sin escribir nada.
+
+    Returns:
+        Asignaciones creadas y ampliadas
+    """
+    from apps.analytics.signals import invalidate_dashboard_sections
+
+    if not plan.allocations:
+        return []
+
+    hours = {a.resource.pk: Decimal(str(a.hours_per_week)).quantize(Decimal('0.01'), ROUND_HALF_UP)
+             for a in plan.allocations}
+    with transaction.atomic():
+        locked = Resource.objects.select_for_update().filter(pk__in=list(hours)).order_by('pk')
+        resources = {resource.pk: resource for resource in locked}
+        overlapping = Allocation.objects.filter(
+            resource_id__in=list(hours), is_active=True,
+            start_date__lte=plan.end_date, end_date__gte=plan.start_date,
+        )
+        allocated = dict(
+            overlapping.values('resource_id').annotate(total=Sum('hours_per_week'))
+            .values_list('resource_id', 'total')
+        )
+        # Asignación vigente al proyecto que se amplía (la que termina más tarde)
+        existing = {}
+        for allocation in overlapping.filter(project=plan.project).order_by('end_date', 'pk'):
+            existing[allocation.resource_id] = allocation
+
+        for pk, planned in hours.items():
+            resource = resources.get(pk)
+            if resource is None or not resource.is_active:
+                raise ValidationError(f"El recurso {pk} ya no está activo")
+            if allocated.get(pk, Decimal('0.00')) + planned > weekly_capacity(resource):
+                raise ValidationError(
+                    f"⛔ SOBRECARGA: {resource.full_name} ya no tiene {planned}h/sem libres "
+                    f"entre {plan.start_date} y {plan.end_date}"
+                )
+
+        notes = f"Plan de equipo optimizado ({plan.objective}), {plan.signature}"
+        extended, created = [], []
+        for pk, planned in hours.items():
+            allocation = existing.get(pk)
+            if allocation is not None:
+                allocation.start_date = min(allocation.start_date, plan.start_date)
+                allocation.end_date = max(allocation.end_date, plan.end_date)
+                allocation.hours_per_week += planned
+                allocation.notes = f"{allocation.notes}\n\n{notes}".strip()
+                # save() ejecuta clean() y dispara post_save
+                allocation.save(update_fields=['start_date', 'end_date', 'hours_per_week', 'notes', 'updated_at'])
+                extended.append(allocation)
+                continue
+            allocation = Allocation(
+                project=plan.project,
+                resource=resources[pk],
+                start_date=plan.start_date,
+                end_date=plan.end_date,
+                hours_per_week=planned,
+                notes=notes,
+                is_active=True,
+            )
+            allocation.clean()
+            created.append(allocation)
+
+        # bulk_create no dispara post_save: invalidar el dashboard al commitear
+        created = Allocation.objects.bulk_create(created)
+        invalidate_dashboard_sections(Allocation)
+        return extended + created
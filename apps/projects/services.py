@@ -8,6 +8,9 @@ from django.db.models import Q, Sum
 from typing import Dict, Any
 from apps.resources.models import Resource
 
+# Proyectos concurrentes a partir de los cuales un recurso se considera fragmentado
+FRAGMENTATION_THRESHOLD = 3
+
 
 def calculate_availability(
     resource_id: int,
@@ -83,8 +86,8 @@ def calculate_availability(
     active_project_count = concurrent_projects_query.count()
     concurrent_projects = list(concurrent_projects_query)
     
-    # 7. Detectar fragmentación (>= 3 proyectos simultáneos)
-    is_fragmented = active_project_count >= 3
+    # 7. Detectar fragmentación (>= FRAGMENTATION_THRESHOLD proyectos simultáneos)
+    is_fragmented = active_project_count >= FRAGMENTATION_THRESHOLD
     
     # 8. Calcular porcentaje de utilización
     utilization_percentage = float(
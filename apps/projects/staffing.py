@@ -0,0 +1,253 @@
+"""
+Recomendador de staffing para las tareas sin asignar de un proyecto.
+
+Todas las tareas pendientes se puntúan contra todos los recursos activos en una
+sola pasada vectorizada (matrices NumPy tareas × recursos):
+
+- skills: cobertura de las required_skills del rol requerido (y de los tags de
+  la tarea que sean skills conocidas) por el skills_vector del recurso, ponderada
+  por nivel (1-5). Sin skills requeridas cuenta si el rol principal coincide.
+- margen: (standard_rate del rol requerido - internal_cost) / standard_rate, en [0, 1].
+- capacidad: horas/semana libres en la ventana de la tarea (descontando las
+  asignaciones a otros proyectos) sobre las horas/semana que requiere la tarea, en [0, 1].
+
+El score es la suma ponderada (STAFFING_WEIGHTS) y se devuelve el top-N por tarea.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+from apps.resources.capacity import weekly_capacity, weeks_in_period
+from apps.resources.matching import normalize_skill, skill_names, top_k
+from apps.resources.models import Resource
+
+from .models import Allocation, Task
+from .services import FRAGMENTATION_THRESHOLD
+
+DEFAULT_WEIGHTS = {'skill': 0.5, 'margin': 0.25, 'capacity': 0.25}
+DEFAULT_TOP_N = 3
+DEFAULT_WINDOW_DAYS = 28
+CLOSED_STATUSES = ('completed', 'cancelled')
+MAX_SKILL_LEVEL = 5.0
+
+
+def staffing_weights() -> Dict[str, float]:
+    return {**DEFAULT_WEIGHTS, **getattr(settings, 'STAFFING_WEIGHTS', {})}
+
+
+def task_window(task: Task, project, today: Optional[date] = None) -> tuple:
+    """
+    Ventana de trabajo de una tarea: desde su inicio real (o hoy / inicio del proyecto)
+    hasta su vencimiento (o fin del proyecto, o DEFAULT_WINDOW_DAYS días).
+    """
+    today = today or date.today()
+    start = task.start_date or max(today, project.start_date or today)
+    end = task.due_date or project.end_date or start + timedelta(days=DEFAULT_WINDOW_DAYS)
+    return start, max(start, end)
+
+
+def _allocation_arrays(resource_index: Dict[int, int], **filters):
+    """Asignaciones activas de los recursos como arrays (recurso, inicio, fin, horas, proyecto)."""
+    rows = [
+        (resource_index[resource_id], a_start.toordinal(), a_end.toordinal(), float(hours), project_id)
+        for resource_id, a_start, a_end, hours, project_id in Allocation.objects.filter(
+            is_active=True, resource_id__in=list(resource_index), **filters,
+        ).values_list('resource_id', 'start_date', 'end_date', 'hours_per_week', 'project_id')
+    ]
+    if not rows:
+        return None
+    columns = list(zip(*rows))
+    return (
+        np.array(columns[0], dtype=np.intp),
+        np.array(columns[1]),
+        np.array(columns[2]),
+        np.array(columns[3], dtype=np.float64),
+        np.array(columns[4]),
+    )
+
+
+def skill_scores(
+    task_skills: List[list],
+    task_tags: List[list],
+    resource_skills: List[list],
+    role_match: np.ndarray,
+) -> np.ndarray:
+    """
+    Matriz tareas × recursos de cobertura de skills, en [0, 1].
+
+    Cada tarea requiere las skills de su rol más los tags que sean skills conocidas
+    (de algún recurso); la cobertura es el promedio del nivel (1-5, normalizado) del
+    recurso en esas skills. Tareas sin skills requeridas usan `role_match`.
+    """
+    vocabulary: Dict[str, int] = {}
+    levels = []
+    for col, skills in enumerate(resource_skills):
+        for skill in skills or []:
+            name = normalize_skill(skill.get('name'))
+            if name:
+                level = min(skill.get('level') or 0, MAX_SKILL_LEVEL) / MAX_SKILL_LEVEL
+                levels.append((col, vocabulary.setdefault(name, len(vocabulary)), level))
+    levels_matrix = np.zeros((len(resource_skills), len(vocabulary)), dtype=np.float32)
+    for col, skill_col, level in levels:
+        levels_matrix[col, skill_col] = max(levels_matrix[col, skill_col], level)
+
+    required = np.zeros((len(task_skills), len(vocabulary)), dtype=np.float32)
+    required_count = np.zeros(len(task_skills), dtype=np.float32)
+    for row, (skills, tags) in enumerate(zip(task_skills, task_tags)):
+        names = set(skill_names(skills, normalize=True))
+        names |= set(skill_names(tags, normalize=True)) & vocabulary.keys()
+        required_count[row] = len(names)
+        for name in names & vocabulary.keys():
+            required[row, vocabulary[name]] = 1.0
+
+    return np.where(
+        required_count[:, None] > 0,
+        (required @ levels_matrix.T) / np.maximum(required_count, 1)[:, None],
+        role_match.astype(np.float32),
+    )
+
+
+def overlap_load(t_start: np.ndarray, t_end: np.ndarray, allocations, resource_count: int) -> tuple:
+    """
+    Carga de otras asignaciones en la ventana de cada tarea.
+
+    Args:
+        t_start, t_end: Ordinales de inicio/fin de la ventana de cada tarea
+        allocations: Arrays (recurso, inicio, fin, horas, proyecto) como los de
+            _allocation_arrays, o None
+        resource_count: Cantidad de recursos (columnas)
+
+    Returns:
+        (horas/semana asignadas, proyectos distintos) como matrices tareas × recursos,
+        contando solo las asignaciones que se solapan con la ventana de la tarea.
+    """
+    allocated = np.zeros((len(t_start), resource_count))
+    project_count = np.zeros((len(t_start), resource_count))
+    if allocations is None or not len(allocations[0]):
+        return allocated, project_count
+
+    a_res, a_start, a_end, a_hours, a_project = allocations
+    overlap = (a_start[None, :] <= t_end[:, None]) & (a_end[None, :] >= t_start[:, None])
+    np.add.at(allocated.T, a_res, (overlap * a_hours).T)
+
+    # Proyectos distintos por recurso: una columna por par (recurso, proyecto)
+    pairs, pair_index = np.unique(np.stack([a_res, a_project]), axis=1, return_inverse=True)
+    pair_overlap = np.zeros((len(t_start), pairs.shape[1]), dtype=bool)
+    np.logical_or.at(pair_overlap.T, pair_index.ravel(), overlap.T)
+    np.add.at(project_count.T, pairs[0], pair_overlap.T.astype(np.float64))
+    return allocated, project_count
+
+
+def recommend_staffing(
+    project,
+    tasks: Optional[List[Task]] = None,
+    top_n: int = DEFAULT_TOP_N,
+    today: Optional[date] = None,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Top-N de recursos para cada tarea sin asignar del proyecto.
+
+    Args:
+        project: Proyecto
+        tasks: Tareas a recomendar (por defecto las sin asignar y no cerradas),
+            con required_role precargado
+        top_n: Recomendaciones por tarea
+        today: Fecha de referencia para las ventanas (por defecto hoy)
+
+    Returns:
+        {task_id: [{resource, score, skill_score, margin, capacity_score,
+        remaining_capacity, required_weekly_hours, active_project_count,
+        is_fragmented, has_project_allocation}, ...]} ordenado por score
+    """
+    if tasks is None:
+        tasks = list(
+            project.tasks.filter(assigned_resource__isnull=True)
+            .exclude(status__in=CLOSED_STATUSES)
+            .select_related('required_role')
+        )
+    resources = list(Resource.objects.filter(is_active=True).select_related('primary_role').order_by('id'))
+    if not tasks or not resources:
+        return {}
+
+    resource_index = {resource.id: col for col, resource in enumerate(resources)}
+    windows = [task_window(task, project, today) for task in tasks]
+    t_start = np.array([start.toordinal() for start, _ in windows])
+    t_end = np.array([end.toordinal() for _, end in windows])
+
+    # --- Skills: cobertura ponderada por nivel de las skills requeridas
+    role_match = (
+        np.array([task.required_role_id for task in tasks])[:, None]
+        == np.array([resource.primary_role_id for resource in resources])[None, :]
+    )
+    skill = skill_scores(
+        [task.required_role.required_skills for task in tasks],
+        [task.tags for task in tasks],
+        [resource.skills_vector for resource in resources],
+        role_match,
+    )
+
+    # --- Margen: tarifa del rol requerido vs costo interno del recurso
+    rate = np.array([float(task.required_role.standard_rate) for task in tasks])
+    cost = np.array([float(resource.internal_cost) for resource in resources])
+    margin = (rate[:, None] - cost[None, :]) / np.maximum(rate, 0.01)[:, None]
+
+    # --- Capacidad: horas/semana libres en la ventana de cada tarea (otros proyectos)
+    span_start, span_end = min(start for start, _ in windows), max(end for _, end in windows)
+    others = _allocation_arrays(resource_index, start_date__lte=span_end, end_date__gte=span_start)
+    if others is not None:
+        foreign = others[4] != project.pk
+        others = tuple(column[foreign] for column in others)
+    allocated, project_count = overlap_load(t_start, t_end, others, len(resources))
+
+    capacity = np.array([float(weekly_capacity(resource)) for resource in resources])
+    remaining = np.maximum(capacity[None, :] - allocated, 0.0)
+    pending_hours = np.array([
+        max(float(task.estimated_hours - task.logged_hours), 0.0) for task in tasks
+    ])
+    weeks = np.array([weeks_in_period(start, end) for start, end in windows], dtype=np.float64)
+    required_weekly = pending_hours / weeks
+    capacity_score = np.where(
+        required_weekly[:, None] > 0,
+        np.clip(remaining / np.maximum(required_weekly, 1e-9)[:, None], 0.0, 1.0),
+        (remaining > 0).astype(np.float64),
+    )
+
+    # --- Asignación vigente al proyecto (requerida para asignar la tarea, ver assign_resources)
+    has_allocation = np.zeros((len(tasks), len(resources)), dtype=bool)
+    own = _allocation_arrays(resource_index, project=project)
+    if own is not None:
+        o_res, o_start, o_end, _, _ = own
+        has_due = np.array([task.due_date is not None for task in tasks])
+        due = np.array([(task.due_date or date.min).toordinal() for task in tasks])
+        covers = ~has_due[:, None] | ((o_start[None, :] <= due[:, None]) & (o_end[None, :] >= due[:, None]))
+        np.logical_or.at(has_allocation.T, o_res, covers.T)
+
+    weights = staffing_weights()
+    score = (
+        weights['skill'] * skill
+        + weights['margin'] * np.clip(margin, 0.0, 1.0)
+        + weights['capacity'] * capacity_score
+    )
+
+    # Sin ninguna skill en común el recurso solo se sugiere si no hay otro mejor (margen alto no basta)
+    ranking = score - (skill <= 0)
+
+    recommendations = defaultdict(list)
+    for row, columns in enumerate(top_k(ranking, top_n)):
+        for col in columns:
+            recommendations[tasks[row].id].append({
+                'resource': resources[col],
+                'score': round(float(score[row, col]), 3),
+                'skill_score': round(float(skill[row, col]), 3),
+                'margin': round(float(margin[row, col]) * 100, 1),
+                'capacity_score': round(float(capacity_score[row, col]), 3),
+                'remaining_capacity': round(float(remaining[row, col]), 1),
+                'required_weekly_hours': round(float(required_weekly[row]), 1),
+                'active_project_count': int(project_count[row, col]),
+                'is_fragmented': bool(project_count[row, col] + 1 >= FRAGMENTATION_THRESHOLD),
+                'has_project_allocation': bool(has_allocation[row, col]),
+            })
+    return dict(recommendations)
@@ -5,6 +5,9 @@ from celery import shared_task
 from django.utils import timezone
 from decimal import Decimal
 
+# Cache key del watermark usado por update_project_metrics(incremental=True)
+PROJECT_METRICS_WATERMARK_KEY = 'projects:update_project_metrics:watermark'
+
 
 @shared_task
 def calculate_project_health_scores():
@@ -55,31 +58,89 @@ def calculate_project_health_scores():
 
 
 @shared_task
-def update_project_metrics():
+def update_project_metrics(incremental: bool = False, batch_size: int = 500):
     """
-    Actualiza métricas agregadas de proyectos (actual_hours, actual_cost).
+    Actualiza métricas agregadas de proyectos (actual_hours_logged, actual_cost).
+
+    Calcula horas y costo de TimeLog (vía tarea) y TimeEntry con una consulta
+    agrupada por tabla, combina los totales en memoria y escribe con bulk_update.
+
+    Args:
+        incremental: Si es True, solo recalcula proyectos tocados desde la última
+            ejecución (watermark sobre updated_at guardado en cache). Las
+            eliminaciones de registros solo se reflejan en una ejecución completa
+            (programada a diario en beat, ver config/celery.py).
+        batch_size: Tamaño de los lotes de bulk_update.
     """
-    from .models import Project
+    from django.core.cache import cache
     from django.db.models import Sum
-    
+    from .models import Project, TimeLog, TimeEntry
+
+    started_at = timezone.now()
     projects = Project.objects.filter(is_active=True)
-    
+
+    watermark = cache.get(PROJECT_METRICS_WATERMARK_KEY) if incremental else None
+    if watermark:
+        touched_ids = set(
+            TimeLog.objects.filter(updated_at__gt=watermark)
+            .values_list('task__project_id', flat=True)
+        )
+        touched_ids.update(
+            TimeEntry.objects.filter(updated_at__gt=watermark)
+            .values_list('project_id', flat=True)
+        )
+        touched_ids.update(
+            projects.filter(updated_at__gt=watermark).values_list('pk', flat=True)
+        )
+        projects = projects.filter(pk__in=touched_ids)
+
+    project_ids = projects.values('pk')
+    projects = list(projects.only('pk', 'actual_hours_logged', 'actual_cost'))
+
+    # Una consulta agrupada por tabla de tiempo
+    totals = {project.pk: [Decimal('0.00'), Decimal('0.00')] for project in projects}
+
+    timelog_rows = TimeLog.objects.filter(
+        task__project_id__in=project_ids
+    ).values('task__project_id').annotate(
+        hours=Sum('hours'),
+        cost=Sum('cost'),
+    ).order_by()
+    for row in timelog_rows:
+        entry = totals.get(row['task__project_id'])
+        if entry is None:
+            continue
+        entry[0] += row['hours'] or Decimal('0.00')
+        entry[1] += row['cost'] or Decimal('0.00')
+
+    timeentry_rows = TimeEntry.objects.filter(
+        project_id__in=project_ids
+    ).values('project_id').annotate(
+        hours=Sum('hours'),
+        cost=Sum('cost'),
+    ).order_by()
+    for row in timeentry_rows:
+        entry = totals.get(row['project_id'])
+        if entry is None:
+            continue
+        entry[0] += row['hours'] or Decimal('0.00')
+        entry[1] += row['cost'] or Decimal('0.00')
+
+    # Solo escribir proyectos cuyo valor cambió
+    changed = []
     for project in projects:
-        time_entries = project.time_entries.all()
-        
-        # Sumar horas totales
-        total_hours = time_entries.aggregate(
-            total=Sum('hours')
-        )['total'] or Decimal('0.00')
-        
-        # Sumar costo total
-        total_cost = time_entries.aggregate(
-            total=Sum('cost')
-        )['total'] or Decimal('0.00')
-        
-        # Actualizar proyecto
-        project.actual_hours_logged = total_hours
-        project.actual_cost = total_cost
-        project.save(update_fields=['actual_hours_logged', 'actual_cost', 'updated_at'])
-    
-    return f"Updated {projects.count()} projects"
+        total_hours, total_cost = totals[project.pk]
+        if project.actual_hours_logged != total_hours or project.actual_cost != total_cost:
+            project.actual_hours_logged = total_hours
+            project.actual_cost = total_cost
+            changed.append(project)
+
+    Project.objects.bulk_update(
+        changed,
+        ['actual_hours_logged', 'actual_cost'],
+        batch_size=batch_size
+    )
+
+    cache.set(PROJECT_METRICS_WATERMARK_KEY, started_at, timeout=None)
+
+    return f"Updated {len(changed)} of {len(projects)} projects"
@@ -0,0 +1,136 @@
+"""Tests del solver greedy + búsqueda local del optimizador de equipo."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from apps.projects.optimizer import _Solver, _step_down, _step_up, optimize_team
+
+
+def solve(demand, eligible, cost, free, min_hours=4.0, budget_weekly=None, rate=None):
+    """Arma y resuelve un _Solver; con `rate` ({rol: tarifa}) maximiza margen en vez de minimizar costo."""
+    value = {
+        (resource_id, role_id): (rate[role_id] - cost[resource_id]) if rate else -cost[resource_id]
+        for role_id, resources in eligible.items()
+        for resource_id in resources
+    }
+    eligible = {
+        role_id: sorted(resources, key=lambda r: (-value[r, role_id], -free[r], r))
+        for role_id, resources in eligible.items()
+    }
+    solver = _Solver(demand, eligible, cost, value, free, min_hours, budget_weekly)
+    solver.greedy()
+    solver.local_search()
+    return solver
+
+
+def hours(solver):
+    return {
+        (resource_id, role_id): h
+        for resource_id, split in solver.assign.items()
+        for role_id, h in split.items()
+    }
+
+
+@pytest.mark.parametrize('hours, down, up', [
+    (20.0, 20.0, 20.0),
+    (20.2, 20.0, 20.5),
+    (20.5, 20.5, 20.5),
+    (0.1, 0.0, 0.5),
+])
+def test_hours_are_rounded_to_step(hours, down, up):
+    assert _step_down(hours) == down
+    assert _step_up(hours) == up
+
+
+def test_cheapest_resource_covers_demand():
+    solver = solve({1: 20}, {1: [10, 11]}, cost={10: 50, 11: 20}, free={10: 40, 11: 40})
+    assert hours(solver) == {(11, 1): 20}
+    assert solver.objective() == (0, 20 * 20)
+
+
+def test_demand_spills_over_when_capacity_runs_out():
+    solver = solve({1: 30}, {1: [10, 11]}, cost={10: 20, 11: 50}, free={10: 20, 11: 40})
+    assert hours(solver) == {(10, 1): 20, (11, 1): 10}
+    assert solver.weekly_cost == pytest.approx(20 * 20 + 10 * 50)
+
+
+def test_new_allocation_is_rounded_up_to_min_hours():
+    solver = solve({1: 22}, {1: [10, 11]}, cost={10: 20, 11: 50}, free={10: 20, 11: 40})
+    assert hours(solver) == {(10, 1): 20, (11, 1): 4.0}
+    assert solver.unmet(1) == 0
+
+
+def test_resource_without_min_hours_free_is_skipped():
+    solver = solve({1: 10}, {1: [10, 11]}, cost={10: 20, 11: 50}, free={10: 3, 11: 40})
+    assert hours(solver) == {(11, 1): 10}
+
+
+def test_budget_caps_weekly_cost_and_leaves_demand_unmet():
+    solver = solve({1: 40}, {1: [10]}, cost={10: 10}, free={10: 40}, budget_weekly=250)
+    assert hours(solver) == {(10, 1): 25}
+    assert solver.weekly_cost <= 250
+    assert solver.objective()[0] == 15
+
+
+def test_local_search_frees_multi_role_resource_for_scarce_role():
+    # El rol 2 se cubre primero con el recurso 10 (más barato), que es el único
+    # elegible para el rol 1: la búsqueda local lo reparte y el 11 lo reemplaza.
+    solver = solve(
+        {1: 10, 2: 30},
+        {1: [10], 2: [10, 11]},
+        cost={10: 10, 11: 20},
+        free={10: 20, 11: 20},
+    )
+    assert solver.objective()[0] == 0
+    assert hours(solver) == {(10, 1): 10, (10, 2): 10, (11, 2): 20}
+
+
+def test_margin_objective_prefers_higher_margin_role():
+    # Con margen, el recurso 10 rinde más en el rol 2 (tarifa 100) que en el 1 (tarifa 40)
+    solver = solve(
+        {1: 10, 2: 10},
+        {1: [10, 11], 2: [10, 11]},
+        cost={10: 30, 11: 35},
+        free={10: 10, 11: 10},
+        rate={1: 40, 2: 100},
+    )
+    assert solver.objective()[0] == 0
+    assert solver.weekly_value == pytest.approx(10 * (40 - 35) + 10 * (100 - 30))
+
+
+def test_loads_respect_capacity_and_min_hours():
+    solver = solve(
+        {1: 35, 2: 25, 3: 12},
+        {1: [10, 11, 12], 2: [11, 12, 13], 3: [10, 13]},
+        cost={10: 25, 11: 40, 12: 30, 13: 60},
+        free={10: 20, 11: 16, 12: 24, 13: 8},
+    )
+    for resource_id, used in solver.used.items():
+        assert used <= solver.free[resource_id] + 1e-6
+        assert used <= 1e-6 or used >= solver.min_hours - 1e-6
+
+
+@pytest.mark.django_db
+def test_default_max_projects_stops_before_fragmentation(make_role, make_resource, make_project):
+    from apps.projects.models import Allocation
+
+    role = make_role()
+    project = make_project()
+    project.tasks.create(
+        title='Tarea', required_role=role, estimated_hours=Decimal('520.00'), due_date=date(2025, 3, 31),
+    )
+    # El recurso más barato ya está en 2 proyectos: un tercero lo fragmentaría
+    busy = make_resource(primary_role=role, internal_cost=Decimal('10.00'))
+    idle = make_resource(primary_role=role, internal_cost=Decimal('50.00'))
+    for _ in range(2):
+        Allocation.objects.create(
+            project=make_project(), resource=busy, start_date=date(2025, 1, 1),
+            end_date=date(2025, 12, 31), hours_per_week=Decimal('5.00'),
+        )
+
+    plan = optimize_team(project, today=date(2025, 1, 1))
+    assert {a.resource.pk for a in plan.allocations} == {idle.pk}
+
+    plan = optimize_team(project, max_projects=3, today=date(2025, 1, 1))
+    assert busy.pk in {a.resource.pk for a in plan.allocations}
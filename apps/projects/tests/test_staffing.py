@@ -0,0 +1,67 @@
+"""Tests de las matrices de skills y carga del recomendador de staffing."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from apps.projects.staffing import overlap_load, skill_scores
+
+PYTHON_DEV = [{'name': 'Python', 'level': 5}, {'name': 'Django', 'level': 5}]
+PYTHON_JUNIOR = [{'name': 'python ', 'level': 2}]
+DESIGNER = [{'name': 'Figma', 'level': 4}]
+
+
+def test_skill_scores_average_level_over_required_skills():
+    skill = skill_scores(
+        [['Python', 'Django']],
+        [[]],
+        [PYTHON_DEV, PYTHON_JUNIOR, DESIGNER],
+        np.zeros((1, 3), dtype=bool),
+    )
+    assert skill[0].tolist() == pytest.approx([1.0, 0.2, 0.0])
+
+
+def test_skill_scores_only_counts_tags_that_are_known_skills():
+    skill = skill_scores(
+        [['Python']],
+        [['figma', 'urgente']],
+        [PYTHON_DEV, DESIGNER],
+        np.zeros((1, 2), dtype=bool),
+    )
+    # Requiere python + figma ('urgente' no es skill de nadie)
+    assert skill[0].tolist() == pytest.approx([0.5, 0.4])
+
+
+def test_skill_scores_falls_back_to_role_match_without_required_skills():
+    role_match = np.array([[True, False]])
+    skill = skill_scores([[]], [['sin-skill']], [PYTHON_DEV, DESIGNER], role_match)
+    assert skill.tolist() == [[1.0, 0.0]]
+
+
+def _ordinals(*days):
+    return np.array([day.toordinal() for day in days])
+
+
+def test_overlap_load_sums_hours_and_distinct_projects_in_window():
+    t_start = _ordinals(date(2025, 1, 1), date(2025, 3, 1))
+    t_end = _ordinals(date(2025, 1, 31), date(2025, 3, 31))
+    allocations = (
+        np.array([0, 0, 0, 1], dtype=np.intp),  # recurso
+        _ordinals(date(2025, 1, 1), date(2025, 1, 15), date(2025, 2, 1), date(2024, 12, 1)),
+        _ordinals(date(2025, 1, 20), date(2025, 3, 15), date(2025, 2, 28), date(2025, 12, 31)),
+        np.array([10.0, 8.0, 6.0, 20.0]),  # horas/semana
+        np.array([7, 7, 8, 9]),  # proyecto
+    )
+
+    allocated, project_count = overlap_load(t_start, t_end, allocations, resource_count=3)
+
+    # Tarea 0 (enero): recurso 0 tiene dos asignaciones del proyecto 7 solapadas
+    assert allocated.tolist() == [[18.0, 20.0, 0.0], [8.0, 20.0, 0.0]]
+    assert project_count.tolist() == [[1.0, 1.0, 0.0], [1.0, 1.0, 0.0]]
+
+
+def test_overlap_load_without_allocations_is_zero():
+    t = _ordinals(date(2025, 1, 1))
+    allocated, project_count = overlap_load(t, t, None, resource_count=2)
+    assert allocated.tolist() == [[0.0, 0.0]]
+    assert project_count.tolist() == [[0.0, 0.0]]
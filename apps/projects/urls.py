@@ -13,6 +13,8 @@ urlpatterns = [
     path('<int:pk>/edit/', views.project_edit, name='edit'),
     path('<int:pk>/assign-resources/', views.assign_resources, name='assign_resources'),
     path('<int:pk>/manage-allocations/', views.manage_allocations, name='manage_allocations'),
+    path('<int:pk>/team-optimizer/', views.team_optimizer, name='team_optimizer'),
+    path('<int:pk>/tasks/<int:task_pk>/staffing/', views.staffing_recommendations, name='staffing_recommendations'),
     
     # RF-11: Motor de Validación de Asignaciones
     path('check-availability/', views.check_resource_availability, name='check_availability'),
@@ -1,17 +1,23 @@
 """
 Views for projects app.
 """
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Count, Q
 from django.views.decorators.http import require_http_methods
 from django.core.exceptions import ValidationError
+from collections import defaultdict
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from .models import Project, Task, Allocation, Stage, TimeLog
+from apps.core.stats import count_by
+from apps.resources.matching import candidates_for_roles
 from apps.resources.models import Resource, Role
 from .services import calculate_availability, get_allocation_recommendations
+from .optimizer import OBJECTIVES, apply_team_plan, optimize_team
+from .staffing import CLOSED_STATUSES, recommend_staffing
 from .forms import ProjectForm
 
 
@@ -19,13 +25,8 @@ def project_list(request):
     """Lista de proyectos."""
     projects = Project.objects.select_related().prefetch_related('stages', 'tasks').all()
     
-    # Estadísticas generales
-    stats = {
-        'total': projects.count(),
-        'active': projects.filter(status='active').count(),
-        'planning': projects.filter(status='planning').count(),
-        'completed': projects.filter(status='completed').count(),
-    }
+    # Estadísticas generales (una sola consulta)
+    stats = count_by(Project.objects.all(), 'status', ['active', 'planning', 'completed'])
     
     return render(request, 'projects/list.html', {
         'projects': projects,
@@ -396,30 +397,38 @@ def assign_resources(request, pk):
         return redirect('projects:assign_resources', pk=pk)
     
     # GET: Mostrar formulario
-    tasks = project.tasks.select_related(
+    tasks = list(project.tasks.select_related(
         'required_role', 
         'assigned_resource', 
         'stage'
-    ).order_by('stage__order', '-priority', 'due_date')
+    ).order_by('stage__order', '-priority', 'due_date'))
     
     # Obtener recursos disponibles agrupados por rol
     resources = Resource.objects.select_related('primary_role').filter(
         is_active=True
     ).order_by('primary_role__name', 'first_name')
     
+    # Candidatos precalculados (top-k por rol requerido) para el selector de cada tarea
+    candidates = candidates_for_roles(task.required_role_id for task in tasks)
+    tasks_by_stage = defaultdict(list)
+    for task in tasks:
+        task.candidates = candidates.get(task.required_role_id, [])
+        # Las recomendaciones de staffing se cargan bajo demanda (staffing_recommendations)
+        task.can_recommend = task.assigned_resource_id is None and task.status not in CLOSED_STATUSES
+        tasks_by_stage[task.stage_id].append(task)
+    
     # Agrupar tareas por etapa (lista de tuplas para fácil iteración en template)
-    stages_with_tasks = []
-    stages = project.stages.all().order_by('order')
-    for stage in stages:
-        stage_tasks = tasks.filter(stage=stage)
-        if stage_tasks.exists():
-            stages_with_tasks.append((stage, stage_tasks))
+    stages_with_tasks = [
+        (stage, tasks_by_stage[stage.pk])
+        for stage in project.stages.all().order_by('order')
+        if tasks_by_stage[stage.pk]
+    ]
     
     # Tareas sin etapa
-    orphan_tasks = tasks.filter(stage__isnull=True)
+    orphan_tasks = tasks_by_stage[None]
     
     # Calcular estadísticas
-    unassigned_tasks_count = tasks.filter(assigned_resource__isnull=True).count()
+    unassigned_tasks_count = sum(1 for task in tasks if task.assigned_resource_id is None)
     
     return render(request, 'projects/assign_resources.html', {
         'project': project,
@@ -427,9 +436,24 @@ def assign_resources(request, pk):
         'orphan_tasks': orphan_tasks,
         'resources': resources,
         'unassigned_tasks_count': unassigned_tasks_count,
+        'staffing_enabled': getattr(settings, 'ENABLE_STAFFING_RECOMMENDATIONS', True),
     })
 
 
+@require_http_methods(["GET"])
+def staffing_recommendations(request, pk, task_pk):
+    """
+    Vista HTMX con las recomendaciones de staffing (skills, margen y capacidad) de
+    una tarea sin asignar. Se pide al hacer clic en "Sugerir recursos", por lo que
+    assign_resources no puntúa todas las tareas en cada GET.
+    """
+    project = get_object_or_404(Project, pk=pk)
+    task = get_object_or_404(project.tasks.select_related('required_role'), pk=task_pk)
+    task.recommendations = recommend_staffing(project, tasks=[task]).get(task.pk, [])
+
+    return render(request, 'projects/partials/staffing_recommendations.html', {'task': task})
+
+
 @require_http_methods(["GET"])
 def check_resource_availability(request):
     """
@@ -547,6 +571,11 @@ def manage_allocations(request, pk):
         is_active=True
     ).order_by('primary_role__name', 'first_name')
     
+    # Candidatos recomendados para los roles que requieren las tareas del proyecto
+    project_roles = Role.objects.filter(tasks__project=project).distinct().order_by('name')
+    candidates = candidates_for_roles(role.pk for role in project_roles)
+    recommended = [(role, candidates[role.pk]) for role in project_roles if candidates.get(role.pk)]
+    
     # Estadísticas
     total_allocated_hours = sum(a.total_hours_allocated for a in allocations)
     active_allocations = allocations.filter(
@@ -558,6 +587,7 @@ def manage_allocations(request, pk):
         'project': project,
         'allocations': allocations,
         'resources': resources,
+        'recommended': recommended,
         'total_allocated_hours': total_allocated_hours,
         'active_allocations': active_allocations,
         'today': date.today(),
@@ -566,6 +596,54 @@ def manage_allocations(request, pk):
     return render(request, 'projects/manage_allocations.html', context)
 
 
+def _optimizer_params(data) -> dict:
+    """Parámetros del optimizador desde GET/POST (valores inválidos usan el default)."""
+    params = {'objective': data.get('objective') if data.get('objective') in OBJECTIVES else 'cost'}
+    for name, cast in (('budget', float), ('min_weekly_hours', float), ('max_projects', int)):
+        try:
+            value = cast(data[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if value > 0:
+            params[name] = value
+    return params
+
+
+@login_required
+def team_optimizer(request, pk):
+    """
+    Propone la composición del equipo del proyecto bajo presupuesto (greedy + búsqueda
+    local) y, al aprobar, crea todas las asignaciones del plan en bloque.
+    """
+    project = get_object_or_404(Project, pk=pk)
+    params = _optimizer_params(request.POST if request.method == 'POST' else request.GET)
+    plan = optimize_team(project, **params)
+    
+    if request.method == 'POST':
+        # El plan se recalcula con datos frescos: si cambió desde que se mostró, no se aplica
+        if request.POST.get('signature') != plan.signature:
+            messages.warning(request, 'El plan cambió desde que se generó. Revísalo antes de aprobarlo.')
+            return render(request, 'projects/team_optimizer.html', {
+                'project': project, 'plan': plan, 'params': params, 'objectives': OBJECTIVES,
+            })
+        try:
+            created = apply_team_plan(plan)
+        except ValidationError as e:
+            for error in e.messages:
+                messages.error(request, error)
+            return redirect('projects:team_optimizer', pk=pk)
+        
+        messages.success(request, f'✅ Plan aprobado: {len(created)} asignaciones creadas o ampliadas')
+        return redirect('projects:manage_allocations', pk=pk)
+    
+    return render(request, 'projects/team_optimizer.html', {
+        'project': project,
+        'plan': plan,
+        'params': params,
+        'objectives': OBJECTIVES,
+    })
+
+
 @login_required
 @require_http_methods(["POST"])
 def create_allocation(request, pk):
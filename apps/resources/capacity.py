@@ -0,0 +1,43 @@
+"""
+Cálculo de capacidad de recursos compartido por vistas y reportes.
+"""
+from datetime import date
+from decimal import Decimal
+
+DEFAULT_WEEKLY_HOURS = Decimal('40.00')
+
+
+def weekly_capacity(resource) -> Decimal:
+    """
+    Capacidad semanal efectiva: horas base (40h) ajustadas por disponibilidad.
+
+    Args:
+        resource: Instancia de Resource
+
+    Returns:
+        Horas por semana
+    """
+    base = getattr(resource, 'capacity_weekly', DEFAULT_WEEKLY_HOURS)
+    return base * (Decimal(resource.availability_percentage) / Decimal('100.0'))
+
+
+def weeks_in_period(start_date: date, end_date: date) -> int:
+    """Semanas completas del período (división entera, mínimo 1 semana)."""
+    return max(1, (end_date - start_date).days // 7)
+
+
+def period_capacity(resource, start_date: date, end_date: date) -> Decimal:
+    """
+    Capacidad del recurso en un período, usando la misma convención de semanas
+    completas que las asignaciones (30 días -> 4 semanas).
+    """
+    return weekly_capacity(resource) * Decimal(weeks_in_period(start_date, end_date))
+
+
+def prorated_capacity(resource, start_date: date, end_date: date) -> Decimal:
+    """
+    Capacidad del recurso entre dos fechas (inclusive) prorrateada por días: un
+    período recortado a 2 días cuenta 2/7 de semana en lugar de una semana completa.
+    """
+    days = max(0, (end_date - start_date).days + 1)
+    return weekly_capacity(resource) * days / 7
@@ -0,0 +1,70 @@
+"""
+Benchmark de latencia de search_resources con cache de embeddings fría y caliente.
+
+Uso típico:
+    python manage.py benchmark_vector_search --repeat 5
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resources.services import vector_service
+
+DEFAULT_QUERIES = [
+    'Desarrollador backend Python con experiencia en Django',
+    'Frontend React senior',
+    'Experto en Kubernetes y Docker',
+    'Analista de datos SQL PostgreSQL',
+    'Arquitecto cloud AWS',
+    'QA automation con experiencia en APIs REST',
+    'Scrum master con metodologías ágiles',
+    'Desarrollador full stack TypeScript',
+]
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = 'Mide p50/p99 de search_resources con cache de queries fría y caliente'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Pasadas sobre las queries con cache caliente')
+        parser.add_argument('--limit', type=int, default=10, help='Resultados por búsqueda')
+        parser.add_argument('--query', action='append', dest='queries', help='Query a medir (repetible)')
+
+    def handle(self, *args, **options):
+        queries = options['queries'] or DEFAULT_QUERIES
+
+        start = time.perf_counter()
+        if not vector_service.warmup():
+            raise CommandError('Modelo de embeddings no disponible')
+        self.stdout.write(f'Warmup (modelo + Qdrant): {time.perf_counter() - start:.2f}s')
+
+        vector_service.clear_query_cache()
+        cold = self._measure(queries, options['limit'])
+        warm = self._measure(queries * options['repeat'], options['limit'])
+
+        self._report('Cache fría', cold)
+        self._report('Cache caliente', warm)
+        self.stdout.write(f'Cache: {vector_service.query_cache_info()}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Aceleración p50: {statistics.median(cold) / max(statistics.median(warm), 1e-9):.1f}x'
+        ))
+
+    def _measure(self, queries: list, limit: int) -> list:
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            vector_service.search_resources(query, limit=limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    def _report(self, name: str, latencies: list):
+        self.stdout.write(
+            f'{name:16s} n={len(latencies):4d} p50={percentile(latencies, 50):.2f}ms '
+            f'p99={percentile(latencies, 99):.2f}ms'
+        )
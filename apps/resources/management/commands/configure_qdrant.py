@@ -0,0 +1,70 @@
+"""
+Comando para aplicar la configuración de Qdrant (settings QDRANT_*) a las colecciones
+existentes: HNSW, cuantización e índices de payload. Con --probe mide la latencia
+de búsqueda contra el servidor configurado (ej: el contenedor de docker-compose).
+
+Uso típico:
+    python manage.py configure_qdrant
+    python manage.py configure_qdrant --probe 200
+"""
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resources.qdrant import collection_config, ensure_collection, get_qdrant_client, search_params
+from apps.resources.services import PAYLOAD_INDEXES, vector_service
+from apps.standups.embeddings import PAYLOAD_INDEXES as BLOCKER_PAYLOAD_INDEXES
+from apps.standups.embeddings import blocker_vectors
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = 'Aplica HNSW, cuantización e índices de payload a las colecciones de Qdrant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--probe', type=int, default=0, help='Búsquedas aleatorias a medir por colección')
+
+    def handle(self, *args, **options):
+        try:
+            client = get_qdrant_client()
+        except Exception as e:
+            raise CommandError(f'No se pudo crear el cliente Qdrant: {e}')
+
+        transport = 'gRPC' if getattr(settings, 'QDRANT_PREFER_GRPC', False) else 'HTTP'
+        self.stdout.write(f'Qdrant {settings.QDRANT_HOST} ({transport})')
+
+        collections = [
+            (vector_service.collection_name, PAYLOAD_INDEXES),
+            (blocker_vectors.collection_name, BLOCKER_PAYLOAD_INDEXES),
+        ]
+        for name, payload_indexes in collections:
+            if not ensure_collection(client, name, vector_service.vector_size, payload_indexes):
+                raise CommandError(f'No se pudo preparar la colección {name}')
+            client.update_collection(collection_name=name, **collection_config())
+
+            info = client.get_collection(name)
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {name}: {info.points_count} puntos, {info.indexed_vectors_count} indexados, '
+                f'estado {info.status}, índices {sorted(info.payload_schema)}'
+            ))
+
+            if options['probe']:
+                self._probe(client, name, options['probe'])
+
+    def _probe(self, client, name: str, count: int):
+        rng = random.Random(42)
+        latencies = []
+        for _ in range(count):
+            vector = [rng.uniform(-1, 1) for _ in range(vector_service.vector_size)]
+            start = time.perf_counter()
+            client.query_points(name, query=vector, limit=10, search_params=search_params())
+            latencies.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(
+            f'  búsqueda top-10: p50={percentile(latencies, 50):.2f}ms p99={percentile(latencies, 99):.2f}ms'
+        )
@@ -0,0 +1,33 @@
+"""
+Comando para recalcular el top-k de candidatos (RoleCandidate) de cada rol:
+vectoriza roles y recursos activos en lote y calcula la matriz de similitud.
+
+Uso típico:
+    python manage.py rebuild_role_candidates
+    python manage.py rebuild_role_candidates --role 3 --role 7
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resources.matching import rebuild_role_candidates, top_k_size
+from apps.resources.models import RoleCandidate
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los candidatos precalculados (top-k de recursos) por rol'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--role', type=int, action='append', dest='roles', help='Id de rol (repetible)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = rebuild_role_candidates(options['roles'])
+        if not count and not options['roles']:
+            raise CommandError('No se recalcularon candidatos (¿modelo de embeddings disponible?)')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Candidatos recalculados para {count} roles (top-{top_k_size()}) '
+            f'en {time.perf_counter() - start:.2f}s'
+        ))
+        self.stdout.write(f'  - Filas RoleCandidate: {RoleCandidate.objects.count()}')
@@ -0,0 +1,46 @@
+"""
+Comando para reconciliar la colección Qdrant de talento con la tabla Resource.
+A diferencia de sync_resources_qdrant, solo re-vectoriza, actualiza o elimina
+los puntos con drift (hashes de narrativa/payload distintos, faltantes o huérfanos).
+
+Uso típico:
+    python manage.py reconcile_resources_qdrant
+    python manage.py reconcile_resources_qdrant --dry-run
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resources.reconcile import DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE, reconcile_resources
+
+
+class Command(BaseCommand):
+    help = 'Corrige solo el drift entre Resource y la colección Qdrant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo reportar el drift, sin escribir')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Recursos por lote de embeddings')
+        parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='Puntos por página de scroll')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        report = reconcile_resources(
+            batch_size=options['batch_size'],
+            page_size=options['page_size'],
+            dry_run=options['dry_run'],
+        )
+        if report['errors'] and not report['scanned']:
+            raise CommandError('Qdrant no disponible')
+
+        verb = 'Con drift' if options['dry_run'] else 'Corregidos'
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Reconciliación completada en {time.perf_counter() - start:.2f}s"
+        ))
+        self.stdout.write(f"  - Recursos activos: {report['scanned']}")
+        self.stdout.write(f"  - Puntos en Qdrant: {report['points']}")
+        self.stdout.write(f"  - Sin cambios: {report['unchanged']}")
+        self.stdout.write(f"  - {verb} (re-vectorizados): {report['embedded']}")
+        self.stdout.write(f"  - {verb} (solo payload): {report['payload_updated']}")
+        self.stdout.write(f"  - {verb} (eliminados): {report['deleted']}")
+        if report['errors']:
+            self.stdout.write(self.style.ERROR(f"  - Errores: {report['errors']}"))
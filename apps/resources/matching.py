@@ -0,0 +1,253 @@
+"""
+Matching rol × recurso por similitud de skills con top-k precalculado.
+
+Roles (nombre + required_skills) y recursos (rol principal + skills_vector) se
+vectorizan en lote con el SentenceTransformer de `vector_service`, normalizados,
+de modo que la matriz de similitud coseno es un producto de matrices NumPy. Se
+guardan los ROLE_CANDIDATES_TOP_K mejores recursos de cada rol en RoleCandidate.
+
+El refresco es incremental:
+- cambia un rol -> se recalcula su fila completa (rebuild_role_candidates)
+- cambia un recurso -> se vectoriza solo ese recurso y se mezcla su score en el
+  top-k guardado de cada rol (refresh_resource_candidates). La mezcla es exacta
+  mientras el k-ésimo score resultante no baje del k-ésimo score anterior (los
+  recursos no guardados no lo superan); si baja, se recalcula esa fila.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .models import Resource, Role, RoleCandidate
+from .services import vector_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 10
+ENCODE_BATCH_SIZE = 64
+
+# Campos de Role / Resource que cambian su embedding de matching
+ROLE_MATCH_FIELDS = {'name', 'required_skills', 'is_active'}
+RESOURCE_MATCH_FIELDS = {'skills_vector', 'primary_role', 'is_active'}
+
+
+def top_k_size() -> int:
+    return getattr(settings, 'ROLE_CANDIDATES_TOP_K', DEFAULT_TOP_K)
+
+
+def normalize_skill(name) -> str:
+    """Forma comparable de un nombre de skill: sin espacios de borde y en minúsculas."""
+    return str(name or '').strip().lower()
+
+
+def skill_names(skills: Iterable, normalize: bool = False) -> List[str]:
+    """
+    Nombres de skills ordenados por nivel (mayor primero); acepta strings o dicts
+    {'name', 'level'}. Con normalize=True se devuelven con normalize_skill.
+    """
+    skills = [
+        skill if isinstance(skill, dict) else {'name': str(skill), 'level': 0}
+        for skill in skills or []
+    ]
+    skills.sort(key=lambda skill: -(skill.get('level') or 0))
+    names = [skill['name'] for skill in skills if skill.get('name')]
+    if normalize:
+        names = [name for name in map(normalize_skill, names) if name]
+    return names
+
+
+def role_text(role: Role) -> str:
+    return f"{role.name}. Skills: {', '.join(skill_names(role.required_skills))}"
+
+
+def resource_text(resource: Resource) -> str:
+    return f"{resource.primary_role.name}. Skills: {', '.join(skill_names(resource.skills_vector))}"
+
+
+def embed(texts: List[str]) -> Optional[np.ndarray]:
+    """Embeddings normalizados (filas de norma 1) en float32; None si el modelo no está disponible."""
+    if not vector_service.model:
+        return None
+    if not texts:
+        return np.zeros((0, vector_service.vector_size), dtype=np.float32)
+    return np.asarray(
+        vector_service.model.encode(texts, batch_size=ENCODE_BATCH_SIZE, normalize_embeddings=True),
+        dtype=np.float32,
+    )
+
+
+def similarity_matrix(role_vectors: np.ndarray, resource_vectors: np.ndarray) -> np.ndarray:
+    """Similitud coseno roles × recursos (los embeddings ya vienen normalizados)."""
+    if not len(role_vectors) or not len(resource_vectors):
+        return np.zeros((len(role_vectors), len(resource_vectors)), dtype=np.float32)
+    return role_vectors @ resource_vectors.T
+
+
+def top_k(similarity: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices de las k columnas de mayor score de cada fila, ordenados de mayor a menor
+    (empates por índice de columna). argpartition evita ordenar la fila completa.
+    """
+    k = min(k, similarity.shape[1])
+    if k == 0:
+        return np.zeros((similarity.shape[0], 0), dtype=np.intp)
+    partition = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(similarity, partition, axis=1)
+    return np.take_along_axis(partition, np.lexsort((partition, -scores)), axis=1)
+
+
+def _candidate_rows(role_id: int, ranked: List[tuple]) -> List[RoleCandidate]:
+    return [
+        RoleCandidate(role_id=role_id, resource_id=resource_id, rank=rank, score=score)
+        for rank, (resource_id, score) in enumerate(ranked, start=1)
+    ]
+
+
+def merge_top_k(
+    previous: Dict[int, float],
+    updates: Dict[int, float],
+    removed: Iterable[int],
+    k: int,
+    active_count: int,
+) -> Optional[List[tuple]]:
+    """
+    Mezcla scores nuevos en el top-k guardado de un rol.
+
+    Args:
+        previous: {resource_id: score} guardados (el top-k anterior)
+        updates: {resource_id: score} de los recursos re-vectorizados
+        removed: Recursos re-vectorizados cuyo score anterior deja de valer
+            (incluye los desactivados o eliminados, que no están en `updates`)
+        k: Tamaño del top-k
+        active_count: Recursos activos en total
+
+    Returns:
+        [(resource_id, score)] ordenado (score desc, id asc), o None si la mezcla
+        no es exacta y la fila debe recalcularse: quedan menos de k candidatos
+        habiendo recursos suficientes, o el k-ésimo score baja del k-ésimo anterior
+        (un recurso no guardado podría superarlo).
+    """
+    removed = set(removed)
+    merged = {rid: score for rid, score in previous.items() if rid not in removed}
+    merged.update(updates)
+    ranked = sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    # Los recursos fuera del top-k guardado tienen score <= al k-ésimo anterior
+    floor = min(previous.values()) if len(previous) >= k else None
+    if len(ranked) < min(k, active_count) or (floor is not None and ranked and ranked[-1][1] < floor):
+        return None
+    return ranked
+
+
+def rebuild_role_candidates(role_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recalcula el top-k completo de los roles indicados (por defecto todos los activos)
+    contra todos los recursos activos. Roles inactivos quedan sin candidatos.
+
+    Returns:
+        Roles recalculados (0 si el modelo no está disponible)
+    """
+    roles = Role.objects.filter(is_active=True).order_by('id')
+    if role_ids is not None:
+        role_ids = list(role_ids)
+        roles = roles.filter(id__in=role_ids)
+    roles = list(roles)
+    resources = list(
+        Resource.objects.filter(is_active=True).select_related('primary_role').order_by('id')
+    )
+
+    role_vectors = embed([role_text(role) for role in roles])
+    resource_vectors = embed([resource_text(resource) for resource in resources])
+    if role_vectors is None or resource_vectors is None:
+        logger.error("❌ Modelo de embeddings no disponible, candidatos por rol sin recalcular")
+        return 0
+
+    similarity = similarity_matrix(role_vectors, resource_vectors)
+    best = top_k(similarity, top_k_size())
+    candidates = [
+        candidate
+        for row, role in enumerate(roles)
+        for candidate in _candidate_rows(
+            role.id, [(resources[col].id, float(similarity[row, col])) for col in best[row]]
+        )
+    ]
+
+    with transaction.atomic():
+        stale = RoleCandidate.objects.all() if role_ids is None else RoleCandidate.objects.filter(role_id__in=role_ids)
+        stale.delete()
+        RoleCandidate.objects.bulk_create(candidates, batch_size=1000)
+
+    return len(roles)
+
+
+def refresh_resource_candidates(resource_ids: Iterable[int]) -> int:
+    """
+    Actualiza el top-k de todos los roles tras cambiar (o desactivarse/eliminarse)
+    los recursos indicados, vectorizando solo esos recursos.
+
+    Returns:
+        Roles cuyo top-k cambió
+    """
+    resource_ids = set(resource_ids)
+    if not resource_ids:
+        return 0
+
+    roles = list(Role.objects.filter(is_active=True).order_by('id'))
+    changed = list(
+        Resource.objects.filter(id__in=resource_ids, is_active=True).select_related('primary_role')
+    )
+    role_vectors = embed([role_text(role) for role in roles])
+    resource_vectors = embed([resource_text(resource) for resource in changed])
+    if role_vectors is None or resource_vectors is None:
+        logger.error("❌ Modelo de embeddings no disponible, candidatos por rol sin refrescar")
+        return 0
+
+    k = top_k_size()
+    active_count = Resource.objects.filter(is_active=True).count()
+    similarity = similarity_matrix(role_vectors, resource_vectors)
+
+    stored = defaultdict(dict)
+    for role_id, resource_id, score in RoleCandidate.objects.filter(
+        role_id__in=[role.id for role in roles]
+    ).values_list('role_id', 'resource_id', 'score'):
+        stored[role_id][resource_id] = score
+
+    updated, rebuild = {}, []
+    for row, role in enumerate(roles):
+        previous = stored[role.id]
+        ranked = merge_top_k(
+            previous,
+            {resource.id: float(similarity[row, col]) for col, resource in enumerate(changed)},
+            resource_ids,
+            k,
+            active_count,
+        )
+        if ranked is None:
+            rebuild.append(role.id)
+        elif ranked != sorted(previous.items(), key=lambda item: (-item[1], item[0])):
+            updated[role.id] = ranked
+
+    if updated:
+        with transaction.atomic():
+            RoleCandidate.objects.filter(role_id__in=list(updated)).delete()
+            RoleCandidate.objects.bulk_create(
+                [row for role_id, ranked in updated.items() for row in _candidate_rows(role_id, ranked)],
+                batch_size=1000,
+            )
+    if rebuild:
+        rebuild_role_candidates(rebuild)
+
+    return len(updated) + len(rebuild)
+
+
+def candidates_for_roles(role_ids: Iterable[int]) -> Dict[int, List[RoleCandidate]]:
+    """{role_id: [RoleCandidate ordenados por rank]} con el recurso y su rol precargados."""
+    candidates = defaultdict(list)
+    for candidate in RoleCandidate.objects.filter(
+        role_id__in=set(role_ids), resource__is_active=True,
+    ).select_related('resource', 'resource__primary_role').order_by('role_id', 'rank'):
+        candidates[candidate.role_id].append(candidate)
+    return candidates
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0004_alter_resource_internal_cost_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoleCandidate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Posición")),
+                ("score", models.FloatField(verbose_name="Similitud")),
+                (
+                    "resource",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="role_matches",
+                        to="resources.resource",
+                        verbose_name="Recurso",
+                    ),
+                ),
+                (
+                    "role",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="candidates",
+                        to="resources.role",
+                        verbose_name="Rol",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Candidato por Rol",
+                "verbose_name_plural": "Candidatos por Rol",
+                "ordering": ["role", "rank"],
+                "indexes": [
+                    models.Index(fields=["role", "rank"], name="resources_r_role_id_b84ab8_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("role", "resource"), name="unique_candidate_per_role"
+                    )
+                ],
+            },
+        ),
+    ]
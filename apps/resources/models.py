@@ -364,3 +364,43 @@ class Resource(AuditableModel):
         if self.primary_role.standard_rate > 0:
             return float((self.internal_cost / self.primary_role.standard_rate) * 100)
         return 0.0
+
+
+class RoleCandidate(models.Model):
+    """
+    Top-k de recursos más afines a un rol (similitud de embeddings de skills).
+    Precalculado por apps.resources.matching y refrescado de forma incremental
+    cuando cambian las skills de un rol o de un recurso.
+    """
+
+    role = models.ForeignKey(
+        Role,
+        on_delete=models.CASCADE,
+        related_name='candidates',
+        verbose_name="Rol"
+    )
+    resource = models.ForeignKey(
+        Resource,
+        on_delete=models.CASCADE,
+        related_name='role_matches',
+        verbose_name="Recurso"
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name="Posición")
+    score = models.FloatField(verbose_name="Similitud")
+
+    class Meta:
+        verbose_name = "Candidato por Rol"
+        verbose_name_plural = "Candidatos por Rol"
+        ordering = ['role', 'rank']
+        indexes = [
+            models.Index(fields=['role', 'rank']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['role', 'resource'],
+                name='unique_candidate_per_role'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.role.name} #{self.rank}: {self.resource.full_name} ({self.score:.2f})"
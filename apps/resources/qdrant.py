@@ -0,0 +1,181 @@
+"""
+Cliente Qdrant compartido por proceso y configuración de colecciones.
+
+Un solo QdrantClient por proceso (se recrea tras un fork, porque los canales
+gRPC no sobreviven al fork de gunicorn/Celery), con timeout y reintentos con
+backoff ante errores transitorios. Los reintentos solo aplican en procesos de
+background (workers Celery, comandos): los procesos web llaman a
+disable_retries() al arrancar y fallan rápido. La configuración HNSW y de
+cuantización de las colecciones se toma de settings (QDRANT_*).
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+_retries_enabled = True
+
+
+def disable_retries():
+    """Desactiva los reintentos en este proceso (requests web: un reintento con sleep bloquea al usuario)."""
+    global _retries_enabled
+    _retries_enabled = False
+
+
+def _is_transient(error: Exception) -> bool:
+    """Errores de red/timeout que vale la pena reintentar (no errores de la petición)."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+        if isinstance(error, ResponseHandlingException):
+            return True
+        if isinstance(error, UnexpectedResponse):
+            return error.status_code is not None and error.status_code >= 500
+    except ImportError:
+        pass
+    try:
+        import grpc
+        if isinstance(error, grpc.RpcError):
+            return error.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+    except ImportError:
+        pass
+    return False
+
+
+class RetryingClient:
+    """
+    Envoltorio de QdrantClient que reintenta las llamadas ante errores transitorios
+    (QDRANT_RETRIES intentos extra, backoff exponencial desde QDRANT_RETRY_BACKOFF segundos),
+    salvo en procesos que llamaron a disable_retries().
+    """
+
+    def __init__(self, client, retries: int, backoff: float):
+        self._client = client
+        self._retries = retries
+        self._backoff = backoff
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            retries = self._retries if _retries_enabled else 0
+            for attempt in range(retries + 1):
+                try:
+                    return attr(*args, **kwargs)
+                except Exception as e:
+                    if attempt == retries or not _is_transient(e):
+                        raise
+                    delay = self._backoff * (2 ** attempt)
+                    logger.warning(f"⚠️ Qdrant {name} falló ({e}), reintento {attempt + 1} en {delay:.1f}s")
+                    time.sleep(delay)
+
+        return call
+
+
+def get_qdrant_client():
+    """
+    Cliente Qdrant del proceso actual (creado en el primer uso).
+    Con QDRANT_PREFER_GRPC=True usa gRPC (puerto QDRANT_GRPC_PORT) para upserts y búsquedas.
+    """
+    global _client, _client_pid
+
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _lock:
+        if _client is None or _client_pid != pid:
+            from qdrant_client import QdrantClient
+
+            client = QdrantClient(
+                host=getattr(settings, 'QDRANT_HOST', 'localhost'),
+                port=getattr(settings, 'QDRANT_PORT', 6333),
+                grpc_port=getattr(settings, 'QDRANT_GRPC_PORT', 6334),
+                prefer_grpc=getattr(settings, 'QDRANT_PREFER_GRPC', False),
+                timeout=getattr(settings, 'QDRANT_TIMEOUT', 10),
+            )
+            _client = RetryingClient(
+                client,
+                retries=getattr(settings, 'QDRANT_RETRIES', 3),
+                backoff=getattr(settings, 'QDRANT_RETRY_BACKOFF', 0.5),
+            )
+            _client_pid = pid
+    return _client
+
+
+def collection_config() -> Dict[str, Any]:
+    """kwargs de HNSW y cuantización para create_collection / update_collection."""
+    from qdrant_client.models import (
+        HnswConfigDiff,
+        ScalarQuantization,
+        ScalarQuantizationConfig,
+        ScalarType,
+    )
+
+    config = {
+        'hnsw_config': HnswConfigDiff(
+            m=getattr(settings, 'QDRANT_HNSW_M', 16),
+            ef_construct=getattr(settings, 'QDRANT_HNSW_EF_CONSTRUCT', 100),
+        ),
+    }
+    if getattr(settings, 'QDRANT_QUANTIZATION', '') == 'scalar':
+        config['quantization_config'] = ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    return config
+
+
+def search_params():
+    """
+    Parámetros de búsqueda: hnsw_ef configurable y, con cuantización, re-score
+    de los candidatos con los vectores originales. None usa los valores del servidor.
+    """
+    from qdrant_client.models import QuantizationSearchParams, SearchParams
+
+    hnsw_ef: Optional[int] = getattr(settings, 'QDRANT_SEARCH_HNSW_EF', None)
+    quantized = getattr(settings, 'QDRANT_QUANTIZATION', '') == 'scalar'
+    if hnsw_ef is None and not quantized:
+        return None
+    return SearchParams(
+        hnsw_ef=hnsw_ef,
+        quantization=QuantizationSearchParams(rescore=True) if quantized else None,
+    )
+
+
+def ensure_collection(client, name: str, vector_size: int, payload_indexes: Dict[str, str]) -> bool:
+    """
+    Crea la colección (COSINE, HNSW/cuantización de settings) si no existe y los
+    índices de payload faltantes. Una colección existente conserva su configuración
+    hasta ejecutar `manage.py configure_qdrant`.
+    """
+    from qdrant_client.models import Distance, VectorParams
+
+    try:
+        if not client.collection_exists(name):
+            client.create_collection(
+                collection_name=name,
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+                **collection_config(),
+            )
+            logger.info(f"✅ Colección '{name}' creada")
+
+        existing = client.get_collection(name).payload_schema
+        for field, schema in payload_indexes.items():
+            if field not in existing:
+                client.create_payload_index(name, field, field_schema=schema)
+                logger.info(f"✅ Índice de payload '{name}.{field}' ({schema}) creado")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error preparando la colección '{name}': {e}")
+        return False
@@ -0,0 +1,163 @@
+"""
+Reconciliación entre la tabla Resource y la colección Qdrant de talento.
+
+Cada punto guarda en su payload `narrative_hash` (hash del texto vectorizado) y
+`payload_hash` (hash del resto del payload), calculados por
+VectorService.resource_payload. El reconciliador recorre la colección con
+`scroll` paginado (solo ids y esos campos, sin vectores) y los compara con los
+hashes recalculados desde la base:
+
+- narrativa distinta o punto faltante -> se re-vectoriza (en lotes)
+- solo payload distinto -> se sobrescribe el payload sin re-vectorizar
+- punto huérfano (recurso borrado/inactivo) o duplicado -> se elimina
+
+Sin cambios, el costo es un scroll de la colección y un recorrido de la tabla,
+sin llamar al modelo de embeddings.
+"""
+import logging
+from typing import Dict, List, Tuple
+
+from .models import Resource
+from .services import vector_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 64
+
+# Campos del payload que lee el reconciliador
+RECONCILE_FIELDS = ['resource_id', 'narrative_hash', 'payload_hash']
+
+
+def _batches(items: List, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def scroll_points(client, collection_name: str, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Dict]:
+    """{point_id: payload reducido} de toda la colección, paginando con scroll."""
+    points, offset = {}, None
+    while True:
+        page, offset = client.scroll(
+            collection_name=collection_name,
+            limit=page_size,
+            offset=offset,
+            with_payload=RECONCILE_FIELDS,
+            with_vectors=False,
+        )
+        for point in page:
+            points[str(point.id)] = point.payload or {}
+        if offset is None:
+            return points
+
+
+def reconcile_resources(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    Corrige solo las entradas con drift entre Resource (activos) y Qdrant.
+
+    Args:
+        batch_size: Recursos por llamada a `encode`/upsert y puntos por operación de payload
+        page_size: Puntos por página de scroll
+        dry_run: Solo contar, sin escribir en Qdrant ni en la base
+
+    Returns:
+        Conteos: scanned, points, unchanged, embedded, payload_updated, deleted, errors
+    """
+    report = {
+        'scanned': 0, 'points': 0, 'unchanged': 0, 'embedded': 0,
+        'payload_updated': 0, 'deleted': 0, 'errors': 0,
+    }
+    client = vector_service.client
+    if not client:
+        logger.error("❌ Cliente Qdrant no disponible, reconciliación omitida")
+        report['errors'] = 1
+        return report
+
+    from qdrant_client.models import OverwritePayloadOperation, PointIdsList, SetPayload
+
+    points = scroll_points(client, vector_service.collection_name, page_size)
+    report['points'] = len(points)
+
+    # Puntos por resource_id; un mismo recurso puede tener varios (p. ej. tras perder su point id)
+    points_by_resource: Dict[int, List[str]] = {}
+    orphans = []
+    for point_id, payload in points.items():
+        resource_id = payload.get('resource_id')
+        if resource_id is None:
+            orphans.append(point_id)
+        else:
+            points_by_resource.setdefault(resource_id, []).append(point_id)
+
+    to_embed: List[Resource] = []
+    to_overwrite: List[Tuple[str, Dict]] = []
+    adopted: List[Resource] = []
+
+    resources = Resource.objects.filter(is_active=True).select_related('primary_role').order_by('id')
+    for resource in resources.iterator(chunk_size=2000):
+        report['scanned'] += 1
+        candidates = points_by_resource.pop(resource.id, [])
+
+        # Reutilizar un punto existente si el recurso perdió su qdrant_point_id
+        if not resource.qdrant_point_id and candidates:
+            resource.qdrant_point_id = candidates[0]
+            adopted.append(resource)
+
+        point_id = resource.qdrant_point_id and str(resource.qdrant_point_id)
+        orphans.extend(pid for pid in candidates if pid != point_id)
+
+        stored = points.get(point_id) if point_id in candidates else None
+        payload = vector_service.resource_payload(resource)
+        if stored is None or stored.get('narrative_hash') != payload['narrative_hash']:
+            to_embed.append(resource)
+        elif stored.get('payload_hash') != payload['payload_hash']:
+            to_overwrite.append((point_id, payload))
+        else:
+            report['unchanged'] += 1
+
+    # Lo que queda son puntos de recursos borrados o inactivos
+    for point_ids in points_by_resource.values():
+        orphans.extend(point_ids)
+
+    if dry_run:
+        report.update(embedded=len(to_embed), payload_updated=len(to_overwrite), deleted=len(orphans))
+        return report
+
+    if adopted:
+        Resource.objects.bulk_update(adopted, ['qdrant_point_id'], batch_size=1000)
+
+    for batch in _batches(to_embed, batch_size):
+        synced = vector_service.upsert_resources(batch)
+        report['embedded'] += synced
+        report['errors'] += len(batch) - synced
+
+    for batch in _batches(to_overwrite, batch_size):
+        try:
+            client.batch_update_points(
+                collection_name=vector_service.collection_name,
+                update_operations=[
+                    OverwritePayloadOperation(overwrite_payload=SetPayload(payload=payload, points=[point_id]))
+                    for point_id, payload in batch
+                ],
+            )
+            report['payload_updated'] += len(batch)
+        except Exception as e:
+            logger.error(f"❌ Error actualizando payloads en Qdrant: {e}")
+            report['errors'] += len(batch)
+
+    for batch in _batches(orphans, page_size):
+        try:
+            client.delete(
+                collection_name=vector_service.collection_name,
+                points_selector=PointIdsList(points=batch),
+            )
+            report['deleted'] += len(batch)
+        except Exception as e:
+            logger.error(f"❌ Error eliminando puntos huérfanos de Qdrant: {e}")
+            report['errors'] += len(batch)
+
+    logger.info(f"✅ Reconciliación Qdrant: {report}")
+    return report
@@ -1,14 +1,47 @@
 """
 Servicio de embeddings y sincronización con Qdrant para búsqueda semántica de talento.
 """
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from django.conf import settings
 import uuid
 
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .capacity import weekly_capacity
+from .models import Resource, Role
+from .qdrant import ensure_collection, get_qdrant_client, search_params
+
 logger = logging.getLogger(__name__)
 
 
+def content_hash(text: str) -> str:
+    """Hash corto y estable de un texto (detección de drift contra Qdrant)."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+# Nivel numérico de seniority para filtros por rango en Qdrant (entry=1 ... principal=6)
+SENIORITY_LEVELS = {
+    code: level for level, (code, _) in enumerate(Role.SENIORITY_CHOICES, start=1)
+}
+
+# Campos del payload filtrables con índice en Qdrant -> tipo de índice
+PAYLOAD_INDEXES = {
+    'is_active': 'bool',
+    'role_category': 'keyword',
+    'seniority_level': 'integer',
+    'internal_cost': 'float',
+    'availability_percentage': 'integer',
+}
+
+
 class VectorService:
     """
     Servicio para generar embeddings y gestionar sincronización con Qdrant.
@@ -22,6 +55,12 @@ class VectorService:
         self.vector_size = 384  # Dimensión del modelo all-MiniLM-L6-v2
         self._model = None
         self._client = None
+        # Tras un fallo de conexión no se reintenta hasta este instante (time.monotonic)
+        self._connect_after = 0.0
+        # LRU de embeddings de queries (texto normalizado -> vector), ver embed_query
+        self._cached_query_embedding = lru_cache(
+            maxsize=getattr(settings, 'VECTOR_QUERY_CACHE_SIZE', 1024)
+        )(self._encode_query)
     
     @property
     def model(self):
@@ -38,42 +77,23 @@ class VectorService:
     
     @property
     def client(self):
-        """Lazy loading del cliente Qdrant."""
-        if self._client is None:
+        """
+        Cliente Qdrant compartido por el proceso (ver qdrant.get_qdrant_client).
+        Si la conexión falla, devuelve None sin reintentar durante QDRANT_CONNECT_COOLDOWN segundos.
+        """
+        if self._client is None and time.monotonic() >= self._connect_after:
             try:
-                from qdrant_client import QdrantClient
-                qdrant_host = getattr(settings, 'QDRANT_HOST', 'localhost')
-                qdrant_port = getattr(settings, 'QDRANT_PORT', 6333)
-                
-                self._client = QdrantClient(host=qdrant_host, port=qdrant_port)
-                self._ensure_collection_exists()
-                logger.info(f"✅ Conectado a Qdrant en {qdrant_host}:{qdrant_port}")
+                client = get_qdrant_client()
+                if ensure_collection(client, self.collection_name, self.vector_size, PAYLOAD_INDEXES):
+                    self._client = client
+                    logger.info(f"✅ Conectado a Qdrant en {settings.QDRANT_HOST}:{settings.QDRANT_PORT}")
             except Exception as e:
                 logger.error(f"❌ Error conectando a Qdrant: {e}")
                 self._client = None
+            if self._client is None:
+                self._connect_after = time.monotonic() + getattr(settings, 'QDRANT_CONNECT_COOLDOWN', 30)
         return self._client
     
-    def _ensure_collection_exists(self):
-        """Crea la colección en Qdrant si no existe."""
-        from qdrant_client.models import Distance, VectorParams
-        try:
-            collections = self.client.get_collections().collections
-            collection_names = [c.name for c in collections]
-            
-            if self.collection_name not in collection_names:
-                self.client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=VectorParams(
-                        size=self.vector_size,
-                        distance=Distance.COSINE
-                    )
-                )
-                logger.info(f"✅ Colección '{self.collection_name}' creada")
-            else:
-                logger.info(f"✅ Colección '{self.collection_name}' ya existe")
-        except Exception as e:
-            logger.error(f"❌ Error creando colección: {e}")
-    
     def skills_to_narrative(self, skills_vector: List[Dict[str, Any]]) -> str:
         """
         Convierte el JSON de skills_vector en texto narrativo semántico.
@@ -179,6 +199,89 @@ class VectorService:
             logger.error(f"❌ Error generando embedding: {e}")
             return None
     
+    def _encode_query(self, normalized_query: str) -> Tuple[float, ...]:
+        embedding = self.generate_embedding(normalized_query)
+        if not embedding:
+            # lru_cache no guarda excepciones: un fallo (ej: modelo no disponible) no queda cacheado
+            raise ValueError("embedding no disponible")
+        return tuple(embedding)
+
+    def embed_query(self, query: str) -> Optional[List[float]]:
+        """
+        Embedding de una query de búsqueda con cache LRU en memoria del proceso.
+        La query se normaliza (minúsculas, espacios colapsados): el modelo es
+        uncased, así que variantes de mayúsculas comparten entrada.
+        """
+        normalized = ' '.join(query.lower().split())
+        try:
+            return list(self._cached_query_embedding(normalized))
+        except ValueError:
+            return None
+
+    def query_cache_info(self) -> Dict[str, Any]:
+        """Estadísticas del cache de embeddings de queries."""
+        info = self._cached_query_embedding.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': round(info.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def clear_query_cache(self):
+        self._cached_query_embedding.cache_clear()
+
+    def warmup(self) -> bool:
+        """
+        Carga el modelo, ejecuta un encode de prueba y conecta a Qdrant.
+        Se invoca al iniciar cada worker de gunicorn/Celery para que la primera
+        búsqueda no pague la carga del modelo (ver config/gunicorn.conf.py y config/celery.py).
+        """
+        start = time.perf_counter()
+        if not self.model:
+            return False
+        self.model.encode("warmup")
+        client_ready = self.client is not None
+        logger.info(
+            f"🔥 VectorService listo en {time.perf_counter() - start:.2f}s "
+            f"(Qdrant {'conectado' if client_ready else 'no disponible'})"
+        )
+        return True
+
+    def resource_text(self, resource) -> str:
+        """Texto que se vectoriza para un recurso (nombre, rol y narrativa de skills)."""
+        return (
+            f"{resource.full_name}. "
+            f"Role: {resource.primary_role.name}. "
+            f"Skills: {self.skills_to_narrative(resource.skills_vector)}"
+        )
+
+    def resource_payload(self, resource) -> Dict[str, Any]:
+        """
+        Payload del punto de un recurso. Incluye hashes de la narrativa vectorizada
+        y del resto del payload para que el reconciliador detecte drift sin re-vectorizar.
+        """
+        payload = {
+            "resource_id": resource.id,
+            "employee_id": resource.employee_id,
+            "full_name": resource.full_name,
+            "email": resource.email,
+            "role": resource.primary_role.name,
+            "role_category": resource.primary_role.category,
+            "seniority": resource.primary_role.seniority,
+            "seniority_level": SENIORITY_LEVELS.get(resource.primary_role.seniority, 0),
+            "internal_cost": float(resource.internal_cost),
+            "availability_percentage": resource.availability_percentage,
+            "is_active": resource.is_active,
+            "skills_text": self.skills_to_narrative(resource.skills_vector),
+            "skills_count": len(resource.skills_vector),
+        }
+        payload["payload_hash"] = content_hash(json.dumps(payload, sort_keys=True))
+        payload["narrative_hash"] = content_hash(self.resource_text(resource))
+        return payload
+
     def upsert_resource(self, resource) -> bool:
         """
         Inserta o actualiza un recurso en Qdrant.
@@ -189,65 +292,51 @@ class VectorService:
         Returns:
             True si tuvo éxito, False en caso contrario
         """
+        if self.upsert_resources([resource]) == 1:
+            logger.info(f"✅ Resource {resource.full_name} sincronizado en Qdrant")
+            return True
+        return False
+
+    def upsert_resources(self, resources: List) -> int:
+        """
+        Inserta o actualiza un lote de recursos: un solo `encode` y un solo upsert.
+        Asigna qdrant_point_id (bulk_update) a los recursos que aún no lo tienen.
+
+        Returns:
+            Cantidad de recursos sincronizados
+        """
+        if not resources:
+            return 0
         if not self.client or not self.model:
             logger.error("❌ Cliente Qdrant o modelo no disponibles")
-            return False
-        
+            return 0
+
         try:
-            # Generar texto narrativo desde skills_vector
-            skills_text = self.skills_to_narrative(resource.skills_vector)
-            
-            # Agregar información adicional del recurso
-            full_text = (
-                f"{resource.full_name}. "
-                f"Role: {resource.primary_role.name}. "
-                f"Skills: {skills_text}"
-            )
-            
-            # Generar embedding
-            embedding = self.generate_embedding(full_text)
-            if not embedding:
-                logger.error(f"❌ No se pudo generar embedding para {resource.full_name}")
-                return False
-            
+            embeddings = self.model.encode([self.resource_text(resource) for resource in resources])
+
             # Generar o reutilizar qdrant_point_id
-            if not resource.qdrant_point_id:
+            new_ids = [resource for resource in resources if not resource.qdrant_point_id]
+            for resource in new_ids:
                 resource.qdrant_point_id = str(uuid.uuid4())
-                resource.save(update_fields=['qdrant_point_id'])
-            
-            # Preparar payload con metadatos
-            payload = {
-                "resource_id": resource.id,
-                "employee_id": resource.employee_id,
-                "full_name": resource.full_name,
-                "email": resource.email,
-                "role": resource.primary_role.name,
-                "role_category": resource.primary_role.category,
-                "internal_cost": float(resource.internal_cost),
-                "is_active": resource.is_active,
-                "skills_text": skills_text,
-                "skills_count": len(resource.skills_vector),
-            }
-            
-            # Upsert en Qdrant
+            Resource.objects.bulk_update(new_ids, ['qdrant_point_id'])
+
             from qdrant_client.models import PointStruct
-            point = PointStruct(
-                id=resource.qdrant_point_id,
-                vector=embedding,
-                payload=payload
-            )
-            
             self.client.upsert(
                 collection_name=self.collection_name,
-                points=[point]
+                points=[
+                    PointStruct(
+                        id=resource.qdrant_point_id,
+                        vector=embedding.tolist(),
+                        payload=self.resource_payload(resource),
+                    )
+                    for resource, embedding in zip(resources, embeddings)
+                ],
             )
-            
-            logger.info(f"✅ Resource {resource.full_name} sincronizado en Qdrant")
-            return True
-            
+            return len(resources)
+
         except Exception as e:
-            logger.error(f"❌ Error upserting resource {resource.id}: {e}")
-            return False
+            logger.error(f"❌ Error upserting {len(resources)} resources: {e}")
+            return 0
     
     def delete_resource(self, qdrant_point_id: str) -> bool:
         """
@@ -278,7 +367,10 @@ class VectorService:
         self, 
         query: str, 
         limit: int = 10,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        offset: int = 0,
+        score_threshold: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         Búsqueda semántica de recursos.
@@ -286,29 +378,33 @@ class VectorService:
         Args:
             query: Texto de búsqueda (ej: "Busco desarrollador python experto")
             limit: Cantidad máxima de resultados
-            filters: Filtros adicionales (ej: {"is_active": True})
+            filters: Filtros exactos (ej: {"is_active": True})
+            ranges: Filtros por rango (ej: {"internal_cost": (None, 50), "seniority_level": (4, None)}),
+                    resueltos por Qdrant sobre los índices de payload (PAYLOAD_INDEXES)
+            offset: Resultados a saltar (paginación)
+            score_threshold: Similitud mínima (COSINE, 0-1)
         
         Returns:
             Lista de recursos ordenados por similitud con scores
         """
-        if not self.client or not self.model:
-            logger.error("❌ Cliente Qdrant o modelo no disponibles")
+        if not self.client:
+            logger.error("❌ Cliente Qdrant no disponible")
             return []
         
         try:
-            # Generar embedding de la query
-            query_embedding = self.generate_embedding(query)
+            # Embedding de la query (cache LRU; None si el modelo no está disponible)
+            query_embedding = self.embed_query(query)
             if not query_embedding:
                 logger.error("❌ No se pudo generar embedding para la query")
                 return []
             
             # Preparar filtros de Qdrant
             query_filter = None
-            if filters:
-                from qdrant_client.models import Filter, FieldCondition, MatchValue
+            if filters or ranges:
+                from qdrant_client.models import Filter, FieldCondition, MatchValue, Range
                 conditions = []
                 
-                for key, value in filters.items():
+                for key, value in (filters or {}).items():
                     conditions.append(
                         FieldCondition(
                             key=key,
@@ -316,16 +412,29 @@ class VectorService:
                         )
                     )
                 
+                for key, (minimum, maximum) in (ranges or {}).items():
+                    if minimum is None and maximum is None:
+                        continue
+                    conditions.append(
+                        FieldCondition(
+                            key=key,
+                            range=Range(gte=minimum, lte=maximum)
+                        )
+                    )
+                
                 if conditions:
                     query_filter = Filter(must=conditions)
             
             # Búsqueda en Qdrant
-            results = self.client.search(
+            results = self.client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_embedding,
+                query=query_embedding,
                 query_filter=query_filter,
-                limit=limit
-            )
+                limit=limit,
+                offset=offset,
+                score_threshold=score_threshold,
+                search_params=search_params(),
+            ).points
             
             # Formatear resultados
             formatted_results = []
@@ -336,7 +445,9 @@ class VectorService:
                     "full_name": result.payload.get("full_name"),
                     "email": result.payload.get("email"),
                     "role": result.payload.get("role"),
+                    "seniority": result.payload.get("seniority"),
                     "internal_cost": result.payload.get("internal_cost"),
+                    "availability_percentage": result.payload.get("availability_percentage"),
                     "skills_text": result.payload.get("skills_text"),
                     "similarity_score": result.score,  # 0-1 (COSINE)
                 })
@@ -349,5 +460,56 @@ class VectorService:
             return []
 
 
+def hydrate_search_results(
+    results: List[Dict[str, Any]],
+    start_date: date,
+    end_date: date,
+) -> List[Dict[str, Any]]:
+    """
+    Une los resultados de Qdrant con el Resource vigente y su disponibilidad en el
+    período, con una sola consulta (asignaciones agregadas con Sum/Count filtrados).
+    Los recursos eliminados o inactivos desde la última sincronización se omiten.
+
+    Returns:
+        Lista en el orden de `results` con resource, similarity_score, allocated_hours,
+        capacity_weekly, remaining_capacity, utilization_percentage y active_project_count
+    """
+    overlap = Q(
+        allocations__is_active=True,
+        allocations__start_date__lte=end_date,
+        allocations__end_date__gte=start_date,
+    )
+    resources = Resource.objects.select_related('primary_role').filter(
+        id__in=[result['resource_id'] for result in results],
+        is_active=True,
+    ).annotate(
+        allocated_hours=Coalesce(
+            Sum('allocations__hours_per_week', filter=overlap),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=7, decimal_places=2),
+        ),
+        active_project_count=Count('allocations__project', filter=overlap, distinct=True),
+    ).in_bulk()
+
+    hydrated = []
+    for result in results:
+        resource = resources.get(result['resource_id'])
+        if resource is None:
+            continue
+        capacity = weekly_capacity(resource)
+        hydrated.append({
+            'resource': resource,
+            'similarity_score': result['similarity_score'],
+            'allocated_hours': resource.allocated_hours,
+            'capacity_weekly': capacity,
+            'remaining_capacity': max(Decimal('0.00'), capacity - resource.allocated_hours),
+            'utilization_percentage': round(
+                float(resource.allocated_hours / capacity * 100) if capacity > 0 else 0.0, 1
+            ),
+            'active_project_count': resource.active_project_count,
+        })
+    return hydrated
+
+
 # Instancia singleton del servicio
 vector_service = VectorService()
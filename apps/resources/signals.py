@@ -1,10 +1,14 @@
 """
-Signals para sincronización automática de Resources con Qdrant.
+Signals para sincronización automática de Resources con Qdrant
+y el refresco incremental de candidatos por rol.
 """
 import logging
+from django.conf import settings
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Resource
+from .matching import RESOURCE_MATCH_FIELDS, ROLE_MATCH_FIELDS
+from .models import Resource, Role
 from .services import vector_service
 
 logger = logging.getLogger(__name__)
@@ -47,3 +51,41 @@ def delete_resource_from_qdrant(sender, instance, **kwargs):
             logger.info(f"✅ Resource {instance.full_name} eliminado de Qdrant")
         else:
             logger.error(f"❌ Error eliminando {instance.full_name} de Qdrant")
+
+
+@receiver(post_save, sender=Resource)
+@receiver(post_delete, sender=Resource)
+def refresh_resource_role_matches(sender, instance, update_fields=None, **kwargs):
+    """
+    Encola el refresco del top-k de candidatos cuando cambian las skills, el rol
+    o el estado de un recurso. Guardados parciales de otros campos no encolan nada.
+    """
+    if update_fields is not None and not RESOURCE_MATCH_FIELDS.intersection(update_fields):
+        return
+    if not getattr(settings, 'ENABLE_ROLE_MATCHING', True):
+        return
+
+    resource_id = instance.pk
+    transaction.on_commit(lambda: _enqueue('refresh_resource_candidates', [resource_id]))
+
+
+@receiver(post_save, sender=Role)
+def rebuild_role_matches(sender, instance, update_fields=None, **kwargs):
+    """Encola el recálculo del top-k de un rol cuando cambian su nombre, skills o estado."""
+    if update_fields is not None and not ROLE_MATCH_FIELDS.intersection(update_fields):
+        return
+    if not getattr(settings, 'ENABLE_ROLE_MATCHING', True):
+        return
+
+    role_id = instance.pk
+    transaction.on_commit(lambda: _enqueue('rebuild_role_candidates', [role_id]))
+
+
+def _enqueue(task_name: str, ids: list):
+    """Encola el refresco; si el broker no está disponible lo corrige rebuild_role_candidates."""
+    from . import tasks
+
+    try:
+        getattr(tasks, task_name).delay(ids)
+    except Exception as e:
+        logger.error(f"❌ No se pudo encolar {task_name}({ids}): {e}")
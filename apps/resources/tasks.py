@@ -22,3 +22,37 @@ def sync_resource_status():
     """
     # TODO: Implementar lógica de sincronización
     pass
+
+
+@shared_task
+def reconcile_resources_qdrant(batch_size: int = 64, page_size: int = 1000):
+    """
+    Reconcilia la colección Qdrant de talento con la tabla Resource:
+    re-vectoriza, actualiza o elimina solo los puntos con drift.
+    """
+    from .reconcile import reconcile_resources
+
+    report = reconcile_resources(batch_size=batch_size, page_size=page_size)
+    return f"Reconciled {report['scanned']} resources: {report}"
+
+
+@shared_task
+def rebuild_role_candidates(role_ids: list = None):
+    """
+    Recalcula el top-k de candidatos de los roles indicados (por defecto todos).
+    """
+    from .matching import rebuild_role_candidates as rebuild
+
+    count = rebuild(role_ids)
+    return f"Rebuilt candidates for {count} roles"
+
+
+@shared_task
+def refresh_resource_candidates(resource_ids: list):
+    """
+    Mezcla los recursos modificados en el top-k de candidatos de cada rol.
+    """
+    from .matching import refresh_resource_candidates as refresh
+
+    count = refresh(resource_ids)
+    return f"Refreshed candidates of {count} roles for {len(resource_ids)} resources"
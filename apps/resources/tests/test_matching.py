@@ -0,0 +1,64 @@
+"""Tests de top_k y de la mezcla incremental del top-k de candidatos por rol."""
+import numpy as np
+
+from apps.resources.matching import merge_top_k, normalize_skill, skill_names, top_k
+
+
+def test_top_k_orders_by_score_descending():
+    similarity = np.array([[0.1, 0.9, 0.5, 0.7], [0.8, 0.2, 0.6, 0.4]])
+    assert top_k(similarity, 2).tolist() == [[1, 3], [0, 2]]
+
+
+def test_top_k_breaks_ties_by_column_index():
+    similarity = np.array([[0.5, 0.9, 0.5, 0.5, 0.1]])
+    assert top_k(similarity, 3).tolist() == [[1, 0, 2]]
+
+
+def test_top_k_with_k_larger_than_columns_returns_full_ranking():
+    similarity = np.array([[0.3, 0.1, 0.2]])
+    assert top_k(similarity, 10).tolist() == [[0, 2, 1]]
+
+
+def test_top_k_with_zero_k_or_no_columns_is_empty():
+    assert top_k(np.ones((2, 3)), 0).shape == (2, 0)
+    assert top_k(np.ones((2, 0)), 3).shape == (2, 0)
+
+
+PREVIOUS = {1: 0.9, 2: 0.8, 3: 0.7}
+
+
+def test_merge_top_k_inserts_improved_resource():
+    ranked = merge_top_k(PREVIOUS, {4: 0.85}, {4}, k=3, active_count=10)
+    assert ranked == [(1, 0.9), (4, 0.85), (2, 0.8)]
+
+
+def test_merge_top_k_keeps_resource_above_floor():
+    ranked = merge_top_k(PREVIOUS, {1: 0.75}, {1}, k=3, active_count=10)
+    assert ranked == [(2, 0.8), (1, 0.75), (3, 0.7)]
+
+
+def test_merge_top_k_rebuilds_when_score_drops_below_floor():
+    # Un recurso no guardado (score <= 0.7) podría superar al 0.5
+    assert merge_top_k(PREVIOUS, {1: 0.5}, {1}, k=3, active_count=10) is None
+
+
+def test_merge_top_k_rebuilds_when_resource_removed():
+    # Recurso desactivado: no viene en updates y deja un hueco en el top-k
+    assert merge_top_k(PREVIOUS, {}, {2}, k=3, active_count=10) is None
+
+
+def test_merge_top_k_accepts_short_list_when_few_active_resources():
+    ranked = merge_top_k({1: 0.9, 2: 0.8}, {2: 0.95}, {2}, k=3, active_count=2)
+    assert ranked == [(2, 0.95), (1, 0.9)]
+
+
+def test_merge_top_k_breaks_ties_by_resource_id():
+    ranked = merge_top_k(PREVIOUS, {5: 0.8}, {5}, k=3, active_count=10)
+    assert ranked == [(1, 0.9), (2, 0.8), (5, 0.8)]
+
+
+def test_skill_names_sorted_by_level_and_normalized():
+    skills = [{'name': ' SQL', 'level': 2}, {'name': 'Python ', 'level': 5}, 'Django', {'name': ''}]
+    assert skill_names(skills) == ['Python ', ' SQL', 'Django']
+    assert skill_names(skills, normalize=True) == ['python', 'sql', 'django']
+    assert normalize_skill(None) == ''
@@ -0,0 +1,82 @@
+"""Tests de la búsqueda semántica de talento contra un Qdrant en memoria."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+from apps.resources.models import Resource, Role
+from apps.resources.qdrant import ensure_collection
+from apps.resources.services import PAYLOAD_INDEXES, hydrate_search_results, vector_service
+
+QUERY_VECTOR = [1.0] + [0.0] * (vector_service.vector_size - 1)
+
+
+def _vector(similarity: float):
+    """Vector unitario con similitud COSINE `similarity` respecto a QUERY_VECTOR."""
+    return [similarity, (1 - similarity ** 2) ** 0.5] + [0.0] * (vector_service.vector_size - 2)
+
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    client = QdrantClient(':memory:')
+    ensure_collection(client, vector_service.collection_name, vector_service.vector_size, PAYLOAD_INDEXES)
+    monkeypatch.setattr(vector_service, '_client', client)
+    monkeypatch.setattr(vector_service, 'embed_query', lambda query: QUERY_VECTOR)
+    return client
+
+
+@pytest.fixture
+def resources(db, monkeypatch):
+    # La sincronización por signal no es parte de estos tests (los puntos se indexan en _index)
+    monkeypatch.setattr(vector_service, 'upsert_resource', lambda resource: False)
+    role = Role.objects.create(
+        name='Backend Developer', code='BE', category='technical', standard_rate=Decimal('120.00'),
+    )
+    return [
+        Resource.objects.create(
+            primary_role=role, employee_id=f'E{i}', first_name='Dev', last_name=str(i),
+            email=f'dev{i}@example.com', internal_cost=Decimal('60.00'), is_active=active,
+        )
+        for i, active in enumerate([True, True, False])
+    ]
+
+
+def _index(client, resources, similarities):
+    client.upsert(vector_service.collection_name, points=[
+        PointStruct(id=resource.id, vector=_vector(similarity), payload={
+            **vector_service.resource_payload(resource), 'is_active': True,
+        })
+        for resource, similarity in zip(resources, similarities)
+    ])
+
+
+def test_search_resources_returns_hits_by_similarity(qdrant, resources):
+    _index(qdrant, resources, [0.6, 0.9, 0.8])
+
+    results = vector_service.search_resources('backend python', limit=2)
+
+    assert [result['resource_id'] for result in results] == [resources[1].id, resources[2].id]
+    assert results[0]['similarity_score'] == pytest.approx(0.9)
+
+
+def test_search_resources_applies_threshold_and_offset(qdrant, resources):
+    _index(qdrant, resources, [0.6, 0.9, 0.8])
+
+    results = vector_service.search_resources('backend', offset=1, score_threshold=0.7)
+
+    assert [result['resource_id'] for result in results] == [resources[2].id]
+
+
+def test_search_hits_are_hydrated_with_active_resources(qdrant, resources):
+    _index(qdrant, resources, [0.6, 0.9, 0.8])
+
+    hydrated = hydrate_search_results(
+        vector_service.search_resources('backend'), date(2025, 1, 1), date(2025, 1, 31),
+    )
+
+    # El recurso inactivo (índice 2) sigue en Qdrant pero se omite al hidratar
+    assert [result['resource'] for result in hydrated] == [resources[1], resources[0]]
+    assert hydrated[0]['allocated_hours'] == Decimal('0.00')
+    assert hydrated[0]['active_project_count'] == 0
@@ -10,6 +10,8 @@ urlpatterns = [
     path('', views.resource_list, name='list'),
     path('create/', views.resource_create, name='create'),
     path('capacity/', views.resource_capacity_chart, name='capacity_chart'),
+    path('search/', views.talent_search, name='talent_search'),
+    path('api/search/', views.talent_search_api, name='talent_search_api'),
     path('roles/create/', views.role_create, name='role_create'),
     path('roles/<int:pk>/edit/', views.role_edit, name='role_edit'),
     path('<int:pk>/', views.resource_detail, name='detail'),
@@ -7,6 +7,8 @@ from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.db.models import Sum, Q
 from decimal import Decimal
+from apps.core.stats import count_by
+from .capacity import period_capacity
 from .models import Resource, Role
 from .forms import ResourceForm, RoleForm
 
@@ -15,20 +17,18 @@ def resource_list(request):
     """Lista de recursos."""
     resources = Resource.objects.select_related('primary_role').filter(is_active=True)
 
-    # Calcular estadísticas
-    available_count = resources.filter(status='available').count()
-    partially_count = resources.filter(status='partially_allocated').count()
-    fully_count = resources.filter(status='fully_allocated').count()
+    # Calcular estadísticas (una sola consulta)
+    stats = count_by(resources, 'status', ['available', 'partially_allocated', 'fully_allocated'])
 
     # Obtener roles activos
     roles = Role.objects.filter(is_active=True).order_by('category', 'seniority')
 
     context = {
         'resources': resources,
-        'total_count': resources.count(),
-        'available_count': available_count,
-        'partially_count': partially_count,
-        'fully_count': fully_count,
+        'total_count': stats['total'],
+        'available_count': stats['available'],
+        'partially_count': stats['partially_allocated'],
+        'fully_count': stats['fully_allocated'],
         'roles': roles,
     }
     return render(request, 'resources/list.html', context)
@@ -380,15 +380,8 @@ def resource_capacity_chart(request):
     for resource in resources:
         chart_data['labels'].append(resource.full_name)
 
-        # Calcular capacidad en el período usando semanas completas
-        # Usar la misma lógica que las asignaciones: división entera, mínimo 1 semana
-        days_in_period = (end_date - start_date).days
-        weeks_in_period = max(1, days_in_period // 7)
-
-        # Capacidad semanal = 40h * disponibilidad
-        weekly_capacity = Decimal('40.0') * (Decimal(resource.availability_percentage) / Decimal('100.0'))
-        period_capacity = weekly_capacity * Decimal(weeks_in_period)
-        chart_data['capacities'].append(float(period_capacity))
+        # Capacidad en el período usando semanas completas (misma lógica que las asignaciones)
+        chart_data['capacities'].append(float(period_capacity(resource, start_date, end_date)))
 
         # === TIEMPO REGISTRADO (ACTUAL) ===
         # Obtener horas de TimeLog
@@ -497,6 +490,142 @@ def resource_capacity_chart(request):
     return render(request, 'resources/capacity_chart.html', context)
 
 
+# Búsqueda semántica de talento (RF-03)
+TALENT_SEARCH_PAGE_SIZE = 10
+TALENT_SEARCH_DAYS = 30  # Período por defecto para la disponibilidad
+
+
+def _float_param(request, name):
+    try:
+        return float(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _talent_search_params(request) -> dict:
+    """
+    Parámetros de búsqueda de talento desde el querystring.
+    Los rangos se traducen a condiciones sobre el payload de Qdrant.
+    """
+    from datetime import datetime, timedelta
+    from django.utils import timezone
+    from .services import SENIORITY_LEVELS
+
+    start_date = timezone.now().date()
+    try:
+        start_date = datetime.strptime(request.GET.get('start_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        pass
+    end_date = start_date + timedelta(days=TALENT_SEARCH_DAYS)
+    try:
+        end_date = datetime.strptime(request.GET.get('end_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        pass
+
+    filters = {'is_active': True}
+    category = request.GET.get('role_category', '')
+    if category in dict(Role.CATEGORY_CHOICES):
+        filters['role_category'] = category
+
+    page = request.GET.get('page', '1')
+    return {
+        'query': request.GET.get('q', '').strip(),
+        'filters': filters,
+        'ranges': {
+            'internal_cost': (_float_param(request, 'cost_min'), _float_param(request, 'cost_max')),
+            'seniority_level': (
+                SENIORITY_LEVELS.get(request.GET.get('seniority_min')),
+                SENIORITY_LEVELS.get(request.GET.get('seniority_max')),
+            ),
+            'availability_percentage': (_float_param(request, 'availability_min'), None),
+        },
+        'score_threshold': _float_param(request, 'min_score'),
+        'page': max(1, int(page)) if page.isdigit() else 1,
+        'start_date': start_date,
+        'end_date': end_date,
+    }
+
+
+def _talent_search_page(params: dict):
+    """
+    Página de resultados: Qdrant resuelve filtros, offset y umbral; se pide un
+    resultado extra para saber si hay página siguiente. Luego se hidrata con una query.
+    """
+    from .services import hydrate_search_results, vector_service
+
+    if not params['query']:
+        return [], False
+    results = vector_service.search_resources(
+        params['query'],
+        limit=TALENT_SEARCH_PAGE_SIZE + 1,
+        filters=params['filters'],
+        ranges=params['ranges'],
+        offset=(params['page'] - 1) * TALENT_SEARCH_PAGE_SIZE,
+        score_threshold=params['score_threshold'],
+    )
+    has_next = len(results) > TALENT_SEARCH_PAGE_SIZE
+    hydrated = hydrate_search_results(
+        results[:TALENT_SEARCH_PAGE_SIZE], params['start_date'], params['end_date']
+    )
+    return hydrated, has_next
+
+
+@login_required
+def talent_search(request):
+    """
+    RF-03: Búsqueda semántica de talento con filtros por rango y paginación.
+    Con HTMX solo se renderiza el fragmento de resultados.
+    """
+    params = _talent_search_params(request)
+    results, has_next = _talent_search_page(params)
+
+    context = {
+        'params': params,
+        'results': results,
+        'has_next': has_next,
+        'previous_page': params['page'] - 1,
+        'next_page': params['page'] + 1,
+        'category_choices': Role.CATEGORY_CHOICES,
+        'seniority_choices': Role.SENIORITY_CHOICES,
+    }
+    if request.htmx:
+        return render(request, 'resources/partials/talent_results.html', context)
+    return render(request, 'resources/talent_search.html', context)
+
+
+@login_required
+def talent_search_api(request):
+    """API JSON de búsqueda semántica de talento (mismos parámetros que la vista HTMX)."""
+    from django.http import JsonResponse
+
+    params = _talent_search_params(request)
+    if not params['query']:
+        return JsonResponse({'error': 'Se requiere el parámetro q'}, status=400)
+
+    results, has_next = _talent_search_page(params)
+    return JsonResponse({
+        'query': params['query'],
+        'page': params['page'],
+        'has_next': has_next,
+        'results': [
+            {
+                'resource_id': result['resource'].id,
+                'full_name': result['resource'].full_name,
+                'role': result['resource'].primary_role.name,
+                'seniority': result['resource'].primary_role.seniority,
+                'internal_cost': float(result['resource'].internal_cost),
+                'availability_percentage': result['resource'].availability_percentage,
+                'similarity_score': round(result['similarity_score'], 4),
+                'allocated_hours': float(result['allocated_hours']),
+                'remaining_capacity': float(result['remaining_capacity']),
+                'utilization_percentage': result['utilization_percentage'],
+                'active_project_count': result['active_project_count'],
+            }
+            for result in results
+        ],
+    })
+
+
 def generate_color(seed, alpha=0.8, border=False):
     """
     Genera un color consistente basado en un seed (para que cada proyecto tenga el mismo color).
@@ -8,10 +8,12 @@ from .models import StandupLog, TeamMood
 @admin.register(StandupLog)
 class StandupLogAdmin(admin.ModelAdmin):
     list_display = ['resource', 'project', 'date', 'sentiment_label', 'has_blockers', 'requires_attention', 'nlp_processed']
-    list_filter = ['sentiment_label', 'has_blockers', 'requires_attention', 'nlp_processed', 'date']
+    list_filter = ['sentiment_label', 'has_blockers', 'blocker_severity', 'requires_attention', 'nlp_processed', 'date']
     search_fields = ['resource__full_name', 'project__name', 'what_i_did', 'blockers']
     readonly_fields = ['sentiment_score', 'sentiment_label', 'sentiment_confidence', 'detected_entities', 
-                      'keywords', 'nlp_processed', 'nlp_processed_at', 'created_at', 'updated_at']
+                      'keywords', 'blocker_entities', 'nlp_processed', 'nlp_processed_at', 'nlp_attempts', 'duplicate_of',
+                      'duplicate_similarity', 'created_at', 'updated_at']
+    raw_id_fields = ['blocked_tasks', 'blocked_projects']
     date_hierarchy = 'date'
     
     fieldsets = (
@@ -27,10 +29,15 @@ class StandupLogAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Indicadores de Riesgo', {
-            'fields': ('has_blockers', 'blocker_severity', 'requires_attention')
+            'fields': ('has_blockers', 'blocker_severity', 'requires_attention', 'blocker_entities',
+                      'blocked_tasks', 'blocked_projects')
         }),
         ('Procesamiento NLP', {
-            'fields': ('nlp_processed', 'nlp_processed_at')
+            'fields': ('nlp_processed', 'nlp_processed_at', 'nlp_attempts')
+        }),
+        ('Casi Duplicados', {
+            'fields': ('duplicate_of', 'duplicate_similarity'),
+            'classes': ('collapse',)
         }),
         ('Notas', {
             'fields': ('notes',)
@@ -49,7 +56,7 @@ class StandupLogAdmin(admin.ModelAdmin):
         
         count = 0
         for standup in queryset:
-            analyze_standup_sentiment.delay(standup.id)
+            analyze_standup_sentiment.delay(standup.id, force=True)
             count += 1
         
         self.message_user(request, f"{count} standups enviados para análisis de sentimiento.")
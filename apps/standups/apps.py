@@ -5,3 +5,7 @@ class StandupsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.standups'
     verbose_name = 'Daily Standups'
+    
+    def ready(self):
+        """Importar signals cuando la app esté lista."""
+        import apps.standups.signals  # noqa
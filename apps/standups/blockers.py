@@ -0,0 +1,387 @@
+"""
+Detección de bloqueadores en standups (RF-10).
+
+Clasifica el campo `blockers` con reglas de spaCy (PhraseMatcher para léxicos por
+severidad y categoría, Matcher para patrones de tokens), descarta menciones negadas
+o resueltas ("ya no estoy bloqueado", "sin bloqueos", "el acceso quedó resuelto") y
+vincula el bloqueo a las tareas y proyectos mencionados.
+
+Los léxicos por severidad se pueden extender o reemplazar con BLOCKER_LEXICONS en
+settings, por ejemplo:
+
+    BLOCKER_LEXICONS = {'critical': ['caída del cluster'], 'low': ['consulta menor']}
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# De mayor a menor: la severidad de un standup es la más alta encontrada
+SEVERITIES = ['critical', 'high', 'medium', 'low']
+
+DEFAULT_BLOCKER_LEXICONS: Dict[str, List[str]] = {
+    'critical': [
+        'producción caída', 'caída en producción', 'servidor caído', 'sistema caído',
+        'pérdida de datos', 'bloqueo total', 'totalmente bloqueado', 'completamente bloqueado',
+        'brecha de seguridad', 'incidente crítico', 'no puedo avanzar', 'no podemos avanzar',
+        'todo detenido', 'cliente bloqueado',
+    ],
+    'high': [
+        'bloqueado', 'bloqueada', 'bloqueados', 'bloqueadas', 'bloqueo', 'bloqueos',
+        'sin acceso', 'no tengo acceso', 'no tenemos acceso', 'esperando aprobación',
+        'dependencia externa', 'no funciona', 'no compila', 'falla', 'fallando', 'impedimento',
+        'impedimentos',
+    ],
+    'medium': [
+        'esperando', 'pendiente de', 'retraso', 'retrasos', 'demora', 'demoras', 'lento',
+        'problema', 'problemas', 'error', 'errores', 'falta de', 'atascado', 'atascada',
+        'complicado', 'complicada',
+    ],
+    'low': [
+        'duda', 'dudas', 'consulta', 'pregunta', 'preguntas', 'detalle menor', 'revisar',
+        'pequeño problema',
+    ],
+}
+
+# Categorías de entidades del bloqueo (ver ESPEC RF-10)
+DEFAULT_BLOCKER_CATEGORIES: Dict[str, List[str]] = {
+    'technologies': [
+        'postgresql', 'postgres', 'redis', 'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'api',
+        'qdrant', 'celery', 'django', 'react', 'pipeline', 'ci', 'base de datos', 'servidor',
+    ],
+    'external_deps': [
+        'cliente', 'proveedor', 'equipo de diseño', 'diseño', 'qa', 'legal', 'seguridad',
+        'infraestructura', 'devops', 'otro equipo', 'soporte',
+    ],
+    'resources': [
+        'acceso', 'credenciales', 'permisos', 'licencia', 'licencias', 'vpn', 'ambiente',
+        'entorno de pruebas', 'datos de prueba', 'hardware',
+    ],
+}
+
+# Patrones de tokens (Matcher) que no son frases fijas
+TOKEN_PATTERNS: Dict[str, List[List[dict]]] = {
+    'critical': [
+        [{'LOWER': {'IN': ['producción', 'prod']}}, {'LOWER': {'IN': ['caída', 'caida', 'abajo']}}],
+    ],
+    'high': [
+        [{'LOWER': 'no'}, {'LOWER': {'IN': ['puedo', 'podemos', 'pude', 'pudimos', 'logro']}}],
+        [{'LOWER': {'IN': ['necesito', 'necesitamos']}}, {'LOWER': {'IN': ['acceso', 'credenciales', 'permisos']}}],
+    ],
+    'medium': [
+        [{'LOWER': {'IN': ['esperando', 'espero']}}, {'LOWER': {'IN': ['respuesta', 'feedback', 'confirmación']}}],
+    ],
+}
+
+NEGATION_TERMS = {'no', 'nunca', 'sin', 'ningún', 'ninguna', 'ninguno', 'tampoco', 'nada', 'ni'}
+RESOLUTION_TERMS = {
+    'resuelto', 'resuelta', 'resueltos', 'resolví', 'resolvimos', 'solucionado', 'solucionada',
+    'solucioné', 'solucionamos', 'desbloqueado', 'desbloqueada', 'superado', 'cerrado',
+}
+# Textos que significan "sin bloqueadores"
+EMPTY_BLOCKER_TEXTS = {
+    '', '-', 'n/a', 'na', 'no', 'none', 'nada', 'ninguno', 'ninguna', 'ningún bloqueo',
+    'sin bloqueos', 'sin bloqueadores', 'sin impedimentos', 'no hay', 'no hay bloqueos',
+}
+# Tokens previos revisados para negación cuando el modelo no tiene parser
+NEGATION_WINDOW = 3
+
+TASK_REFERENCE_RE = re.compile(r'(?:#|\btarea\s+#?)(\d+)\b', re.IGNORECASE)
+
+# Proyectos que se pueden mencionar en un bloqueador (de cualquier proyecto)
+MENTIONABLE_PROJECT_STATUSES = ['planning', 'active', 'on_hold']
+# Versión de los proyectos mencionables: cada proceso reconstruye su matcher de
+# proyectos solo cuando cambia (la incrementan los signals de Project)
+PROJECT_REFERENCES_VERSION_KEY = 'standups:blockers:projects:version'
+
+# Matcher de proyectos del proceso: {'version', 'nlp', 'matcher'}
+_project_matcher_cache: Dict = {}
+
+
+@dataclass
+class BlockerResult:
+    """Resultado de la clasificación de un texto de bloqueadores."""
+
+    has_blockers: bool = False
+    severity: Optional[str] = None
+    matches: List[Dict] = field(default_factory=list)
+    entities: Dict[str, List[str]] = field(default_factory=dict)
+    task_ids: Set[int] = field(default_factory=set)
+    project_ids: Set[int] = field(default_factory=set)
+
+    def as_entities(self) -> Dict:
+        """Representación JSON guardada en StandupLog.blocker_entities."""
+        return {**self.entities, 'matches': self.matches}
+
+
+def bump_project_references():
+    """Invalida el matcher de proyectos de todos los procesos."""
+    cache.set(PROJECT_REFERENCES_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def project_matcher(nlp):
+    """
+    PhraseMatcher con el nombre y código de los proyectos mencionables, construido
+    una vez por proceso y reconstruido solo cuando cambia la versión en cache.
+    """
+    from spacy.matcher import PhraseMatcher
+    from apps.projects.models import Project
+
+    version = cache.get(PROJECT_REFERENCES_VERSION_KEY)
+    if version is None:
+        cache.add(PROJECT_REFERENCES_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(PROJECT_REFERENCES_VERSION_KEY)
+
+    cached = _project_matcher_cache
+    if cached.get('version') == version and cached.get('nlp') is nlp:
+        return cached['matcher']
+
+    matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+    for project in Project.objects.filter(status__in=MENTIONABLE_PROJECT_STATUSES).only('pk', 'name', 'code'):
+        phrases = [p for p in (project.name, project.code) if p and len(p) >= 3]
+        if phrases:
+            matcher.add(f'project:{project.pk}', list(nlp.tokenizer.pipe(phrases)))
+
+    _project_matcher_cache.update(version=version, nlp=nlp, matcher=matcher)
+    return matcher
+
+
+class ReferenceIndex:
+    """
+    Índice de tareas y proyectos mencionables en un lote de standups.
+    El matcher de proyectos se comparte entre lotes (project_matcher); el de
+    tareas se construye por lote con las tareas abiertas de sus proyectos.
+    """
+
+    def __init__(self, nlp, project_matcher, tasks: Iterable):
+        from spacy.matcher import PhraseMatcher
+
+        self.project_matcher = project_matcher
+        self.task_matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+        self.task_project: Dict[int, int] = {}
+
+        for task in tasks:
+            self.task_project[task.pk] = task.project_id
+            if task.title and len(task.title) >= 4:
+                self.task_matcher.add(f'task:{task.pk}', [nlp.make_doc(task.title)])
+
+    @classmethod
+    def for_project_ids(cls, nlp, project_ids: Iterable[int]) -> 'ReferenceIndex':
+        """Índice con los proyectos mencionables y las tareas abiertas de los proyectos indicados."""
+        from apps.projects.models import Task
+
+        tasks = Task.objects.filter(project_id__in=set(project_ids)).exclude(
+            status='completed'
+        ).only('pk', 'title', 'project_id')
+        return cls(nlp, project_matcher(nlp), tasks)
+
+    def resolve(self, doc, text: str, project_id: Optional[int]):
+        """Retorna (task_ids, project_ids) mencionados en el texto."""
+        task_ids, project_ids = set(), set()
+        for match_id, _, _ in list(self.project_matcher(doc)) + list(self.task_matcher(doc)):
+            kind, pk = doc.vocab.strings[match_id].split(':')
+            if kind == 'project':
+                project_ids.add(int(pk))
+            elif self.task_project.get(int(pk)) == project_id:
+                task_ids.add(int(pk))
+
+        # Referencias explícitas: "#123" o "tarea 123"
+        for reference in TASK_REFERENCE_RE.findall(text):
+            if self.task_project.get(int(reference)) == project_id:
+                task_ids.add(int(reference))
+
+        return task_ids, project_ids
+
+
+class BlockerDetector:
+    """
+    Clasificador de bloqueadores basado en reglas de spaCy.
+    Reutiliza el modelo cargado por SentimentAnalyzer; si no está disponible usa
+    un pipeline en blanco (la negación cae al análisis por ventana de tokens).
+    """
+
+    def __init__(self, nlp=None, lexicons: Optional[Dict[str, List[str]]] = None):
+        self._nlp = nlp
+        self._lexicons = lexicons
+        self._phrase_matcher = None
+        self._category_matcher = None
+        self._token_matcher = None
+
+    @property
+    def nlp(self):
+        """Lazy loading del pipeline de spaCy."""
+        if self._nlp is None:
+            from .nlp_utils import analyzer
+
+            if analyzer.nlp is not None:
+                self._nlp = analyzer.nlp
+            else:
+                import spacy
+                logger.warning("⚠️ Modelo spaCy no disponible, usando pipeline en blanco para bloqueadores")
+                self._nlp = spacy.blank('es')
+        return self._nlp
+
+    @property
+    def lexicons(self) -> Dict[str, List[str]]:
+        """Léxicos por severidad: defaults combinados con settings.BLOCKER_LEXICONS."""
+        if self._lexicons is None:
+            lexicons = {severity: list(phrases) for severity, phrases in DEFAULT_BLOCKER_LEXICONS.items()}
+            for severity, phrases in getattr(settings, 'BLOCKER_LEXICONS', {}).items():
+                if severity not in SEVERITIES:
+                    raise ValueError(f"Severidad desconocida en BLOCKER_LEXICONS: {severity}")
+                lexicons[severity] = list(phrases)
+            self._lexicons = lexicons
+        return self._lexicons
+
+    def _build_matchers(self):
+        from spacy.matcher import Matcher, PhraseMatcher
+
+        nlp = self.nlp
+        self._phrase_matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+        for severity, phrases in self.lexicons.items():
+            if phrases:
+                self._phrase_matcher.add(severity, list(nlp.tokenizer.pipe(phrases)))
+
+        self._category_matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+        for category, phrases in DEFAULT_BLOCKER_CATEGORIES.items():
+            self._category_matcher.add(category, list(nlp.tokenizer.pipe(phrases)))
+
+        self._token_matcher = Matcher(nlp.vocab)
+        for severity, patterns in TOKEN_PATTERNS.items():
+            self._token_matcher.add(severity, patterns)
+
+    @property
+    def matchers(self):
+        if self._phrase_matcher is None:
+            self._build_matchers()
+        return self._phrase_matcher, self._category_matcher, self._token_matcher
+
+    @staticmethod
+    def is_empty(text: str) -> bool:
+        """True si el texto equivale a "sin bloqueadores"."""
+        return (text or '').strip().strip('.').lower() in EMPTY_BLOCKER_TEXTS
+
+    @staticmethod
+    def is_negated(span) -> bool:
+        """
+        Determina si una mención está negada o resuelta.
+
+        Con parser de dependencias revisa los hijos de la raíz del span y de su
+        núcleo (ej: "no" como advmod de "estoy" en "no estoy bloqueado"); sin
+        parser revisa una ventana de tokens previos y el resto de la cláusula.
+        """
+        doc = span.doc
+        if span[0].lower_ in NEGATION_TERMS:
+            # La propia frase incluye la negación ("no puedo", "sin acceso")
+            return False
+
+        if doc.has_annotation('DEP'):
+            governors = [span.root, span.root.head]
+            for governor in governors:
+                if governor.lower_ in RESOLUTION_TERMS:
+                    return True
+                for child in governor.children:
+                    if child.i in range(span.start, span.end):
+                        continue
+                    if child.lower_ in NEGATION_TERMS or child.lower_ in RESOLUTION_TERMS:
+                        return True
+            return False
+
+        start = span.start
+        for token in reversed(doc[max(0, start - NEGATION_WINDOW):start]):
+            if token.is_punct:
+                break
+            if token.lower_ in NEGATION_TERMS:
+                return True
+        for token in doc[span.end:]:
+            if token.is_punct:
+                break
+            if token.lower_ in RESOLUTION_TERMS:
+                return True
+        return False
+
+    def classify(self, doc) -> BlockerResult:
+        """Clasifica un Doc ya procesado."""
+        phrase_matcher, category_matcher, token_matcher = self.matchers
+        result = BlockerResult()
+
+        found = set()
+        for match_id, start, end in list(phrase_matcher(doc)) + list(token_matcher(doc)):
+            span = doc[start:end]
+            if self.is_negated(span):
+                continue
+            severity = doc.vocab.strings[match_id]
+            found.add(severity)
+            result.matches.append({'text': span.text, 'severity': severity, 'start': start, 'end': end})
+
+        if not found:
+            return result
+
+        result.has_blockers = True
+        result.severity = next(severity for severity in SEVERITIES if severity in found)
+        result.matches.sort(key=lambda m: m['start'])
+
+        for match_id, start, end in category_matcher(doc):
+            values = result.entities.setdefault(doc.vocab.strings[match_id], [])
+            text = doc[start:end].text
+            if text.lower() not in (v.lower() for v in values):
+                values.append(text)
+        return result
+
+    def detect(self, text: str) -> BlockerResult:
+        """Clasifica un único texto."""
+        return self.detect_many([text])[0]
+
+    def detect_many(
+        self,
+        texts: Iterable[str],
+        project_ids: Optional[Iterable[Optional[int]]] = None,
+        references: Optional[ReferenceIndex] = None,
+        batch_size: int = 256,
+        n_process: int = 1,
+    ) -> List[BlockerResult]:
+        """
+        Clasifica muchos textos con nlp.pipe (procesamiento por lotes).
+
+        Args:
+            texts: Textos del campo blockers
+            project_ids: Proyecto de cada texto (para vincular tareas del propio proyecto)
+            references: Índice de tareas/proyectos mencionables
+            batch_size: Tamaño de lote de nlp.pipe
+            n_process: Procesos de nlp.pipe (CPU)
+
+        Returns:
+            Lista de BlockerResult en el mismo orden que `texts`
+        """
+        texts = [text or '' for text in texts]
+        project_ids = list(project_ids) if project_ids is not None else [None] * len(texts)
+
+        results = [BlockerResult() for _ in texts]
+        pending = [i for i, text in enumerate(texts) if not self.is_empty(text)]
+        if not pending:
+            return results
+
+        nlp = self.nlp
+        disable = [name for name in ('ner',) if name in nlp.pipe_names]
+        docs = nlp.pipe(
+            (texts[i] for i in pending),
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=disable,
+        )
+        for i, doc in zip(pending, docs):
+            result = self.classify(doc)
+            if result.has_blockers and references is not None:
+                result.task_ids, result.project_ids = references.resolve(doc, texts[i], project_ids[i])
+            results[i] = result
+        return results
+
+
+# Instancia global del detector
+detector = BlockerDetector()
@@ -0,0 +1,191 @@
+"""
+Detección de standups casi duplicados (copy-paste) con MinHash + LSH.
+
+Cada standup se reduce a una firma MinHash de NUM_PERM valores sobre shingles
+de SHINGLE_SIZE palabras; la firma se divide en LSH_BANDS bandas y cada banda
+se guarda como un bucket (StandupLSHBucket). Dos standups del mismo recurso o
+del mismo proyecto que comparten algún bucket son candidatos, y se confirman
+si la similitud de Jaccard estimada supera DUPLICATE_STANDUP_THRESHOLD.
+
+Un duplicado apunta al standup original más antiguo (`duplicate_of`) y pesa
+DUPLICATE_STANDUP_WEIGHT en las agregaciones de sentimiento y keywords
+(ver aggregation_weight).
+"""
+import hashlib
+import random
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Q, Sum, Value, When
+
+from .models import StandupLog, StandupLSHBucket, StandupMinHash
+from .nlp_utils import fold_accents
+
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS  # Umbral aproximado de LSH: (1/16)^(1/4) ≈ 0.5
+SHINGLE_SIZE = 3
+MINHASH_SEED = 1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(MINHASH_SEED)
+PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+WORD_RE = re.compile(r'\w+')
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def shingles(text: str) -> set:
+    """Shingles de SHINGLE_SIZE palabras sobre el texto en minúsculas y sin tildes."""
+    words = WORD_RE.findall(fold_accents((text or '').lower()))
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    """Firma MinHash del texto (None si no tiene palabras)."""
+    hashes = [_hash64(shingle.encode('utf-8')) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in PERMUTATIONS
+    ]
+
+
+def lsh_buckets(signature: List[int]) -> List[int]:
+    """Un bucket por banda (hash de 64 bits con signo, incluye el número de banda)."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        value = _hash64(f'{band}:{rows}'.encode('ascii'))
+        buckets.append(value - (1 << 64) if value >= (1 << 63) else value)
+    return buckets
+
+
+def estimated_jaccard(a: List[int], b: List[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def duplicate_threshold() -> float:
+    return getattr(settings, 'DUPLICATE_STANDUP_THRESHOLD', 0.8)
+
+
+def aggregation_weight():
+    """Peso de cada standup en las agregaciones: DUPLICATE_STANDUP_WEIGHT si es duplicado, 1 si no."""
+    return Case(
+        When(duplicate_of__isnull=False, then=Value(getattr(settings, 'DUPLICATE_STANDUP_WEIGHT', 0.25))),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+
+
+def weighted_avg_sentiment():
+    """Promedio de sentiment_score ponderado por aggregation_weight (None sin scores)."""
+    weight = aggregation_weight()
+    return Sum(F('sentiment_score') * weight, output_field=FloatField()) / Sum(
+        weight, filter=Q(sentiment_score__isnull=False), output_field=FloatField()
+    )
+
+
+def fingerprint_standups(standups: List[StandupLog]) -> Dict[int, Optional[Tuple[int, float]]]:
+    """
+    Calcula firmas y buckets de un lote, los guarda reemplazando los previos y
+    marca los duplicados contra standups anteriores (menor id) del mismo recurso
+    o proyecto, incluidos los del propio lote. Cantidad de queries constante por lote.
+
+    Returns:
+        {standup_id: (id del original, similitud) o None}
+    """
+    signatures = {standup.pk: minhash(standup.get_combined_text()) for standup in standups}
+    buckets = {pk: lsh_buckets(sig) for pk, sig in signatures.items() if sig}
+    ids = list(signatures)
+
+    with transaction.atomic():
+        StandupMinHash.objects.filter(standup_id__in=ids).delete()
+        StandupLSHBucket.objects.filter(standup_id__in=ids).delete()
+        StandupMinHash.objects.bulk_create([
+            StandupMinHash(standup_id=pk, signature=sig) for pk, sig in signatures.items() if sig
+        ])
+        StandupLSHBucket.objects.bulk_create([
+            StandupLSHBucket(
+                standup_id=standup.pk,
+                project_id=standup.project_id,
+                resource_id=standup.resource_id,
+                bucket=bucket,
+            )
+            for standup in standups
+            for bucket in buckets.get(standup.pk, [])
+        ])
+
+        originals = _find_originals(standups, signatures, buckets)
+        changed = []
+        for standup in standups:
+            original_id, similarity = originals[standup.pk] or (None, None)
+            if (standup.duplicate_of_id, standup.duplicate_similarity) != (original_id, similarity):
+                standup.duplicate_of_id = original_id
+                standup.duplicate_similarity = similarity
+                changed.append(standup)
+        StandupLog.objects.bulk_update(changed, ['duplicate_of', 'duplicate_similarity'])
+
+    return originals
+
+
+def _find_originals(
+    standups: List[StandupLog],
+    signatures: Dict[int, Optional[List[int]]],
+    buckets: Dict[int, List[int]],
+) -> Dict[int, Optional[Tuple[int, float]]]:
+    """Original más parecido (el más antiguo ante empates) de cada standup del lote."""
+    originals = {standup.pk: None for standup in standups}
+    if not buckets:
+        return originals
+
+    rows = StandupLSHBucket.objects.filter(
+        Q(project_id__in={s.project_id for s in standups}) | Q(resource_id__in={s.resource_id for s in standups}),
+        bucket__in={bucket for values in buckets.values() for bucket in values},
+        standup_id__lt=max(buckets),
+    ).values_list('standup_id', 'project_id', 'resource_id', 'bucket')
+
+    by_bucket = defaultdict(list)
+    for standup_id, project_id, resource_id, bucket in rows:
+        by_bucket[bucket].append((standup_id, project_id, resource_id))
+
+    candidates = defaultdict(set)
+    for standup in standups:
+        for bucket in buckets.get(standup.pk, []):
+            for other_id, project_id, resource_id in by_bucket[bucket]:
+                if other_id < standup.pk and (
+                    project_id == standup.project_id or resource_id == standup.resource_id
+                ):
+                    candidates[standup.pk].add(other_id)
+
+    stored = {pk: sig for pk, sig in signatures.items() if sig}
+    stored.update(
+        StandupMinHash.objects.filter(
+            standup_id__in={pk for ids in candidates.values() for pk in ids} - set(stored)
+        ).values_list('standup_id', 'signature')
+    )
+
+    threshold = duplicate_threshold()
+    for standup_id, other_ids in candidates.items():
+        scored = [
+            (estimated_jaccard(signatures[standup_id], stored[other_id]), other_id)
+            for other_id in other_ids if other_id in stored
+        ]
+        scored = [item for item in scored if item[0] >= threshold]
+        if scored:
+            similarity, other_id = min(scored, key=lambda item: (-item[0], item[1]))
+            originals[standup_id] = (other_id, similarity)
+    return originals
@@ -0,0 +1,197 @@
+"""
+Embeddings de bloqueadores para detectar problemas similares entre equipos.
+
+Los textos de bloqueadores se vectorizan en lotes con el mismo SentenceTransformer
+y cliente Qdrant de `VectorService` (apps.resources.services), en una colección
+propia. Cada punto usa el id del standup, por lo que re-sincronizar un standup
+reemplaza su vector; el procesamiento incremental (services.process_pending_standups)
+solo vectoriza los standups recién analizados.
+"""
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+from apps.resources.qdrant import ensure_collection, search_params
+from apps.resources.services import vector_service
+
+logger = logging.getLogger(__name__)
+
+# Largo máximo del texto guardado en el payload (solo para mostrar)
+PAYLOAD_TEXT_LIMIT = 500
+
+# Campos del payload filtrables con índice en Qdrant -> tipo de índice
+PAYLOAD_INDEXES = {
+    'project_id': 'integer',
+    'date_ordinal': 'integer',
+    'severity': 'keyword',
+}
+
+
+class BlockerVectorService:
+    """
+    Colección Qdrant de bloqueadores de standups.
+    Reutiliza el modelo y el cliente ya cargados por `vector_service`.
+    """
+
+    def __init__(self, vectors=vector_service):
+        self.vectors = vectors
+        self.collection_name = "standup_blockers"
+        self._collection_ready = False
+        # Tras un fallo al preparar la colección no se reintenta hasta este instante
+        self._ensure_after = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'ENABLE_BLOCKER_EMBEDDINGS', True)
+
+    @property
+    def client(self):
+        """Cliente Qdrant compartido; crea la colección de bloqueadores la primera vez."""
+        client = self.vectors.client
+        if client is not None and not self._collection_ready and time.monotonic() >= self._ensure_after:
+            self._collection_ready = self._ensure_collection_exists(client)
+            if not self._collection_ready:
+                self._ensure_after = time.monotonic() + getattr(settings, 'QDRANT_CONNECT_COOLDOWN', 30)
+        return client
+
+    def _ensure_collection_exists(self, client) -> bool:
+        return ensure_collection(client, self.collection_name, self.vectors.vector_size, PAYLOAD_INDEXES)
+
+    def _payload(self, standup) -> Dict[str, Any]:
+        return {
+            "standup_id": standup.id,
+            "project_id": standup.project_id,
+            "resource_id": standup.resource_id,
+            "date": standup.date.isoformat(),
+            "date_ordinal": standup.date.toordinal(),
+            "severity": standup.blocker_severity,
+            "text": standup.blockers[:PAYLOAD_TEXT_LIMIT],
+        }
+
+    def sync_standups(self, standups: Iterable, batch_size: int = 64) -> int:
+        """
+        Sincroniza un lote de standups: vectoriza los bloqueadores en una sola
+        llamada a `encode` y elimina los puntos de standups que ya no tienen bloqueadores.
+
+        Returns:
+            Cantidad de bloqueadores vectorizados
+        """
+        if not self.enabled:
+            return 0
+
+        standups = list(standups)
+        with_blockers = [s for s in standups if s.has_blockers and s.blockers.strip()]
+        embedded_ids = {s.id for s in with_blockers}
+        without_blockers = [s.id for s in standups if s.id not in embedded_ids]
+        if not standups or not self.client or (with_blockers and not self.vectors.model):
+            return 0
+
+        try:
+            from qdrant_client.models import PointIdsList, PointStruct
+
+            if with_blockers:
+                embeddings = self.vectors.model.encode(
+                    [standup.blockers for standup in with_blockers],
+                    batch_size=batch_size,
+                )
+                self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=[
+                        PointStruct(id=standup.id, vector=embedding.tolist(), payload=self._payload(standup))
+                        for standup, embedding in zip(with_blockers, embeddings)
+                    ],
+                )
+            if without_blockers:
+                self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=PointIdsList(points=without_blockers),
+                )
+            return len(with_blockers)
+        except Exception as e:
+            logger.error(f"❌ Error sincronizando bloqueadores en Qdrant: {e}")
+            return 0
+
+    def delete_standup(self, standup_id: int) -> bool:
+        """Elimina el vector de un standup."""
+        if not self.enabled or not self.client:
+            return False
+        try:
+            from qdrant_client.models import PointIdsList
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=[standup_id]),
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error eliminando bloqueador {standup_id} de Qdrant: {e}")
+            return False
+
+    def similar_blockers(
+        self,
+        text: str,
+        limit: int = 5,
+        exclude_project_id: Optional[int] = None,
+        project_ids: Optional[List[int]] = None,
+        since: Optional[date] = None,
+        severities: Optional[List[str]] = None,
+        exclude_standup_id: Optional[int] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Top-k bloqueadores más parecidos a un texto.
+
+        Args:
+            text: Texto del bloqueador reportado
+            limit: Cantidad máxima de resultados
+            exclude_project_id: Omitir el proyecto propio (ver solo otros equipos)
+            project_ids: Limitar a estos proyectos
+            since: Solo standups desde esta fecha
+            severities: Solo estas severidades
+            exclude_standup_id: Omitir el propio standup
+            score_threshold: Similitud mínima (COSINE, 0-1)
+
+        Returns:
+            Lista de payloads con `similarity_score`, ordenada por similitud
+        """
+        if not self.enabled or not text or not text.strip() or not self.client:
+            return []
+
+        # Embedding de la query con el cache LRU compartido (VectorService.embed_query)
+        query_embedding = self.vectors.embed_query(text)
+        if not query_embedding:
+            return []
+
+        try:
+            from qdrant_client.models import FieldCondition, Filter, HasIdCondition, MatchAny, MatchValue, Range
+
+            must, must_not = [], []
+            if project_ids:
+                must.append(FieldCondition(key='project_id', match=MatchAny(any=list(project_ids))))
+            if since:
+                must.append(FieldCondition(key='date_ordinal', range=Range(gte=since.toordinal())))
+            if severities:
+                must.append(FieldCondition(key='severity', match=MatchAny(any=list(severities))))
+            if exclude_project_id:
+                must_not.append(FieldCondition(key='project_id', match=MatchValue(value=exclude_project_id)))
+            if exclude_standup_id:
+                must_not.append(HasIdCondition(has_id=[exclude_standup_id]))
+
+            results = self.client.query_points(
+                collection_name=self.collection_name,
+                query=query_embedding,
+                query_filter=Filter(must=must, must_not=must_not) if must or must_not else None,
+                limit=limit,
+                score_threshold=score_threshold,
+                search_params=search_params(),
+            ).points
+            return [{**result.payload, "similarity_score": result.score} for result in results]
+        except Exception as e:
+            logger.error(f"❌ Error buscando bloqueadores similares: {e}")
+            return []
+
+
+# Instancia singleton del servicio
+blocker_vectors = BlockerVectorService()
@@ -0,0 +1,120 @@
+"""
+Índice de keywords de standups por (keyword, proyecto, día) y tendencias.
+
+KeywordOccurrence se recalcula en bloque para los (proyecto, día) tocados por
+cada lote del análisis NLP, de modo que es idempotente ante re-análisis. Las
+tendencias comparan una ventana con la ventana anterior de igual largo en una
+sola consulta agrupada sobre el índice (project, date, keyword).
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from apps.projects.models import Project
+
+from .models import KeywordOccurrence, StandupLog
+
+KEYWORD_MAX_LENGTH = KeywordOccurrence._meta.get_field('keyword').max_length
+DEFAULT_TRENDS_LIMIT = 10
+
+
+def refresh_keyword_occurrences(pairs: Iterable[Tuple[int, date]], batch_size: int = 1000) -> int:
+    """
+    Recalcula las ocurrencias de keywords de los (proyecto, día) indicados.
+
+    Los proyectos se bloquean (select_for_update, en orden de id) para que dos
+    workers no recalculen el mismo día con lecturas cruzadas.
+
+    Returns:
+        Filas de KeywordOccurrence escritas
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return 0
+
+    project_ids = sorted({project_id for project_id, _ in pairs})
+    days = {day for _, day in pairs}
+
+    with transaction.atomic():
+        list(Project.objects.select_for_update().filter(id__in=project_ids).order_by('id').values_list('id'))
+
+        counts: Dict[Tuple[int, date], Counter] = defaultdict(Counter)
+        for project_id, day, keywords in StandupLog.objects.order_by().filter(
+            nlp_processed=True, project_id__in=project_ids, date__in=days,
+        ).values_list('project_id', 'date', 'keywords').iterator(chunk_size=batch_size):
+            if (project_id, day) in pairs:
+                counts[(project_id, day)].update(
+                    {keyword[:KEYWORD_MAX_LENGTH] for keyword in keywords or [] if keyword}
+                )
+
+        stale = Q()
+        for project_id, day in pairs:
+            stale |= Q(project_id=project_id, date=day)
+        KeywordOccurrence.objects.filter(stale).delete()
+
+        occurrences = [
+            KeywordOccurrence(project_id=project_id, date=day, keyword=keyword, count=count)
+            for (project_id, day), counter in counts.items()
+            for keyword, count in counter.items()
+        ]
+        KeywordOccurrence.objects.bulk_create(occurrences, batch_size=batch_size)
+
+    return len(occurrences)
+
+
+def keyword_trends(
+    start_date: date,
+    end_date: date,
+    project_id: Optional[int] = None,
+    limit: int = DEFAULT_TRENDS_LIMIT,
+) -> Dict[str, List[Dict]]:
+    """
+    Keywords en alza y en baja de una ventana respecto a la ventana anterior de igual largo.
+
+    Args:
+        start_date: Inicio de la ventana actual
+        end_date: Fin de la ventana actual (inclusive)
+        project_id: Limitar a un proyecto (por defecto todos)
+        limit: Keywords por lista
+
+    Returns:
+        {'rising': [...], 'falling': [...], 'top': [...]} con keyword, current,
+        previous y delta; más los límites de ambas ventanas
+    """
+    previous_start = start_date - (end_date - start_date) - timedelta(days=1)
+
+    occurrences = KeywordOccurrence.objects.order_by().filter(
+        date__gte=previous_start, date__lte=end_date,
+    )
+    if project_id is not None:
+        occurrences = occurrences.filter(project_id=project_id)
+
+    rows = [
+        {
+            'keyword': row['keyword'],
+            'current': row['current'] or 0,
+            'previous': row['previous'] or 0,
+            'delta': (row['current'] or 0) - (row['previous'] or 0),
+        }
+        for row in occurrences.values('keyword').annotate(
+            current=Sum('count', filter=Q(date__gte=start_date)),
+            previous=Sum('count', filter=Q(date__lt=start_date)),
+        )
+    ]
+
+    rising = sorted((r for r in rows if r['delta'] > 0), key=lambda r: (-r['delta'], r['keyword']))
+    falling = sorted((r for r in rows if r['delta'] < 0), key=lambda r: (r['delta'], r['keyword']))
+    top = sorted((r for r in rows if r['current'] > 0), key=lambda r: (-r['current'], r['keyword']))
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'previous_start_date': previous_start,
+        'previous_end_date': start_date - timedelta(days=1),
+        'rising': rising[:limit],
+        'falling': falling[:limit],
+        'top': top[:limit],
+    }
@@ -0,0 +1 @@
+# Este archivo hace que Python trate este directorio como un paquete
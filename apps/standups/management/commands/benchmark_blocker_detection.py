@@ -0,0 +1,91 @@
+"""
+Benchmark de throughput del detector de bloqueadores (RF-10) en CPU.
+
+Uso típico:
+    python manage.py benchmark_blocker_detection --count 5000
+    python manage.py benchmark_blocker_detection --source db --batch-size 512 --n-process 2
+"""
+import random
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.standups.blockers import (
+    DEFAULT_BLOCKER_CATEGORIES,
+    DEFAULT_BLOCKER_LEXICONS,
+    BlockerDetector,
+)
+from apps.standups.models import StandupLog
+
+FILLERS = [
+    'Hoy trabajé en la integración', 'desde ayer', 'con el equipo', 'en la rama principal',
+    'para el sprint actual', 'mientras reviso los tests', 'según lo conversado en la daily',
+]
+NEGATED_TEMPLATES = ['Ya no estoy {}', 'Sin {} por ahora', 'El {} quedó resuelto']
+
+
+class Command(BaseCommand):
+    help = 'Mide standups/minuto del detector de bloqueadores con nlp.pipe'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=5000, help='Cantidad de textos a clasificar')
+        parser.add_argument('--batch-size', type=int, default=256, help='Tamaño de lote de nlp.pipe')
+        parser.add_argument('--n-process', type=int, default=1, help='Procesos de nlp.pipe')
+        parser.add_argument(
+            '--source',
+            choices=['synthetic', 'db'],
+            default='synthetic',
+            help='Textos sintéticos o el campo blockers de StandupLog',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        texts = self._texts(options)
+        if not texts:
+            raise CommandError('No hay textos para clasificar')
+
+        detector = BlockerDetector()
+        self.stdout.write(f'Pipeline: {detector.nlp.meta.get("name", "blank")} {detector.nlp.pipe_names}')
+
+        # Calentamiento: construcción de matchers y carga del modelo fuera de la medición
+        detector.detect_many(texts[:50], batch_size=options['batch_size'])
+
+        start = time.perf_counter()
+        results = detector.detect_many(
+            texts,
+            batch_size=options['batch_size'],
+            n_process=options['n_process'],
+        )
+        elapsed = time.perf_counter() - start
+
+        severities = Counter(result.severity or 'none' for result in results)
+        self.stdout.write(f'Textos clasificados: {len(texts)} en {elapsed:.2f}s')
+        self.stdout.write(self.style.SUCCESS(f'✓ {len(texts) / elapsed * 60:,.0f} standups/minuto'))
+        for severity, count in severities.most_common():
+            self.stdout.write(f'  {severity:10s} {count}')
+
+    def _texts(self, options) -> list:
+        count = options['count']
+        if options['source'] == 'db':
+            return list(
+                StandupLog.objects.exclude(blockers='').values_list('blockers', flat=True)[:count]
+            )
+
+        rng = random.Random(options['seed'])
+        phrases = [phrase for values in DEFAULT_BLOCKER_LEXICONS.values() for phrase in values]
+        entities = [value for values in DEFAULT_BLOCKER_CATEGORIES.values() for value in values]
+
+        texts = []
+        for _ in range(count):
+            roll = rng.random()
+            if roll < 0.2:
+                texts.append('Ninguno')
+            elif roll < 0.35:
+                texts.append(rng.choice(NEGATED_TEMPLATES).format(rng.choice(phrases)))
+            else:
+                texts.append(
+                    f'{rng.choice(FILLERS)}, {rng.choice(phrases)} con {rng.choice(entities)} '
+                    f'{rng.choice(FILLERS)}.'
+                )
+        return texts
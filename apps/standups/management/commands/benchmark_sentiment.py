@@ -0,0 +1,112 @@
+"""
+Benchmark de latencia por documento del scoring de sentimiento: backend léxico
+(solo tokenizador) contra el pipeline completo de spaCy.
+
+Uso típico:
+    python manage.py benchmark_sentiment --count 2000
+    python manage.py benchmark_sentiment --source db --normalize
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.standups.models import StandupLog
+from apps.standups.nlp_utils import (
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    LexiconSentimentScorer,
+    analyzer,
+)
+
+FILLERS = [
+    'hoy trabajé en la integración', 'desde ayer', 'con el equipo', 'en la rama principal',
+    'para el sprint actual', 'mientras reviso los tests', 'según lo conversado en la daily',
+]
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = 'Compara la latencia por documento del scorer léxico y el pipeline spaCy'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=2000, help='Cantidad de documentos')
+        parser.add_argument(
+            '--source',
+            choices=['synthetic', 'db'],
+            default='synthetic',
+            help='Textos sintéticos o el texto combinado de StandupLog',
+        )
+        parser.add_argument(
+            '--normalize',
+            action='store_true',
+            help='Usar plegado de tildes y lematización (los scores pueden diferir)',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        texts = self._texts(options)
+        if not texts:
+            raise CommandError('No hay textos para analizar')
+
+        scorer = LexiconSentimentScorer(normalize=options['normalize'])
+        lexicon_ms, lexicon_results = self._measure(scorer.score, texts)
+        self._report('Léxico (tokenizador)', lexicon_ms)
+
+        if analyzer.nlp is None:
+            self.stdout.write(self.style.WARNING('⚠️ Modelo spaCy no disponible: se omite la comparación'))
+            return
+
+        self.stdout.write(f'Pipeline spaCy: {analyzer.model_version} {analyzer.nlp.pipe_names}')
+        spacy_ms, spacy_results = self._measure(analyzer.analyze_sentiment_spacy, texts)
+        self._report('spaCy (pipeline completo)', spacy_ms)
+
+        mismatches = sum(1 for a, b in zip(lexicon_results, spacy_results) if a != b)
+        speedup = statistics.median(spacy_ms) / max(statistics.median(lexicon_ms), 1e-9)
+        self.stdout.write(f'Aceleración (p50): {speedup:.1f}x')
+        if mismatches:
+            self.stdout.write(self.style.WARNING(f'⚠️ {mismatches} documentos con score distinto'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ Scores idénticos en todos los documentos'))
+
+    def _measure(self, score, texts: list):
+        # Calentamiento: carga del tokenizador/modelo fuera de la medición
+        for text in texts[:20]:
+            score(text)
+
+        latencies, results = [], []
+        for text in texts:
+            start = time.perf_counter()
+            results.append(score(text))
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies, results
+
+    def _report(self, name: str, latencies: list):
+        self.stdout.write(
+            f'{name:28s} p50={percentile(latencies, 50):.3f}ms '
+            f'p99={percentile(latencies, 99):.3f}ms '
+            f'total={sum(latencies) / 1000:.2f}s'
+        )
+
+    def _texts(self, options) -> list:
+        count = options['count']
+        if options['source'] == 'db':
+            return [
+                standup.get_combined_text()
+                for standup in StandupLog.objects.order_by('-id')[:count]
+            ]
+
+        rng = random.Random(options['seed'])
+        words = sorted(POSITIVE_WORDS | NEGATIVE_WORDS)
+        return [
+            ' '.join(
+                f'{rng.choice(FILLERS)} {rng.choice(words)}.'
+                for _ in range(rng.randint(2, 8))
+            ).capitalize()
+            for _ in range(count)
+        ]
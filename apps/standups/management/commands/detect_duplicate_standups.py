@@ -0,0 +1,46 @@
+"""
+Comando para construir el índice MinHash/LSH de casi duplicados sobre el historial.
+
+Recorre StandupLog por id en lotes (memoria acotada por --chunk-size): cada lote
+se compara contra los lotes anteriores ya indexados y contra sí mismo, por lo que
+una sola pasada marca todos los duplicados. Los standups nuevos se indexan al
+guardarse (ver signals.update_duplicate_index).
+"""
+from django.core.management.base import BaseCommand
+
+from apps.standups.dedup import fingerprint_standups
+from apps.standups.models import StandupLog
+
+
+class Command(BaseCommand):
+    help = 'Indexa standups con MinHash/LSH y marca los casi duplicados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Standups por lote')
+        parser.add_argument('--start-id', type=int, default=0, help='Reanudar desde este id (exclusivo)')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = options['start_id']
+        fields = [
+            'id', 'project_id', 'resource_id', 'what_i_did', 'what_i_will_do', 'blockers',
+            'duplicate_of_id', 'duplicate_similarity',
+        ]
+        processed = duplicates = 0
+
+        while True:
+            chunk = list(
+                StandupLog.objects.filter(id__gt=last_id).order_by('id').only(*fields)[:chunk_size]
+            )
+            if not chunk:
+                break
+
+            originals = fingerprint_standups(chunk)
+            processed += len(chunk)
+            duplicates += sum(1 for original in originals.values() if original)
+            last_id = chunk[-1].id
+            self.stdout.write(f'  ... {processed} standups indexados (id <= {last_id}), {duplicates} duplicados')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Índice de duplicados construido: {processed} standups, {duplicates} casi duplicados'
+        ))
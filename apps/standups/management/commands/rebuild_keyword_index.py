@@ -0,0 +1,43 @@
+"""
+Comando para reconstruir el índice KeywordOccurrence desde StandupLog.keywords.
+Solo hace falta para el historial previo: el análisis NLP lo mantiene al día.
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.standups.keywords import refresh_keyword_occurrences
+from apps.standups.models import StandupLog
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de keywords por proyecto y día'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', help='Desde esta fecha (YYYY-MM-DD)')
+        parser.add_argument('--end-date', help='Hasta esta fecha inclusive (YYYY-MM-DD)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='(proyecto, día) por transacción')
+
+    def handle(self, *args, **options):
+        standups = StandupLog.objects.order_by().filter(nlp_processed=True)
+        try:
+            if options['start_date']:
+                standups = standups.filter(date__gte=datetime.strptime(options['start_date'], '%Y-%m-%d').date())
+            if options['end_date']:
+                standups = standups.filter(date__lte=datetime.strptime(options['end_date'], '%Y-%m-%d').date())
+        except ValueError:
+            raise CommandError('Las fechas deben tener formato YYYY-MM-DD')
+
+        chunk, pairs, written = [], 0, 0
+        for pair in standups.values_list('project_id', 'date').distinct().order_by('date', 'project_id').iterator():
+            chunk.append(pair)
+            if len(chunk) >= options['chunk_size']:
+                written += refresh_keyword_occurrences(chunk)
+                pairs += len(chunk)
+                chunk = []
+                self.stdout.write(f'  ... {pairs} proyecto-días procesados')
+        if chunk:
+            written += refresh_keyword_occurrences(chunk)
+            pairs += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ {written} ocurrencias escritas para {pairs} proyecto-días'))
@@ -0,0 +1,47 @@
+"""
+Comando para vectorizar en Qdrant los bloqueadores ya existentes.
+Solo hace falta para el historial previo: los standups nuevos se vectorizan
+al analizarse (ver services.process_pending_standups).
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.standups.embeddings import blocker_vectors
+from apps.standups.models import StandupLog
+
+
+class Command(BaseCommand):
+    help = 'Vectoriza los bloqueadores de standups analizados en la colección de Qdrant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=256, help='Standups por lote de encode/upsert')
+        parser.add_argument('--since', help='Solo standups desde esta fecha (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        if not blocker_vectors.client or not blocker_vectors.vectors.model:
+            raise CommandError('Cliente Qdrant o modelo de embeddings no disponibles')
+
+        standups = StandupLog.objects.filter(nlp_processed=True, has_blockers=True).exclude(blockers='')
+        if options['since']:
+            try:
+                since = datetime.strptime(options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--since debe tener formato YYYY-MM-DD')
+            standups = standups.filter(date__gte=since)
+
+        batch_size = options['batch_size']
+        fields = ['id', 'project_id', 'resource_id', 'date', 'blockers', 'has_blockers', 'blocker_severity']
+        last_id = 0
+        embedded = 0
+
+        # Paginación por id: memoria constante sobre años de historial
+        while True:
+            batch = list(standups.filter(id__gt=last_id).order_by('id').only(*fields)[:batch_size])
+            if not batch:
+                break
+            embedded += blocker_vectors.sync_standups(batch, batch_size=batch_size)
+            last_id = batch[-1].id
+            self.stdout.write(f'  ... {embedded} bloqueadores vectorizados (id <= {last_id})')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ {embedded} bloqueadores sincronizados en Qdrant'))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("standups", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="standuplog",
+            index=models.Index(
+                condition=models.Q(("nlp_processed", False)),
+                fields=["id"],
+                name="standup_nlp_pending_idx",
+            ),
+        ),
+    ]
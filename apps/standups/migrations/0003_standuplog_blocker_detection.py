@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0005_project_actual_metrics"),
+        ("standups", "0002_standuplog_nlp_pending_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="standuplog",
+            name="blocked_projects",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="Proyectos mencionados en los bloqueadores",
+                related_name="blocking_standups",
+                to="projects.project",
+                verbose_name="Proyectos Mencionados",
+            ),
+        ),
+        migrations.AddField(
+            model_name="standuplog",
+            name="blocked_tasks",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="Tareas mencionadas en los bloqueadores",
+                related_name="blocking_standups",
+                to="projects.task",
+                verbose_name="Tareas Bloqueadas",
+            ),
+        ),
+        migrations.AddField(
+            model_name="standuplog",
+            name="blocker_entities",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Tecnologías, dependencias externas, recursos y frases detectadas",
+                verbose_name="Entidades del Bloqueador",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Pesos: bloqueadores (A) > qué hice / qué haré (B) > notas (D)
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('pg_catalog.spanish', coalesce({row}blockers, '')), 'A') ||
+    setweight(to_tsvector('pg_catalog.spanish', coalesce({row}what_i_did, '')), 'B') ||
+    setweight(to_tsvector('pg_catalog.spanish', coalesce({row}what_i_will_do, '')), 'B') ||
+    setweight(to_tsvector('pg_catalog.spanish', coalesce({row}notes, '')), 'D')
+"""
+
+CREATE_TRIGGER = f"""
+CREATE FUNCTION standups_standuplog_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+-- Solo se dispara cuando cambian los campos de texto: los bulk_update del
+-- análisis NLP no recalculan el vector
+CREATE TRIGGER standup_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF what_i_did, what_i_will_do, blockers, notes, search_vector
+    ON standups_standuplog
+    FOR EACH ROW EXECUTE FUNCTION standups_standuplog_search_vector_update();
+
+UPDATE standups_standuplog SET search_vector = {SEARCH_VECTOR_SQL.format(row='')};
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS standup_search_vector_trigger ON standups_standuplog;
+DROP FUNCTION IF EXISTS standups_standuplog_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("standups", "0003_standuplog_blocker_detection"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="standuplog",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="Vector de Búsqueda"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name="standuplog",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="standup_search_vector_idx"
+            ),
+        ),
+    ]
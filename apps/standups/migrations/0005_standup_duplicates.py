@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0005_project_actual_metrics"),
+        ("resources", "0004_alter_resource_internal_cost_and_more"),
+        ("standups", "0004_standuplog_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StandupMinHash",
+            fields=[
+                (
+                    "standup",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="minhash",
+                        serialize=False,
+                        to="standups.standuplog",
+                        verbose_name="Standup",
+                    ),
+                ),
+                ("signature", models.JSONField(verbose_name="Firma MinHash")),
+            ],
+            options={
+                "verbose_name": "Firma MinHash de Standup",
+                "verbose_name_plural": "Firmas MinHash de Standups",
+            },
+        ),
+        migrations.AddField(
+            model_name="standuplog",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Standup anterior del mismo recurso o proyecto con texto casi idéntico",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="standups.standuplog",
+                verbose_name="Duplicado de",
+            ),
+        ),
+        migrations.AddField(
+            model_name="standuplog",
+            name="duplicate_similarity",
+            field=models.FloatField(
+                blank=True,
+                help_text="Jaccard estimado por MinHash (0-1)",
+                null=True,
+                verbose_name="Similitud con el Original",
+            ),
+        ),
+        migrations.CreateModel(
+            name="StandupLSHBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("bucket", models.BigIntegerField(verbose_name="Bucket")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="projects.project",
+                        verbose_name="Proyecto",
+                    ),
+                ),
+                (
+                    "resource",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="resources.resource",
+                        verbose_name="Recurso",
+                    ),
+                ),
+                (
+                    "standup",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lsh_buckets",
+                        to="standups.standuplog",
+                        verbose_name="Standup",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Bucket LSH de Standup",
+                "verbose_name_plural": "Buckets LSH de Standups",
+                "indexes": [
+                    models.Index(
+                        fields=["project", "bucket"], name="standups_st_project_a5d64d_idx"
+                    ),
+                    models.Index(
+                        fields=["resource", "bucket"], name="standups_st_resourc_6c8b67_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
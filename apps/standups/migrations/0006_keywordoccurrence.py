@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0005_project_actual_metrics"),
+        ("standups", "0005_standup_duplicates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KeywordOccurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("keyword", models.CharField(max_length=100, verbose_name="Keyword")),
+                ("date", models.DateField(verbose_name="Fecha")),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Ocurrencias")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="keyword_occurrences",
+                        to="projects.project",
+                        verbose_name="Proyecto",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ocurrencia de Keyword",
+                "verbose_name_plural": "Ocurrencias de Keywords",
+                "indexes": [
+                    models.Index(fields=["keyword", "date"], name="standups_ke_keyword_f9fab9_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "date", "keyword"),
+                        name="unique_keyword_per_project_date",
+                    )
+                ],
+            },
+        ),
+    ]
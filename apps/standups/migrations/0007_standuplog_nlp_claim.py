@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("standups", "0006_keywordoccurrence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="standuplog",
+            name="nlp_attempts",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text="Tras STANDUP_NLP_MAX_ATTEMPTS intentos el standup sale de la cola",
+                verbose_name="Intentos de Análisis NLP",
+            ),
+        ),
+        migrations.AddField(
+            model_name="standuplog",
+            name="nlp_claimed_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Reclamado para NLP"
+            ),
+        ),
+    ]
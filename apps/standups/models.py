@@ -1,6 +1,8 @@
 """
 Modelos para Daily Standups con análisis de sentimiento NLP.
 """
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from apps.core.models import AuditableModel
@@ -116,6 +118,30 @@ class StandupLog(AuditableModel):
         verbose_name="Severidad del Bloqueador"
     )
     
+    # Resultado del detector de bloqueadores (RF-10, ver blockers.py)
+    blocker_entities = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Entidades del Bloqueador",
+        help_text="Tecnologías, dependencias externas, recursos y frases detectadas"
+    )
+    
+    blocked_tasks = models.ManyToManyField(
+        'projects.Task',
+        blank=True,
+        related_name='blocking_standups',
+        verbose_name="Tareas Bloqueadas",
+        help_text="Tareas mencionadas en los bloqueadores"
+    )
+    
+    blocked_projects = models.ManyToManyField(
+        'projects.Project',
+        blank=True,
+        related_name='blocking_standups',
+        verbose_name="Proyectos Mencionados",
+        help_text="Proyectos mencionados en los bloqueadores"
+    )
+    
     requires_attention = models.BooleanField(
         default=False,
         verbose_name="Requiere Atención",
@@ -132,10 +158,51 @@ class StandupLog(AuditableModel):
         blank=True,
         verbose_name="Fecha de Procesamiento NLP"
     )
+    # Cola NLP (ver services.process_pending_standups): reclamo vigente e intentos fallidos
+    nlp_claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Reclamado para NLP"
+    )
+    nlp_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Intentos de Análisis NLP",
+        help_text="Tras STANDUP_NLP_MAX_ATTEMPTS intentos el standup sale de la cola"
+    )
     
     # Notas adicionales
     notes = models.TextField(blank=True, verbose_name="Notas Adicionales")
 
+    # Casi duplicados (copy-paste), detectados con MinHash/LSH (ver dedup.py)
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='duplicates',
+        verbose_name="Duplicado de",
+        help_text="Standup anterior del mismo recurso o proyecto con texto casi idéntico"
+    )
+    duplicate_similarity = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Similitud con el Original",
+        help_text="Jaccard estimado por MinHash (0-1)"
+    )
+
+    # Búsqueda full-text (configuración 'spanish'), mantenida por un trigger de
+    # PostgreSQL sobre los campos de texto (migración 0004)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Vector de Búsqueda"
+    )
+
+    # Campos que forman get_combined_text (su edición re-encola el análisis NLP)
+    TEXT_FIELDS = ('what_i_did', 'what_i_will_do', 'blockers')
+
     class Meta:
         verbose_name = "Standup Log"
         verbose_name_plural = "Standup Logs"
@@ -145,6 +212,13 @@ class StandupLog(AuditableModel):
             models.Index(fields=['project', 'date']),
             models.Index(fields=['sentiment_label', 'requires_attention']),
             models.Index(fields=['has_blockers']),
+            # Cola de análisis NLP pendiente (ver services.process_pending_standups)
+            models.Index(
+                fields=['id'],
+                condition=models.Q(nlp_processed=False),
+                name='standup_nlp_pending_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='standup_search_vector_idx'),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -185,9 +259,34 @@ class StandupLog(AuditableModel):
             return True
         return False
 
+    def _text_fields(self) -> tuple:
+        return tuple(self.__dict__.get(field) for field in self.TEXT_FIELDS)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Texto cargado, para detectar ediciones en save()
+        instance._loaded_text = instance._text_fields()
+        return instance
+
     def save(self, *args, **kwargs):
         """Auto-calcula flags antes de guardar."""
-        self.has_blockers = bool(self.blockers.strip())
+        # Editar el texto devuelve el standup a la cola NLP con intentos nuevos; un
+        # análisis en curso del texto anterior pierde el reclamo y no se guarda
+        loaded = getattr(self, '_loaded_text', None)
+        if loaded is not None and None not in loaded and self._text_fields() != loaded:
+            self.nlp_processed = False
+            self.nlp_claimed_at = None
+            self.nlp_attempts = 0
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {
+                    'nlp_processed', 'nlp_claimed_at', 'nlp_attempts', 'has_blockers', 'requires_attention',
+                }
+
+        # Heurística inicial hasta que el detector de bloqueadores procese el standup
+        if not self.nlp_processed:
+            self.has_blockers = bool(self.blockers.strip())
         
         if self.sentiment_score is not None and not self.sentiment_label:
             self.sentiment_label = self.determine_sentiment_label()
@@ -195,6 +294,65 @@ class StandupLog(AuditableModel):
         self.requires_attention = self.check_attention_needed()
         
         super().save(*args, **kwargs)
+        self._loaded_text = self._text_fields()
+
+
+class StandupMinHash(models.Model):
+    """Firma MinHash del texto de un standup (ver dedup.py)."""
+
+    standup = models.OneToOneField(
+        StandupLog,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='minhash',
+        verbose_name="Standup"
+    )
+    signature = models.JSONField(verbose_name="Firma MinHash")
+
+    class Meta:
+        verbose_name = "Firma MinHash de Standup"
+        verbose_name_plural = "Firmas MinHash de Standups"
+
+    def __str__(self):
+        return f"MinHash standup {self.standup_id}"
+
+
+class StandupLSHBucket(models.Model):
+    """
+    Bucket LSH (una banda de la firma MinHash) de un standup.
+    Se indexa por proyecto y por recurso: los duplicados solo se buscan dentro de cada uno.
+    """
+
+    standup = models.ForeignKey(
+        StandupLog,
+        on_delete=models.CASCADE,
+        related_name='lsh_buckets',
+        verbose_name="Standup"
+    )
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Proyecto"
+    )
+    resource = models.ForeignKey(
+        'resources.Resource',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Recurso"
+    )
+    bucket = models.BigIntegerField(verbose_name="Bucket")
+
+    class Meta:
+        verbose_name = "Bucket LSH de Standup"
+        verbose_name_plural = "Buckets LSH de Standups"
+        indexes = [
+            models.Index(fields=['project', 'bucket']),
+            models.Index(fields=['resource', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f"Standup {self.standup_id} - {self.bucket}"
 
 
 class TeamMood(AuditableModel):
@@ -272,3 +430,37 @@ class TeamMood(AuditableModel):
 
     def __str__(self):
         return f"{self.project.code} - {self.date} - Sentiment: {self.average_sentiment:.2f}"
+
+
+class KeywordOccurrence(models.Model):
+    """
+    Ocurrencias de una keyword por proyecto y día (standups que la mencionan).
+    Índice normalizado de StandupLog.keywords para consultar tendencias por rango
+    de fechas sin recorrer los JSON (ver keywords.py).
+    """
+
+    keyword = models.CharField(max_length=100, verbose_name="Keyword")
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='keyword_occurrences',
+        verbose_name="Proyecto"
+    )
+    date = models.DateField(verbose_name="Fecha")
+    count = models.PositiveIntegerField(default=0, verbose_name="Ocurrencias")
+
+    class Meta:
+        verbose_name = "Ocurrencia de Keyword"
+        verbose_name_plural = "Ocurrencias de Keywords"
+        indexes = [
+            models.Index(fields=['keyword', 'date']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'date', 'keyword'],
+                name='unique_keyword_per_project_date'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.keyword} - {self.project_id} - {self.date}: {self.count}"
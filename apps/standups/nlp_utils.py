@@ -1,9 +1,148 @@
 """
 Utilidades NLP para análisis de sentimiento en standups.
 """
+import hashlib
+import logging
+import unicodedata
+
 import spacy
 from typing import Dict, List, Tuple
 from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+NLP_CACHE_PREFIX = 'nlp:analysis'
+# Incrementar al cambiar léxicos o lógica de análisis: invalida los resultados cacheados
+ANALYZER_VERSION = 3
+# Las keywords solo usan POS y stop words: el parse en minúsculas omite estos componentes
+KEYWORD_DISABLED_PIPES = ('ner', 'parser')
+
+
+# Léxico de sentimiento (compartido por el backend spaCy y el backend léxico)
+POSITIVE_WORDS = frozenset({
+    'bien', 'bueno', 'excelente', 'genial', 'fantástico', 'logré',
+    'completé', 'terminé', 'éxito', 'avance', 'progreso', 'fácil'
+})
+NEGATIVE_WORDS = frozenset({
+    'mal', 'malo', 'difícil', 'problema', 'error', 'bloqueado',
+    'atascado', 'complicado', 'frustrado', 'imposible', 'lento', 'retraso'
+})
+
+# Lematización simple: forma flexionada -> entrada del léxico (solo con SENTIMENT_LEXICON_NORMALIZE)
+LEMMA_TABLE = {
+    'buena': 'bueno', 'buenos': 'bueno', 'buenas': 'bueno',
+    'excelentes': 'excelente', 'geniales': 'genial',
+    'fantástica': 'fantástico', 'fantásticos': 'fantástico', 'fantásticas': 'fantástico',
+    'logrado': 'logré', 'logramos': 'logré', 'completado': 'completé', 'completada': 'completé',
+    'completamos': 'completé', 'terminado': 'terminé', 'terminada': 'terminé', 'terminamos': 'terminé',
+    'éxitos': 'éxito', 'avances': 'avance', 'progresos': 'progreso', 'fáciles': 'fácil',
+    'mala': 'malo', 'malos': 'malo', 'malas': 'malo', 'difíciles': 'difícil',
+    'problemas': 'problema', 'errores': 'error',
+    'bloqueada': 'bloqueado', 'bloqueados': 'bloqueado', 'bloqueadas': 'bloqueado',
+    'atascada': 'atascado', 'atascados': 'atascado', 'atascadas': 'atascado',
+    'complicada': 'complicado', 'complicados': 'complicado', 'complicadas': 'complicado',
+    'frustrada': 'frustrado', 'frustrados': 'frustrado', 'frustradas': 'frustrado',
+    'imposibles': 'imposible', 'lenta': 'lento', 'lentos': 'lento', 'lentas': 'lento',
+    'retrasos': 'retraso',
+}
+
+
+def normalize_text(text: str) -> str:
+    """Normalización usada para la clave de cache (Unicode NFC y espacios colapsados)."""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+def fold_accents(word: str) -> str:
+    """Elimina diacríticos: 'difícil' -> 'dificil'."""
+    return ''.join(c for c in unicodedata.normalize('NFD', word) if unicodedata.category(c) != 'Mn')
+
+
+def score_sentiment(positive_count: int, negative_count: int, total_words: int) -> Dict:
+    """
+    Score, label y confianza a partir de los conteos del léxico.
+    Fórmula única para ambos backends, lo que garantiza scores idénticos.
+    """
+    if total_words == 0:
+        return {'score': 0.0, 'label': 'neutral', 'confidence': 0.5}
+
+    score = (positive_count - negative_count) / max(total_words, 1)
+    score = max(-1.0, min(1.0, score * 3))  # Normalizar entre -1 y 1
+
+    # Determinar label
+    if score >= 0.3:
+        label = 'positive'
+    elif score >= -0.1:
+        label = 'neutral'
+    elif score >= -0.5:
+        label = 'negative'
+    else:
+        label = 'very_negative'
+
+    # Calcular confianza basada en cantidad de palabras clave encontradas
+    confidence = min(1.0, (positive_count + negative_count) / max(total_words * 0.2, 1))
+
+    return {
+        'score': round(score, 3),
+        'label': label,
+        'confidence': round(confidence, 3)
+    }
+
+
+class LexiconSentimentScorer:
+    """
+    Scorer de sentimiento que solo usa el tokenizador de spaCy y sets precompilados.
+
+    Con normalize=False produce exactamente los mismos scores que el pipeline
+    completo (mismos tokens, mismas stop words); con normalize=True además
+    reconoce palabras sin tilde y formas flexionadas (LEMMA_TABLE).
+    """
+
+    def __init__(self, tokenizer=None, normalize: bool = False):
+        self._tokenizer = tokenizer
+        self.normalize = normalize
+        if normalize:
+            self.positive = frozenset(fold_accents(w) for w in POSITIVE_WORDS)
+            self.negative = frozenset(fold_accents(w) for w in NEGATIVE_WORDS)
+            self.lemmas = {fold_accents(k): fold_accents(v) for k, v in LEMMA_TABLE.items()}
+        else:
+            self.positive = POSITIVE_WORDS
+            self.negative = NEGATIVE_WORDS
+            self.lemmas = {}
+
+    @property
+    def tokenizer(self):
+        """Tokenizador del modelo cargado o, si no hay modelo, el de un pipeline en blanco."""
+        if self._tokenizer is None:
+            nlp = analyzer.nlp
+            if nlp is None:
+                # Se resuelve una sola vez por proceso: el aviso no se repite por texto
+                logger.warning(
+                    "⚠️ Modelo spaCy no disponible: sentimiento léxico con el tokenizador "
+                    "de un pipeline en blanco (sin entidades ni keywords)"
+                )
+                nlp = spacy.blank('es')
+            self._tokenizer = nlp.tokenizer
+        return self._tokenizer
+
+    def score(self, text: str) -> Dict:
+        if not text:
+            return {'score': 0.0, 'label': 'neutral', 'confidence': 0.0}
+
+        positive_count = negative_count = total_words = 0
+        for token in self.tokenizer(text.lower()):
+            word = token.text
+            if self.normalize:
+                word = fold_accents(word)
+                word = self.lemmas.get(word, word)
+            if word in self.positive:
+                positive_count += 1
+            elif word in self.negative:
+                negative_count += 1
+            if not token.is_stop and not token.is_punct:
+                total_words += 1
+
+        return score_sentiment(positive_count, negative_count, total_words)
 
 
 class SentimentAnalyzer:
@@ -14,6 +153,7 @@ class SentimentAnalyzer:
     
     def __init__(self):
         self.nlp = None
+        self._lexicon_scorer = None
         self._load_model()
     
     def _load_model(self):
@@ -25,6 +165,85 @@ class SentimentAnalyzer:
             print(f"Error loading spaCy model: {e}")
             self.nlp = None
     
+    @property
+    def model_version(self) -> str:
+        """Identificador del modelo cargado (nombre y versión) para invalidar la cache."""
+        if not self.nlp:
+            return 'none'
+        meta = self.nlp.meta
+        return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}"
+
+    def _cache_key(self, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+        backend = getattr(settings, 'SENTIMENT_BACKEND', 'lexicon')
+        if backend == 'lexicon' and getattr(settings, 'SENTIMENT_LEXICON_NORMALIZE', False):
+            backend += '+norm'
+        return f'{NLP_CACHE_PREFIX}:v{ANALYZER_VERSION}:{self.model_version}:{backend}:{digest}'
+
+    def analyze(self, text: str) -> Dict:
+        """
+        Sentimiento, entidades y keywords de un texto (con cache).
+
+        Returns:
+            {'sentiment': Dict, 'entities': List[Dict], 'keywords': List[str]}
+        """
+        return self.analyze_many([text])[0]
+
+    def analyze_many(self, texts: List[str]) -> List[Dict]:
+        """
+        Analiza varios textos consultando la cache en un solo round-trip.
+        Los resultados se cachean por hash del texto normalizado + versión del modelo,
+        de modo que textos repetidos o standups re-guardados no vuelven a pasar por spaCy
+        y un cambio de modelo invalida la cache sin borrarla. Los textos no cacheados
+        se procesan en lote con nlp.pipe: entidades sobre el texto original y keywords
+        sobre el texto en minúsculas (sin NER ni parser), como extract_*.
+        """
+        use_cache = self.nlp is not None and getattr(settings, 'NLP_CACHE_ENABLED', True)
+        keys = [self._cache_key(text) for text in texts] if use_cache else []
+        cached = {}
+        if use_cache:
+            try:
+                cached = cache.get_many(list(set(keys)))
+            except Exception as e:
+                # Cache caída: se analiza todo como fallo de cache
+                logger.warning(f"⚠️ No se pudo leer el análisis NLP de la cache: {e}")
+
+        results = [cached.get(key) for key in keys] if use_cache else [None] * len(texts)
+
+        # Textos sin resultado, agrupados por clave para analizar una sola vez los repetidos
+        pending = {}
+        for i, result in enumerate(results):
+            if result is None:
+                pending.setdefault(keys[i] if use_cache else i, []).append(i)
+
+        pending_texts = [texts[positions[0]] for positions in pending.values()]
+        if self.nlp:
+            docs = self.nlp.pipe(pending_texts)
+            keyword_docs = self.nlp.pipe(
+                (text.lower() for text in pending_texts), disable=KEYWORD_DISABLED_PIPES
+            )
+        else:
+            docs = keyword_docs = [None] * len(pending_texts)
+
+        to_store = {}
+        for (key, positions), text, doc, keyword_doc in zip(pending.items(), pending_texts, docs, keyword_docs):
+            result = {
+                'sentiment': self.analyze_sentiment(text),
+                'entities': self.entities_from_doc(doc) if doc is not None else [],
+                'keywords': self.keywords_from_doc(keyword_doc) if keyword_doc is not None else [],
+            }
+            if use_cache:
+                to_store[key] = result
+            for i in positions:
+                results[i] = result
+
+        if to_store:
+            try:
+                cache.set_many(to_store, timeout=getattr(settings, 'NLP_CACHE_TIMEOUT', 60 * 60 * 24 * 30))
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo guardar el análisis NLP en cache: {e}")
+        return results
+
     def analyze_sentiment(self, text: str) -> Dict:
         """
         Analiza el sentimiento de un texto.
@@ -36,52 +255,32 @@ class SentimentAnalyzer:
                 'confidence': float (0 a 1)
             }
         """
+        if getattr(settings, 'SENTIMENT_BACKEND', 'lexicon') == 'lexicon':
+            return self.lexicon_scorer.score(text)
+        return self.analyze_sentiment_spacy(text)
+
+    def analyze_sentiment_spacy(self, text: str) -> Dict:
+        """Scoring con el pipeline completo de spaCy (backend 'spacy')."""
         if not self.nlp or not text:
             return {'score': 0.0, 'label': 'neutral', 'confidence': 0.0}
-        
-        # Palabras positivas y negativas en español
-        positive_words = {
-            'bien', 'bueno', 'excelente', 'genial', 'fantástico', 'logré', 
-            'completé', 'terminé', 'éxito', 'avance', 'progreso', 'fácil'
-        }
-        negative_words = {
-            'mal', 'malo', 'difícil', 'problema', 'error', 'bloqueado', 
-            'atascado', 'complicado', 'frustrado', 'imposible', 'lento', 'retraso'
-        }
-        
+
         doc = self.nlp(text.lower())
-        
+
         # Contar palabras positivas y negativas
-        positive_count = sum(1 for token in doc if token.text in positive_words)
-        negative_count = sum(1 for token in doc if token.text in negative_words)
-        
-        # Calcular score simple
+        positive_count = sum(1 for token in doc if token.text in POSITIVE_WORDS)
+        negative_count = sum(1 for token in doc if token.text in NEGATIVE_WORDS)
+
         total_words = len([token for token in doc if not token.is_stop and not token.is_punct])
-        if total_words == 0:
-            return {'score': 0.0, 'label': 'neutral', 'confidence': 0.5}
-        
-        score = (positive_count - negative_count) / max(total_words, 1)
-        score = max(-1.0, min(1.0, score * 3))  # Normalizar entre -1 y 1
-        
-        # Determinar label
-        if score >= 0.3:
-            label = 'positive'
-        elif score >= -0.1:
-            label = 'neutral'
-        elif score >= -0.5:
-            label = 'negative'
-        else:
-            label = 'very_negative'
-        
-        # Calcular confianza basada en cantidad de palabras clave encontradas
-        confidence = min(1.0, (positive_count + negative_count) / max(total_words * 0.2, 1))
-        
-        return {
-            'score': round(score, 3),
-            'label': label,
-            'confidence': round(confidence, 3)
-        }
-    
+        return score_sentiment(positive_count, negative_count, total_words)
+
+    @property
+    def lexicon_scorer(self) -> 'LexiconSentimentScorer':
+        if self._lexicon_scorer is None:
+            self._lexicon_scorer = LexiconSentimentScorer(
+                normalize=getattr(settings, 'SENTIMENT_LEXICON_NORMALIZE', False)
+            )
+        return self._lexicon_scorer
+
     def extract_entities(self, text: str) -> List[Dict]:
         """
         Extrae entidades nombradas del texto.
@@ -91,18 +290,8 @@ class SentimentAnalyzer:
         """
         if not self.nlp:
             return []
-        
-        doc = self.nlp(text)
-        entities = []
-        
-        for ent in doc.ents:
-            entities.append({
-                'text': ent.text,
-                'label': ent.label_
-            })
-        
-        return entities
-    
+        return self.entities_from_doc(self.nlp(text))
+
     def extract_keywords(self, text: str, top_n: int = 5) -> List[str]:
         """
         Extrae las keywords más importantes del texto.
@@ -112,24 +301,29 @@ class SentimentAnalyzer:
         """
         if not self.nlp:
             return []
-        
-        doc = self.nlp(text.lower())
-        
-        # Filtrar tokens: solo sustantivos, verbos y adjetivos
+        return self.keywords_from_doc(self.nlp(text.lower(), disable=KEYWORD_DISABLED_PIPES), top_n)
+
+    @staticmethod
+    def entities_from_doc(doc) -> List[Dict]:
+        """Entidades nombradas de un Doc ya procesado."""
+        return [{'text': ent.text, 'label': ent.label_} for ent in doc.ents]
+
+    @staticmethod
+    def keywords_from_doc(doc, top_n: int = 5) -> List[str]:
+        """
+        Keywords de un Doc ya procesado sobre el texto en minúsculas: sustantivos,
+        verbos y adjetivos que no son stop words, por frecuencia.
+        """
+        from collections import Counter
+
         keywords = [
-            token.text for token in doc 
-            if not token.is_stop 
-            and not token.is_punct 
+            token.text for token in doc
+            if not token.is_stop
+            and not token.is_punct
             and token.pos_ in ['NOUN', 'VERB', 'ADJ']
             and len(token.text) > 3
         ]
-        
-        # Contar frecuencias
-        from collections import Counter
-        keyword_freq = Counter(keywords)
-        
-        # Retornar top N
-        return [word for word, _ in keyword_freq.most_common(top_n)]
+        return [word for word, _ in Counter(keywords).most_common(top_n)]
 
 
 # Instancia global del analizador
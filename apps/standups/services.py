@@ -0,0 +1,478 @@
+"""
+Servicios de standups: análisis NLP incremental, detección de bloqueadores y
+agregación diaria (TeamMood).
+"""
+import logging
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet, Value
+from django.db.models.functions import Concat
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils import timezone
+
+from .dedup import aggregation_weight, weighted_avg_sentiment
+from .embeddings import blocker_vectors
+from .keywords import refresh_keyword_occurrences
+from .models import StandupLog, TeamMood
+
+logger = logging.getLogger(__name__)
+
+# High-water mark del procesamiento NLP incremental: todos los standups con
+# id <= watermark ya fueron procesados. Perderlo (desalojo de cache) solo
+# amplía el rango escaneado; la condición nlp_processed=False garantiza la corrección.
+STANDUP_NLP_WATERMARK_KEY = 'standups:nlp:watermark'
+# El watermark no avanza sobre standups creados hace menos de este margen: un id
+# menor todavía sin commitear (invisible al leer) queda dentro del rango escaneado
+STANDUP_NLP_WATERMARK_GRACE = timedelta(minutes=10)
+
+# Un standup reclamado por un worker no se vuelve a reclamar mientras el reclamo esté
+# vigente; si el worker muere, el standup vuelve a la cola al vencer este plazo
+STANDUP_NLP_CLAIM_TIMEOUT = timedelta(minutes=15)
+# Intentos de análisis antes de sacar un standup de la cola (y dejar avanzar el watermark)
+STANDUP_NLP_MAX_ATTEMPTS = 3
+
+# Campos escritos por el análisis NLP
+NLP_FIELDS = [
+    'sentiment_score', 'sentiment_label', 'sentiment_confidence', 'detected_entities',
+    'keywords', 'nlp_processed', 'nlp_processed_at', 'nlp_claimed_at',
+]
+
+# Campos escritos por el detector de bloqueadores
+BLOCKER_FIELDS = ['has_blockers', 'blocker_severity', 'blocker_entities', 'requires_attention']
+
+# Días de mood previos contra los que se compara cada día para calcular `trend`
+TREND_LOOKBACK = 3
+# Diferencia mínima de sentimiento promedio para considerar un cambio de tendencia
+TREND_THRESHOLD = 0.1
+# Keywords comunes guardadas por día
+COMMON_KEYWORDS_LIMIT = 10
+# Máximo de días calendario que se retroceden para encontrar los días previos
+TREND_HISTORY_DAYS = 30
+
+# Configuración de text search de PostgreSQL (debe coincidir con el trigger de la migración 0004)
+SEARCH_CONFIG = 'spanish'
+# Delimitadores del resaltado de ts_headline: el texto se escapa antes de convertirlos en <mark>
+HEADLINE_START, HEADLINE_STOP = '\x02', '\x03'
+
+
+def _apply_analysis(standup: StandupLog, result: Dict) -> StandupLog:
+    sentiment_result = result['sentiment']
+    standup.sentiment_score = sentiment_result['score']
+    standup.sentiment_label = sentiment_result['label']
+    standup.sentiment_confidence = sentiment_result['confidence']
+
+    standup.detected_entities = result['entities']
+    standup.keywords = result['keywords']
+
+    standup.nlp_processed = True
+    standup.nlp_processed_at = timezone.now()
+    return standup
+
+
+def analyze_standup(standup: StandupLog) -> StandupLog:
+    """
+    Ejecuta el análisis NLP sobre un standup y completa sus campos (sin guardar).
+    """
+    from .nlp_utils import analyzer
+
+    return _apply_analysis(standup, analyzer.analyze(standup.get_combined_text()))
+
+
+def analyze_standups(standups: list) -> list:
+    """
+    Analiza un lote de standups con una sola consulta a la cache NLP.
+    Si el lote falla, reintenta uno por uno para aislar el standup problemático.
+
+    Returns:
+        Standups analizados correctamente (con sus campos completos, sin guardar)
+    """
+    from .nlp_utils import analyzer
+
+    try:
+        results = analyzer.analyze_many([standup.get_combined_text() for standup in standups])
+        return [_apply_analysis(standup, result) for standup, result in zip(standups, results)]
+    except Exception as e:
+        logger.error(f"❌ Error analizando lote de standups, reintentando individualmente: {e}")
+
+    analyzed = []
+    for standup in standups:
+        try:
+            analyzed.append(analyze_standup(standup))
+        except Exception as e:
+            logger.error(f"❌ Error analizando standup {standup.id}: {e}")
+    return analyzed
+
+
+def detect_blockers(standups: list, batch_size: int = 256) -> list:
+    """
+    Clasifica los bloqueadores de un lote de standups con nlp.pipe y completa
+    has_blockers, blocker_severity, blocker_entities y requires_attention (sin guardar).
+
+    Returns:
+        Lista de BlockerResult alineada con `standups`
+    """
+    from .blockers import ReferenceIndex, detector
+
+    if not standups:
+        return []
+
+    references = ReferenceIndex.for_project_ids(detector.nlp, {s.project_id for s in standups})
+    results = detector.detect_many(
+        [standup.blockers for standup in standups],
+        project_ids=[standup.project_id for standup in standups],
+        references=references,
+        batch_size=batch_size,
+    )
+    for standup, result in zip(standups, results):
+        standup.has_blockers = result.has_blockers
+        standup.blocker_severity = result.severity
+        standup.blocker_entities = result.as_entities() if result.has_blockers else {}
+        standup.requires_attention = standup.check_attention_needed()
+    return results
+
+
+def save_blocker_links(standups: list, results: list):
+    """Reemplaza los vínculos a tareas y proyectos bloqueados de un lote (4 queries)."""
+    ids = [standup.pk for standup in standups]
+    for relation, attr, target in (
+        (StandupLog.blocked_tasks.through, 'task_ids', 'task_id'),
+        (StandupLog.blocked_projects.through, 'project_ids', 'project_id'),
+    ):
+        relation.objects.filter(standuplog_id__in=ids).delete()
+        relation.objects.bulk_create([
+            relation(standuplog_id=standup.pk, **{target: pk})
+            for standup, result in zip(standups, results)
+            for pk in getattr(result, attr)
+        ])
+
+
+def _advance_watermark(watermark: int) -> int:
+    """
+    Mueve el high-water mark hasta el primer standup aún sin procesar, sin pasar
+    del último creado antes de STANDUP_NLP_WATERMARK_GRACE (ver la constante).
+    """
+    settled = StandupLog.objects.filter(
+        created_at__lte=timezone.now() - STANDUP_NLP_WATERMARK_GRACE
+    ).order_by('-id').values_list('id', flat=True).first()
+    new_watermark = settled or watermark
+
+    first_pending = StandupLog.objects.filter(
+        nlp_processed=False, nlp_attempts__lt=STANDUP_NLP_MAX_ATTEMPTS, id__gt=watermark
+    ).order_by('id').values_list('id', flat=True).first()
+    if first_pending is not None:
+        new_watermark = min(new_watermark, first_pending - 1)
+
+    if new_watermark > watermark:
+        cache.set(STANDUP_NLP_WATERMARK_KEY, new_watermark, timeout=None)
+    return new_watermark
+
+
+def pending_standups() -> QuerySet:
+    """Standups en la cola NLP: sin procesar, con intentos disponibles y sin un reclamo vigente."""
+    return StandupLog.objects.filter(
+        Q(nlp_claimed_at__isnull=True) | Q(nlp_claimed_at__lt=timezone.now() - STANDUP_NLP_CLAIM_TIMEOUT),
+        nlp_processed=False,
+        nlp_attempts__lt=STANDUP_NLP_MAX_ATTEMPTS,
+    )
+
+
+def claim_standups(queryset: QuerySet, limit: int) -> list:
+    """
+    Reclama hasta `limit` standups del queryset en una transacción corta: se bloquean
+    con select_for_update(skip_locked=True), se marcan con nlp_claimed_at y se suma un
+    intento. El análisis corre después, sin locks; save_analysis solo guarda los
+    standups cuyo reclamo sigue siendo el mismo.
+    """
+    with transaction.atomic():
+        batch = list(queryset.select_for_update(skip_locked=True).order_by('id')[:limit])
+        if batch:
+            claimed_at = timezone.now()
+            StandupLog.objects.filter(id__in=[standup.id for standup in batch]).update(
+                nlp_claimed_at=claimed_at, nlp_attempts=F('nlp_attempts') + 1,
+            )
+            for standup in batch:
+                standup.nlp_claimed_at = claimed_at
+                standup.nlp_attempts += 1
+    return batch
+
+
+def save_analysis(claimed: list, analyzed: list, results: list) -> list:
+    """
+    Guarda el análisis de un lote reclamado en una transacción corta.
+
+    Solo se escriben los standups que siguen reclamados por este lote: si el texto se
+    editó durante el análisis (StandupLog.save libera el reclamo) o el reclamo venció y
+    lo tomó otro worker, el resultado se descarta. Los standups que fallaron liberan su
+    reclamo para reintentarse hasta STANDUP_NLP_MAX_ATTEMPTS. bulk_update no dispara
+    post_save, así que se invalidan las secciones del dashboard que dependen de StandupLog.
+
+    Args:
+        claimed: Standups devueltos por claim_standups
+        analyzed: Los analizados correctamente (con sus campos completos)
+        results: BlockerResult de detect_blockers, alineados con `analyzed`
+
+    Returns:
+        Standups guardados
+    """
+    from apps.analytics.signals import invalidate_dashboard_sections
+
+    analyzed_ids = {standup.id for standup in analyzed}
+    failed = [standup for standup in claimed if standup.id not in analyzed_ids]
+
+    with transaction.atomic():
+        current = dict(
+            StandupLog.objects.select_for_update().filter(
+                id__in=[standup.id for standup in claimed]
+            ).values_list('id', 'nlp_claimed_at')
+        )
+        owned = [
+            (standup, result) for standup, result in zip(analyzed, results)
+            if current.get(standup.id) == standup.nlp_claimed_at
+        ]
+        saved = [standup for standup, _ in owned]
+        for standup in saved:
+            standup.nlp_claimed_at = None
+
+        if saved:
+            StandupLog.objects.bulk_update(saved, NLP_FIELDS + BLOCKER_FIELDS)
+            save_blocker_links(saved, [result for _, result in owned])
+            refresh_keyword_occurrences({(standup.project_id, standup.date) for standup in saved})
+            invalidate_dashboard_sections(StandupLog)
+
+        for standup in failed:
+            if current.get(standup.id) != standup.nlp_claimed_at:
+                continue
+            StandupLog.objects.filter(id=standup.id).update(nlp_claimed_at=None)
+            if standup.nlp_attempts >= STANDUP_NLP_MAX_ATTEMPTS:
+                logger.error(
+                    f"❌ Standup {standup.id} sale de la cola NLP tras {standup.nlp_attempts} intentos fallidos"
+                )
+
+    return saved
+
+
+def process_pending_standups(batch_size: int = 50, max_batches: Optional[int] = None) -> int:
+    """
+    Procesa los standups pendientes de análisis NLP de forma incremental.
+    Los bloqueadores de cada lote se vectorizan para la búsqueda de bloqueadores similares
+    y las keywords de los días tocados se recalculan en KeywordOccurrence.
+
+    Cada lote pasa por dos transacciones cortas: el reclamo (claim_standups) y la
+    escritura de resultados (save_analysis). El análisis spaCy y la sincronización con
+    Qdrant corren fuera de ellas, sin retener locks de filas ni de proyectos. Varios
+    workers pueden drenar la cola en paralelo: un standup reclamado no se vuelve a
+    reclamar hasta que vence su reclamo.
+
+    Args:
+        batch_size: Standups reclamados por lote
+        max_batches: Límite de lotes por ejecución (None = hasta vaciar)
+
+    Returns:
+        Cantidad de standups procesados
+    """
+    watermark = cache.get(STANDUP_NLP_WATERMARK_KEY, 0)
+    processed = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        batch = claim_standups(pending_standups().filter(id__gt=watermark), batch_size)
+        if not batch:
+            break
+
+        analyzed = analyze_standups(batch)
+        results = detect_blockers(analyzed, batch_size=batch_size)
+        saved = save_analysis(batch, analyzed, results)
+        blocker_vectors.sync_standups(saved)
+
+        processed += len(saved)
+        batches += 1
+        # Avanza solo por lotes reclamados: otro worker puede tener ids menores reclamados
+        watermark = max(watermark, batch[-1].id)
+
+    _advance_watermark(cache.get(STANDUP_NLP_WATERMARK_KEY, 0))
+    return processed
+
+
+def get_alert_level(avg_sentiment: float, negative_ratio: float, critical_blockers: int) -> str:
+    """Nivel de alerta del equipo a partir de sentimiento, ratio negativo y bloqueadores críticos."""
+    if avg_sentiment < -0.3 or negative_ratio > 0.5 or critical_blockers > 0:
+        return 'red'
+    elif avg_sentiment < 0 or negative_ratio > 0.3:
+        return 'yellow'
+    return 'green'
+
+
+def get_trend(current: float, previous: list) -> Optional[str]:
+    """
+    Tendencia del día respecto al promedio de los días de mood previos.
+
+    Args:
+        current: Sentimiento promedio del día
+        previous: Sentimientos promedio de los días anteriores (más reciente al final)
+    """
+    if not previous:
+        return None
+    window = previous[-TREND_LOOKBACK:]
+    delta = current - sum(window) / len(window)
+    if delta > TREND_THRESHOLD:
+        return 'improving'
+    elif delta < -TREND_THRESHOLD:
+        return 'declining'
+    return 'stable'
+
+
+def compute_team_moods(
+    start_date: date,
+    end_date: date,
+    project_ids: Optional[Iterable[int]] = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Calcula y guarda TeamMood para todos los proyectos y días de un rango.
+
+    Ejecuta una consulta agregada agrupada por (proyecto, día), que incluye
+    TREND_HISTORY_DAYS previos para poder calcular la tendencia del primer día,
+    y una consulta para las keywords del rango. Sentimiento promedio y keywords
+    ponderan los casi duplicados con DUPLICATE_STANDUP_WEIGHT. La tendencia se calcula en memoria
+    y las filas se insertan/actualizan con bulk_create(update_conflicts=True).
+
+    Args:
+        start_date: Primer día a calcular
+        end_date: Último día a calcular (inclusive)
+        project_ids: Limitar a estos proyectos (por defecto todos)
+        batch_size: Tamaño de lote para bulk_create
+
+    Returns:
+        Cantidad de filas de TeamMood escritas
+    """
+    standups = StandupLog.objects.order_by().filter(nlp_processed=True)
+    if project_ids is not None:
+        standups = standups.filter(project_id__in=list(project_ids))
+
+    aggregates = standups.filter(
+        date__gte=start_date - timedelta(days=TREND_HISTORY_DAYS),
+        date__lte=end_date,
+    ).values('project', 'date').annotate(
+        avg_sentiment=weighted_avg_sentiment(),
+        team_size=Count('id'),
+        positive=Count('id', filter=Q(sentiment_label='positive')),
+        neutral=Count('id', filter=Q(sentiment_label='neutral')),
+        negative=Count('id', filter=Q(sentiment_label__in=['negative', 'very_negative'])),
+        blocker_count=Count('id', filter=Q(has_blockers=True)),
+        critical_blockers=Count('id', filter=Q(blocker_severity='critical')),
+    ).order_by('project', 'date')
+
+    # Los casi duplicados suman con peso reducido (ver dedup.aggregation_weight)
+    keywords = defaultdict(Counter)
+    for project_id, day, day_keywords, weight in standups.filter(
+        date__gte=start_date,
+        date__lte=end_date,
+    ).values_list('project', 'date', 'keywords', aggregation_weight()).iterator(chunk_size=batch_size):
+        day_counter = keywords[(project_id, day)]
+        for word in day_keywords or []:
+            day_counter[word] += weight
+
+    history = defaultdict(list)
+    moods = []
+    for row in aggregates.iterator(chunk_size=batch_size):
+        avg_sentiment = row['avg_sentiment'] or 0
+        previous = history[row['project']]
+
+        if row['date'] >= start_date:
+            moods.append(TeamMood(
+                project_id=row['project'],
+                date=row['date'],
+                average_sentiment=avg_sentiment,
+                team_size=row['team_size'],
+                positive_count=row['positive'],
+                neutral_count=row['neutral'],
+                negative_count=row['negative'],
+                blocker_count=row['blocker_count'],
+                critical_blocker_count=row['critical_blockers'],
+                trend=get_trend(avg_sentiment, previous),
+                common_keywords=[
+                    word for word, _ in
+                    keywords[(row['project'], row['date'])].most_common(COMMON_KEYWORDS_LIMIT)
+                ],
+                alert_level=get_alert_level(
+                    avg_sentiment,
+                    row['negative'] / row['team_size'],
+                    row['critical_blockers'],
+                ),
+            ))
+
+        previous.append(avg_sentiment)
+        del previous[:-TREND_LOOKBACK]
+
+    TeamMood.objects.bulk_create(
+        moods,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['project', 'date'],
+        update_fields=[
+            'average_sentiment', 'team_size', 'positive_count', 'neutral_count',
+            'negative_count', 'blocker_count', 'critical_blocker_count', 'trend',
+            'common_keywords', 'alert_level', 'updated_at',
+        ],
+    )
+
+    logger.info(f"✓ TeamMood calculado para {len(moods)} proyecto-días ({start_date} a {end_date})")
+    return len(moods)
+
+
+def search_standups(
+    query: str,
+    project_id: Optional[int] = None,
+    resource_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    sentiment: Optional[str] = None,
+) -> QuerySet:
+    """
+    Búsqueda full-text de standups ordenada por relevancia.
+
+    Usa el índice GIN sobre `search_vector`; la consulta acepta sintaxis web
+    ("bloqueado por cliente" entre comillas busca la frase, -palabra excluye).
+
+    Returns:
+        QuerySet anotado con `rank` y `headline` (fragmento a pasar por `highlight`)
+    """
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    standups = StandupLog.objects.select_related('resource', 'project').filter(
+        search_vector=search_query
+    )
+
+    if project_id:
+        standups = standups.filter(project_id=project_id)
+    if resource_id:
+        standups = standups.filter(resource_id=resource_id)
+    if date_from:
+        standups = standups.filter(date__gte=date_from)
+    if date_to:
+        standups = standups.filter(date__lte=date_to)
+    if sentiment:
+        standups = standups.filter(sentiment_label=sentiment)
+
+    return standups.annotate(
+        rank=SearchRank(F('search_vector'), search_query),
+        headline=SearchHeadline(
+            Concat('blockers', Value(' '), 'what_i_did', Value(' '), 'what_i_will_do'),
+            search_query,
+            config=SEARCH_CONFIG,
+            start_sel=HEADLINE_START,
+            stop_sel=HEADLINE_STOP,
+            max_fragments=2,
+        ),
+    ).order_by('-rank', '-date')
+
+
+def highlight(headline: str) -> str:
+    """Escapa el fragmento de ts_headline y marca los términos encontrados con <mark>."""
+    html = escape(headline or '').replace(HEADLINE_START, '<mark>').replace(HEADLINE_STOP, '</mark>')
+    return mark_safe(html)
@@ -0,0 +1,83 @@
+"""
+Signals para encolar el análisis NLP de los standups recién creados,
+mantener la colección de bloqueadores en Qdrant, el índice de casi duplicados
+y los proyectos mencionables por el detector de bloqueadores.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import StandupLog
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=StandupLog)
+def enqueue_standup_analysis(sender, instance, created, **kwargs):
+    """
+    Encola el análisis de un standup nuevo (o cuyo texto se editó, ver
+    StandupLog.save) al confirmarse la transacción, para que el worker nunca lea
+    una fila sin commitear. Un encolado repetido es inocuo: la tarea reclama el
+    standup solo si sigue sin procesar.
+    """
+    if instance.nlp_processed or not getattr(settings, 'ENABLE_SENTIMENT_ANALYSIS', True):
+        return
+
+    standup_id = instance.pk
+    transaction.on_commit(lambda: _enqueue(standup_id))
+
+
+@receiver(post_save, sender=StandupLog)
+def update_duplicate_index(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Actualiza la firma MinHash/LSH del standup y lo marca si es un casi duplicado.
+    Guardados parciales que no tocan el texto (ej: análisis NLP) no recalculan nada.
+    """
+    if update_fields is not None and not set(StandupLog.TEXT_FIELDS).intersection(update_fields):
+        return
+    if not getattr(settings, 'ENABLE_DUPLICATE_DETECTION', True):
+        return
+
+    from .dedup import fingerprint_standups
+
+    try:
+        fingerprint_standups([instance])
+    except Exception as e:
+        logger.error(f"❌ Error actualizando el índice de duplicados del standup {instance.pk}: {e}")
+
+
+def _enqueue(standup_id: int):
+    """
+    Encola el análisis. Si el broker no está disponible lo recoge analyze_recent_standups,
+    siempre que el standup se commitee dentro de STANDUP_NLP_WATERMARK_GRACE desde su creación.
+    """
+    from .tasks import analyze_standup_sentiment
+
+    try:
+        analyze_standup_sentiment.delay(standup_id)
+    except Exception as e:
+        logger.error(f"❌ No se pudo encolar el análisis del standup {standup_id}: {e}")
+
+
+@receiver(post_delete, sender=StandupLog)
+def delete_standup_blocker_vector(sender, instance, **kwargs):
+    """Elimina el vector del bloqueador de un standup borrado."""
+    if not instance.has_blockers:
+        return
+
+    from .embeddings import blocker_vectors
+
+    standup_id = instance.pk
+    transaction.on_commit(lambda: blocker_vectors.delete_standup(standup_id))
+
+
+@receiver(post_save, sender='projects.Project')
+@receiver(post_delete, sender='projects.Project')
+def invalidate_project_references(sender, **kwargs):
+    """Un proyecto nuevo, renombrado o cerrado invalida el matcher de proyectos de los workers."""
+    from .blockers import bump_project_references
+
+    transaction.on_commit(bump_project_references)
@@ -3,71 +3,50 @@ Celery tasks for standups app.
 """
 from celery import shared_task
 from django.utils import timezone
-from django.db.models import Avg, Count, Q
 
 
 @shared_task
-def analyze_standup_sentiment(standup_id: int):
+def analyze_standup_sentiment(standup_id: int, force: bool = False):
     """
     Analiza el sentimiento de un standup usando NLP.
+    El standup se reclama igual que en el procesamiento por lotes (services.claim_standups):
+    si otro worker lo tiene reclamado (o ya fue procesado y force=False) no se analiza de nuevo.
     """
+    from .embeddings import blocker_vectors
     from .models import StandupLog
-    from .nlp_utils import analyzer
-    
+    from .services import analyze_standups, claim_standups, detect_blockers, pending_standups, save_analysis
+
     try:
-        standup = StandupLog.objects.get(id=standup_id)
-        
-        # Combinar todo el texto
-        text = standup.get_combined_text()
-        
-        # Analizar sentimiento
-        sentiment_result = analyzer.analyze_sentiment(text)
-        standup.sentiment_score = sentiment_result['score']
-        standup.sentiment_label = sentiment_result['label']
-        standup.sentiment_confidence = sentiment_result['confidence']
-        
-        # Extraer entidades
-        entities = analyzer.extract_entities(text)
-        standup.detected_entities = entities
-        
-        # Extraer keywords
-        keywords = analyzer.extract_keywords(text)
-        standup.keywords = keywords
-        
-        # Marcar como procesado
-        standup.nlp_processed = True
-        standup.nlp_processed_at = timezone.now()
-        
-        standup.save()
-        
+        standups = StandupLog.objects if force else pending_standups()
+        claimed = claim_standups(standups.filter(id=standup_id), 1)
+
+        if not claimed:
+            if not StandupLog.objects.filter(id=standup_id).exists():
+                return f"Standup {standup_id} not found"
+            return f"Standup {standup_id} already processed or claimed by another worker"
+
+        analyzed = analyze_standups(claimed)
+        saved = save_analysis(claimed, analyzed, detect_blockers(analyzed))
+        if not saved:
+            return f"Standup {standup_id} not analyzed (failed or edited during analysis)"
+
+        blocker_vectors.sync_standups(saved)
         return f"Analyzed standup {standup_id}"
-    
-    except StandupLog.DoesNotExist:
-        return f"Standup {standup_id} not found"
+
     except Exception as e:
         return f"Error analyzing standup {standup_id}: {str(e)}"
 
 
 @shared_task
-def analyze_recent_standups():
+def analyze_recent_standups(batch_size: int = 50):
     """
-    Analiza los standups recientes que no han sido procesados.
+    Drena los standups pendientes de análisis desde el high-water mark.
+    Varios workers pueden ejecutarla en paralelo sin procesar dos veces el mismo standup.
     """
-    from .models import StandupLog
-    
-    # Obtener standups de los últimos 7 días sin procesar
-    recent_date = timezone.now().date() - timezone.timedelta(days=7)
-    unprocessed = StandupLog.objects.filter(
-        date__gte=recent_date,
-        nlp_processed=False
-    )
-    
-    count = 0
-    for standup in unprocessed:
-        analyze_standup_sentiment.delay(standup.id)
-        count += 1
-    
-    return f"Queued {count} standups for analysis"
+    from .services import process_pending_standups
+
+    count = process_pending_standups(batch_size=batch_size)
+    return f"Analyzed {count} pending standups"
 
 
 @shared_task
@@ -75,71 +54,41 @@ def calculate_team_mood(project_id: int, date_str: str):
     """
     Calcula el mood agregado del equipo para un proyecto en una fecha.
     """
-    from .models import StandupLog, TeamMood
     from datetime import datetime
-    
+    from .services import compute_team_moods
+
     try:
         date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        
-        # Obtener todos los standups del proyecto en esa fecha
-        standups = StandupLog.objects.filter(
-            project_id=project_id,
-            date=date,
-            nlp_processed=True
-        )
-        
-        if not standups.exists():
+
+        written = compute_team_moods(date, date, project_ids=[project_id])
+        if not written:
             return f"No standups found for project {project_id} on {date}"
-        
-        # Calcular métricas agregadas
-        sentiment_data = standups.aggregate(
-            avg_sentiment=Avg('sentiment_score'),
-            team_size=Count('id'),
-            positive=Count('id', filter=Q(sentiment_label='positive')),
-            neutral=Count('id', filter=Q(sentiment_label='neutral')),
-            negative=Count('id', filter=Q(sentiment_label__in=['negative', 'very_negative'])),
-            blocker_count=Count('id', filter=Q(has_blockers=True)),
-            critical_blockers=Count('id', filter=Q(blocker_severity='critical'))
-        )
-        
-        # Extraer keywords comunes
-        all_keywords = []
-        for standup in standups:
-            all_keywords.extend(standup.keywords)
-        
-        from collections import Counter
-        common_keywords = [word for word, _ in Counter(all_keywords).most_common(10)]
-        
-        # Determinar nivel de alerta
-        avg_sentiment = sentiment_data['avg_sentiment'] or 0
-        negative_ratio = sentiment_data['negative'] / sentiment_data['team_size']
-        critical_blockers = sentiment_data['critical_blockers']
-        
-        if avg_sentiment < -0.3 or negative_ratio > 0.5 or critical_blockers > 0:
-            alert_level = 'red'
-        elif avg_sentiment < 0 or negative_ratio > 0.3:
-            alert_level = 'yellow'
-        else:
-            alert_level = 'green'
-        
-        # Crear o actualizar TeamMood
-        team_mood, created = TeamMood.objects.update_or_create(
-            project_id=project_id,
-            date=date,
-            defaults={
-                'average_sentiment': sentiment_data['avg_sentiment'],
-                'team_size': sentiment_data['team_size'],
-                'positive_count': sentiment_data['positive'],
-                'neutral_count': sentiment_data['neutral'],
-                'negative_count': sentiment_data['negative'],
-                'blocker_count': sentiment_data['blocker_count'],
-                'critical_blocker_count': sentiment_data['critical_blockers'],
-                'common_keywords': common_keywords,
-                'alert_level': alert_level
-            }
-        )
-        
-        return f"{'Created' if created else 'Updated'} team mood for project {project_id} on {date}"
-    
+
+        return f"Calculated team mood for project {project_id} on {date}"
+
     except Exception as e:
         return f"Error calculating team mood: {str(e)}"
+
+
+@shared_task
+def calculate_team_mood_range(start_date_str: str = None, end_date_str: str = None):
+    """
+    Calcula TeamMood de todos los proyectos en un rango de fechas (por defecto ayer y hoy).
+    Sirve tanto para la ejecución diaria como para backfills de meses completos.
+    """
+    from datetime import datetime
+    from .services import compute_team_moods
+
+    today = timezone.now().date()
+    try:
+        start_date = (
+            datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str
+            else today - timezone.timedelta(days=1)
+        )
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else today
+
+        written = compute_team_moods(start_date, end_date)
+        return f"Calculated team mood for {written} project-days ({start_date} to {end_date})"
+
+    except Exception as e:
+        return f"Error calculating team mood range: {str(e)}"
@@ -0,0 +1,53 @@
+"""Tests de las firmas MinHash y los buckets LSH de standups."""
+from apps.standups.dedup import LSH_BANDS, NUM_PERM, estimated_jaccard, lsh_buckets, minhash
+
+TEXT = (
+    'Ayer terminé la integración del módulo de facturación con el servicio de pagos, '
+    'hoy reviso los tests de regresión y preparo el despliegue a staging para el viernes'
+)
+
+
+def test_minhash_is_none_without_words():
+    assert minhash('') is None
+    assert minhash(None) is None
+    assert minhash('... !!! ---') is None
+
+
+def test_minhash_signature_length_and_determinism():
+    signature = minhash(TEXT)
+    assert len(signature) == NUM_PERM
+    assert signature == minhash(TEXT)
+
+
+def test_minhash_ignores_case_and_accents():
+    assert minhash(TEXT) == minhash(TEXT.upper().replace('é', 'e').replace('ó', 'o'))
+
+
+def test_estimated_jaccard_identical_text_is_one():
+    assert estimated_jaccard(minhash(TEXT), minhash(TEXT)) == 1.0
+
+
+def test_estimated_jaccard_near_duplicate_is_high():
+    edited = TEXT.replace('viernes', 'lunes')
+    assert estimated_jaccard(minhash(TEXT), minhash(edited)) >= 0.7
+
+
+def test_estimated_jaccard_unrelated_text_is_low():
+    other = 'Sigo bloqueado esperando accesos a la base de datos del cliente, escalé con el PM'
+    assert estimated_jaccard(minhash(TEXT), minhash(other)) <= 0.2
+
+
+def test_short_text_has_single_shingle():
+    assert minhash('hola equipo') == minhash('Hola  equipo')
+
+
+def test_lsh_buckets_one_per_band_and_signed_64_bits():
+    buckets = lsh_buckets(minhash(TEXT))
+    assert len(buckets) == LSH_BANDS
+    assert all(-(1 << 63) <= bucket < (1 << 63) for bucket in buckets)
+    assert buckets == lsh_buckets(minhash(TEXT))
+
+
+def test_lsh_near_duplicates_share_a_bucket():
+    edited = TEXT.replace('viernes', 'lunes')
+    assert set(lsh_buckets(minhash(TEXT))) & set(lsh_buckets(minhash(edited)))
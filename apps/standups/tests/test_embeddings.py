@@ -0,0 +1,72 @@
+"""Tests de la búsqueda de bloqueadores similares contra un Qdrant en memoria."""
+from datetime import date
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+from apps.standups.embeddings import BlockerVectorService
+
+QUERY_VECTOR = [1.0, 0.0, 0.0, 0.0]
+
+
+class StubVectors:
+    """Sustituto de VectorService: cliente en memoria y embeddings fijos de query."""
+
+    vector_size = 4
+
+    def __init__(self):
+        self.client = QdrantClient(':memory:')
+        self.queries = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return QUERY_VECTOR
+
+
+@pytest.fixture
+def blockers():
+    service = BlockerVectorService(vectors=StubVectors())
+    points = [
+        # (standup_id, project_id, similitud con la query)
+        (1, 10, 0.95),
+        (2, 20, 0.90),
+        (3, 20, 0.50),
+    ]
+    service.client.upsert(service.collection_name, points=[
+        PointStruct(
+            id=standup_id,
+            vector=[similarity, (1 - similarity ** 2) ** 0.5, 0.0, 0.0],
+            payload={
+                'standup_id': standup_id,
+                'project_id': project_id,
+                'date_ordinal': date(2025, 1, standup_id).toordinal(),
+                'severity': 'high',
+            },
+        )
+        for standup_id, project_id, similarity in points
+    ])
+    return service
+
+
+def test_similar_blockers_ranked_by_similarity(blockers):
+    results = blockers.similar_blockers('esperando accesos a la VPN', limit=2)
+
+    assert [result['standup_id'] for result in results] == [1, 2]
+    assert results[0]['similarity_score'] == pytest.approx(0.95)
+    assert blockers.vectors.queries == ['esperando accesos a la VPN']
+
+
+def test_similar_blockers_filters_other_teams_and_threshold(blockers):
+    results = blockers.similar_blockers('vpn', exclude_project_id=10, score_threshold=0.8)
+    assert [result['standup_id'] for result in results] == [2]
+
+
+def test_similar_blockers_excludes_own_standup(blockers):
+    results = blockers.similar_blockers('vpn', exclude_standup_id=1, since=date(2025, 1, 2))
+    assert [result['standup_id'] for result in results] == [2, 3]
+
+
+def test_similar_blockers_empty_text_skips_search(blockers):
+    assert blockers.similar_blockers('   ') == []
+    assert blockers.vectors.queries == []
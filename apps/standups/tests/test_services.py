@@ -0,0 +1,137 @@
+"""Tests de la cola NLP incremental de standups (reclamo, reintentos y watermark)."""
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.standups import services
+from apps.standups.models import StandupLog
+from apps.standups.services import (
+    STANDUP_NLP_MAX_ATTEMPTS,
+    STANDUP_NLP_WATERMARK_GRACE,
+    STANDUP_NLP_WATERMARK_KEY,
+    analyze_standups,
+    claim_standups,
+    detect_blockers,
+    pending_standups,
+    process_pending_standups,
+    save_analysis,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_qdrant(monkeypatch):
+    monkeypatch.setattr(services.blocker_vectors, 'sync_standups', lambda standups: 0)
+    cache.delete(STANDUP_NLP_WATERMARK_KEY)
+
+
+@pytest.fixture
+def make_standup(make_resource, make_project):
+    resource, project = make_resource(), make_project()
+
+    def make(day, **fields):
+        return StandupLog.objects.create(**{
+            'resource': resource, 'project': project, 'date': date(2025, 1, day),
+            'what_i_did': 'Terminé la integración con el servicio de pagos',
+            'what_i_will_do': 'Preparar el despliegue a staging',
+            'blockers': '', **fields,
+        })
+
+    return make
+
+
+def _settle(*standups):
+    """Fecha de creación fuera del margen del watermark."""
+    StandupLog.objects.filter(id__in=[s.id for s in standups]).update(
+        created_at=timezone.now() - 2 * STANDUP_NLP_WATERMARK_GRACE
+    )
+
+
+def test_process_pending_standups_analyzes_and_releases_claim(make_standup):
+    first, second = make_standup(1), make_standup(2, blockers='Bloqueado esperando credenciales del cliente')
+    _settle(first, second)
+
+    assert process_pending_standups() == 2
+
+    second.refresh_from_db()
+    assert second.nlp_processed and second.has_blockers
+    assert second.nlp_claimed_at is None
+    assert second.nlp_attempts == 1
+    assert cache.get(STANDUP_NLP_WATERMARK_KEY) == second.id
+
+
+def test_failing_standup_leaves_queue_after_max_attempts(make_standup, monkeypatch):
+    broken, ok = make_standup(1, what_i_did='roto'), make_standup(2)
+    _settle(broken, ok)
+
+    real_analyze_many = services.analyze_standups
+
+    def analyze(standups):
+        return real_analyze_many([s for s in standups if s.what_i_did != 'roto'])
+
+    monkeypatch.setattr(services, 'analyze_standups', analyze)
+
+    for attempt in range(1, STANDUP_NLP_MAX_ATTEMPTS + 1):
+        process_pending_standups()
+        broken.refresh_from_db()
+        assert broken.nlp_attempts == attempt
+        assert broken.nlp_claimed_at is None
+        # Mientras quedan intentos el watermark no lo supera
+        expected = ok.id if attempt == STANDUP_NLP_MAX_ATTEMPTS else broken.id - 1
+        assert cache.get(STANDUP_NLP_WATERMARK_KEY, 0) == expected
+
+    assert not broken.nlp_processed
+    assert not pending_standups().filter(id=broken.id).exists()
+
+
+def test_claimed_standup_is_not_claimed_again(make_standup):
+    standup = make_standup(1)
+
+    assert claim_standups(pending_standups(), 10) == [standup]
+    assert claim_standups(pending_standups(), 10) == []
+
+
+def test_edit_during_analysis_discards_result_and_requeues(make_standup):
+    standup = make_standup(1)
+    claimed = claim_standups(pending_standups(), 10)
+    analyzed = analyze_standups(claimed)
+    results = detect_blockers(analyzed)
+
+    edited = StandupLog.objects.get(id=standup.id)
+    edited.what_i_will_do = 'Revisar el reporte financiero'
+    edited.save()
+
+    assert save_analysis(claimed, analyzed, results) == []
+    standup.refresh_from_db()
+    assert not standup.nlp_processed
+    assert standup.nlp_attempts == 0
+    assert pending_standups().filter(id=standup.id).exists()
+
+
+@pytest.mark.parametrize('field', StandupLog.TEXT_FIELDS)
+def test_editing_any_text_field_requeues_processed_standup(make_standup, field):
+    make_standup(1)
+    process_pending_standups()
+
+    standup = StandupLog.objects.get()
+    assert standup.nlp_processed
+    setattr(standup, field, 'Texto nuevo con un problema en el ambiente de pruebas')
+    standup.save(update_fields=[field])
+
+    standup.refresh_from_db()
+    assert not standup.nlp_processed
+    assert standup.has_blockers == bool(standup.blockers.strip())
+    assert pending_standups().filter(id=standup.id).exists()
+
+
+def test_saving_without_text_changes_keeps_analysis(make_standup):
+    make_standup(1)
+    process_pending_standups()
+
+    standup = StandupLog.objects.get()
+    standup.notes = 'Nota del PM'
+    standup.save()
+
+    standup.refresh_from_db()
+    assert standup.nlp_processed
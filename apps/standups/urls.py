@@ -9,4 +9,8 @@ app_name = 'standups'
 urlpatterns = [
     path('', views.standup_list, name='list'),
     path('create/', views.standup_create, name='create'),
+    path('search/', views.standup_search, name='search'),
+    path('similar-blockers/', views.similar_blockers, name='similar_blockers'),
+    path('api/search/', views.standup_search_api, name='search_api'),
+    path('api/keywords/trends/', views.keyword_trends_api, name='keyword_trends_api'),
 ]
@@ -1,8 +1,26 @@
 """
 Views for standups app.
 """
-from django.shortcuts import render
+from datetime import datetime, timedelta
+
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from apps.projects.models import Project
+from apps.resources.models import Resource
+
+from .embeddings import blocker_vectors
+from .keywords import DEFAULT_TRENDS_LIMIT, keyword_trends
+from .models import StandupLog
+from .services import highlight, search_standups
+
+SEARCH_PAGE_SIZE = 20
+SIMILAR_BLOCKERS_LIMIT = 5
+# Ventana por defecto de las tendencias de keywords (un sprint)
+KEYWORD_TRENDS_DAYS = 14
 
 
 @login_required
@@ -15,3 +33,154 @@ def standup_list(request):
 def standup_create(request):
     """Crear nuevo standup."""
     return render(request, 'standups/create.html')
+
+
+def _int_param(request, name):
+    value = request.GET.get(name, '')
+    return int(value) if value.isdigit() else None
+
+
+def _date_param(request, name):
+    try:
+        return datetime.strptime(request.GET.get(name, ''), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def _search_filters(request) -> dict:
+    """Filtros de búsqueda desde el querystring; valores inválidos se ignoran."""
+    sentiment = request.GET.get('sentiment', '')
+    return {
+        'project_id': _int_param(request, 'project'),
+        'resource_id': _int_param(request, 'resource'),
+        'date_from': _date_param(request, 'date_from'),
+        'date_to': _date_param(request, 'date_to'),
+        'sentiment': sentiment if sentiment in dict(StandupLog.SENTIMENT_CHOICES) else None,
+    }
+
+
+def _search_page(request):
+    query = request.GET.get('q', '').strip()
+    filters = _search_filters(request)
+    if not query:
+        return query, filters, None
+    paginator = Paginator(search_standups(query, **filters), SEARCH_PAGE_SIZE)
+    return query, filters, paginator.get_page(request.GET.get('page'))
+
+
+@login_required
+def standup_search(request):
+    """
+    Búsqueda full-text de standups ordenada por relevancia.
+    Con HTMX solo se renderiza el fragmento de resultados.
+    """
+    query, filters, page = _search_page(request)
+    if page is not None:
+        for standup in page:
+            standup.highlighted = highlight(standup.headline)
+
+    context = {
+        'query': query,
+        'filters': filters,
+        'page': page,
+        'sentiment_choices': StandupLog.SENTIMENT_CHOICES,
+    }
+    if request.htmx:
+        return render(request, 'standups/partials/search_results.html', context)
+
+    context.update({
+        'projects': Project.objects.order_by('code').only('id', 'code', 'name'),
+        'resources': Resource.objects.filter(is_active=True).only('id', 'first_name', 'last_name'),
+    })
+    return render(request, 'standups/search.html', context)
+
+
+@login_required
+def standup_search_api(request):
+    """
+    API JSON de búsqueda full-text de standups (mismos parámetros que la vista HTMX).
+    """
+    query, _, page = _search_page(request)
+    if page is None:
+        return JsonResponse({'error': 'Se requiere el parámetro q'}, status=400)
+
+    return JsonResponse({
+        'query': query,
+        'page': page.number,
+        'num_pages': page.paginator.num_pages,
+        'count': page.paginator.count,
+        'results': [
+            {
+                'id': standup.id,
+                'date': standup.date.isoformat(),
+                'project': standup.project.code,
+                'resource': standup.resource.full_name,
+                'sentiment_label': standup.sentiment_label,
+                'has_blockers': standup.has_blockers,
+                'rank': round(standup.rank, 4),
+                'headline': str(highlight(standup.headline)),
+            }
+            for standup in page
+        ],
+    })
+
+
+@login_required
+def similar_blockers(request):
+    """
+    Bloqueadores similares reportados por otros equipos (HTMX, al escribir el bloqueador).
+
+    Parámetros GET: blockers (texto), project (proyecto propio, se excluye salvo
+    include_own=1), standup (se excluye), since (YYYY-MM-DD), severity (múltiple).
+    """
+    text = request.GET.get('blockers', '').strip()
+    project_id = _int_param(request, 'project')
+    severities = [
+        value for value in request.GET.getlist('severity')
+        if value in dict(StandupLog._meta.get_field('blocker_severity').choices)
+    ]
+
+    matches = blocker_vectors.similar_blockers(
+        text,
+        limit=SIMILAR_BLOCKERS_LIMIT,
+        exclude_project_id=None if request.GET.get('include_own') == '1' else project_id,
+        since=_date_param(request, 'since'),
+        severities=severities,
+        exclude_standup_id=_int_param(request, 'standup'),
+    )
+
+    # Hidratar todos los standups en una sola query; los borrados se omiten
+    standups = StandupLog.objects.select_related('resource', 'project').in_bulk(
+        [match['standup_id'] for match in matches]
+    )
+    results = [
+        {'standup': standups[match['standup_id']], 'similarity_score': match['similarity_score']}
+        for match in matches if match['standup_id'] in standups
+    ]
+
+    return render(request, 'standups/partials/similar_blockers.html', {
+        'text': text,
+        'results': results,
+    })
+
+
+@login_required
+def keyword_trends_api(request):
+    """
+    API JSON de keywords en alza/en baja respecto a la ventana anterior de igual largo.
+
+    Parámetros GET: project, start_date, end_date (YYYY-MM-DD; por defecto los
+    últimos KEYWORD_TRENDS_DAYS días), limit.
+    """
+    end_date = _date_param(request, 'end_date') or timezone.now().date()
+    start_date = _date_param(request, 'start_date') or end_date - timedelta(days=KEYWORD_TRENDS_DAYS - 1)
+    if start_date > end_date:
+        return JsonResponse({'error': 'start_date debe ser anterior a end_date'}, status=400)
+
+    trends = keyword_trends(
+        start_date,
+        end_date,
+        project_id=_int_param(request, 'project'),
+        limit=min(_int_param(request, 'limit') or DEFAULT_TRENDS_LIMIT, 100),
+    )
+    return JsonResponse(trends)
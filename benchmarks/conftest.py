@@ -0,0 +1,146 @@
+"""
+Fixtures de los benchmarks de vistas críticas.
+
+Los benchmarks corren sobre la base de tests de pytest-django, poblada una vez por
+sesión con generate_synthetic_data (DATASET). Con --reuse-db el dataset se conserva
+entre corridas. La línea base (baselines.json) guarda el motor de base de datos, la cache
+y el dataset con que se midió: contra otra combinación la comparación se omite.
+
+Uso:
+    pytest benchmarks --reuse-db                      # comparar contra la línea base
+    pytest benchmarks --reuse-db --update-baseline    # registrar una nueva línea base
+"""
+import json
+import statistics
+import time
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines.json'
+
+# Escala del dataset de la línea base (argumentos de generate_synthetic_data)
+DATASET = {
+    'roles': 40,
+    'resources': 300,
+    'projects': 1000,
+    'stages_per_project': 4,
+    'tasks_per_project': 20,
+    'team_size': 4,
+    'timelogs': 200_000,
+    'timeentries_per_project': 10,
+    'standups': 50_000,
+    'seed': 42,
+    'prefix': 'BEN',
+}
+
+REPEAT = 5
+
+# Claves de _meta que deben coincidir para comparar (la cache solo se informa)
+COMPARED_META = ('database', 'dataset', 'repeat')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption('--update-baseline', action='store_true', help='Guardar los resultados como nueva línea base')
+    group.addoption(
+        '--benchmark-threshold',
+        type=float,
+        default=0.2,
+        help='Regresión tolerada en tiempo (0.2 = 20%% más lento que la línea base)',
+    )
+    group.addoption(
+        '--benchmark-query-threshold',
+        type=int,
+        default=0,
+        help='Queries adicionales toleradas respecto a la línea base',
+    )
+
+
+def environment() -> dict:
+    return {
+        'database': connection.vendor,
+        'cache': settings.CACHES['default']['BACKEND'],
+        'dataset': DATASET,
+        'repeat': REPEAT,
+    }
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """Base de tests con el dataset sintético (se genera solo si falta, ver --reuse-db)."""
+    from apps.projects.models import Project
+
+    with django_db_blocker.unblock():
+        if not Project.objects.filter(code__startswith=DATASET['prefix']).exists():
+            call_command('generate_synthetic_data', stdout=StringIO(), **DATASET)
+            if connection.vendor == 'postgresql':
+                # Estadísticas al día: sin ANALYZE los planes dependen de cuándo corrió autovacuum
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+
+
+@pytest.fixture(scope='session')
+def baseline(request):
+    """Línea base vigente; al terminar la sesión se reescribe si se pasó --update-baseline."""
+    stored = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results = {}
+    yield stored, results
+
+    if request.config.getoption('update_baseline') and results:
+        updated = {**stored, **results, '_meta': results['_meta']}
+        BASELINE_PATH.write_text(json.dumps(updated, indent=2, sort_keys=True) + '\n')
+
+
+@pytest.fixture
+def benchmark(request, baseline):
+    """
+    Mide `fn`: una ejecución de calentamiento y REPEAT ejecuciones cronometradas
+    (mediana del tiempo, queries de la última). `setup` corre antes de cada
+    ejecución fuera del cronómetro (ej: vaciar la cache para medir en frío).
+    Falla si el resultado supera la línea base más las tolerancias.
+    """
+    stored, results = baseline
+    config = request.config
+
+    def run(name: str, fn, setup=None) -> dict:
+        if setup:
+            setup()
+        fn()
+        timings = []
+        for _ in range(REPEAT):
+            if setup:
+                setup()
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - start) * 1000)
+        result = {'queries': len(ctx.captured_queries), 'wall_ms': round(statistics.median(timings), 2)}
+        results['_meta'] = environment()
+        results[name] = result
+
+        if config.getoption('update_baseline'):
+            return result
+        reference = stored.get(name)
+        if reference is None:
+            pytest.skip(f'{name}: sin línea base (use --update-baseline)')
+        meta, current = stored.get('_meta', {}), environment()
+        if any(meta.get(key) != current[key] for key in COMPARED_META):
+            pytest.skip(f'{name}: línea base medida con otro entorno ({meta})')
+
+        query_threshold = config.getoption('benchmark_query_threshold')
+        threshold = config.getoption('benchmark_threshold')
+        assert result['queries'] <= reference['queries'] + query_threshold, (
+            f"{name}: {result['queries']} queries (línea base {reference['queries']})"
+        )
+        assert result['wall_ms'] <= reference['wall_ms'] * (1 + threshold), (
+            f"{name}: {result['wall_ms']:.1f} ms (línea base {reference['wall_ms']:.1f} ms, tolerancia {threshold:.0%})"
+        )
+        return result
+
+    return run
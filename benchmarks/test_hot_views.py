@@ -0,0 +1,57 @@
+"""Benchmarks de queries y latencia de las vistas críticas (ver conftest.py)."""
+from datetime import date, timedelta
+
+import pytest
+from django.db.models import Count
+from django.urls import reverse
+
+from apps.analytics.cache import clear_sections
+from apps.projects.models import Project
+from apps.projects.services import calculate_availability
+from apps.resources.models import Resource
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def get(admin_client):
+    def request(url: str):
+        response = admin_client.get(url, secure=True)
+        assert response.status_code == 200, f'{url} respondió {response.status_code}'
+        return response
+
+    return request
+
+
+def test_dashboard_cold(benchmark, get):
+    """Todas las secciones calculadas: la cache se vacía antes de cada ejecución."""
+    benchmark('dashboard_cold', lambda: get(reverse('analytics:dashboard')), setup=clear_sections)
+
+
+def test_dashboard_cached(benchmark, get):
+    benchmark('dashboard_cached', lambda: get(reverse('analytics:dashboard')))
+
+
+@pytest.mark.parametrize('view', [
+    'analytics:financial_report',
+    'analytics:resources_utilization',
+    'analytics:resource_booking',
+    'resources:capacity_chart',
+])
+def test_report(benchmark, get, view):
+    benchmark(view.split(':')[1], lambda: get(reverse(view)))
+
+
+def test_project_detail(benchmark, get):
+    project = Project.objects.annotate(n=Count('tasks')).order_by('-n', 'pk').first()
+    benchmark('project_detail', lambda: get(reverse('projects:detail', args=[project.pk])))
+
+
+def test_calculate_availability(benchmark):
+    resource = (
+        Resource.objects.filter(is_active=True).annotate(n=Count('allocations')).order_by('-n', 'pk').first()
+    )
+    today = date.today()
+    benchmark('calculate_availability', lambda: calculate_availability(
+        resource.pk, today, today + timedelta(days=90)
+    ))
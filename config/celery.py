@@ -4,6 +4,7 @@ Celery configuration for SIGRP project.
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -15,18 +16,51 @@ app.autodiscover_tasks()
 app.conf.beat_schedule = {
     'analyze-standups-sentiment': {
         'task': 'apps.standups.tasks.analyze_recent_standups',
-        'schedule': crontab(hour=18, minute=0),  # Diariamente a las 6 PM
+        'schedule': crontab(minute='*/10'),  # Red de seguridad: los nuevos se encolan al crearse
+    },
+    'calculate-team-mood': {
+        'task': 'apps.standups.tasks.calculate_team_mood_range',
+        'schedule': crontab(hour=18, minute=30),  # Diariamente, tras el análisis de standups
     },
     'calculate-project-health': {
         'task': 'apps.projects.tasks.calculate_project_health_scores',
         'schedule': crontab(hour=8, minute=0),  # Diariamente a las 8 AM
     },
+    'update-project-metrics': {
+        'task': 'apps.projects.tasks.update_project_metrics',
+        'schedule': crontab(minute=15),  # Cada hora, solo proyectos modificados
+        'kwargs': {'incremental': True},
+    },
+    'update-project-metrics-full': {
+        'task': 'apps.projects.tasks.update_project_metrics',
+        'schedule': crontab(hour=2, minute=45),  # Diariamente: refleja registros de tiempo eliminados
+        'kwargs': {'incremental': False},
+    },
     'predict-resource-availability': {
         'task': 'apps.resources.tasks.predict_resource_availability',
         'schedule': crontab(day_of_week=1, hour=9, minute=0),  # Lunes a las 9 AM
     },
+    'reconcile-resources-qdrant': {
+        'task': 'apps.resources.tasks.reconcile_resources_qdrant',
+        'schedule': crontab(hour=3, minute=0),  # Diariamente a las 3 AM, solo corrige el drift
+    },
+    'rebuild-role-candidates': {
+        'task': 'apps.resources.tasks.rebuild_role_candidates',
+        'schedule': crontab(hour=3, minute=30),  # Red de seguridad: los cambios se refrescan al guardarse
+    },
 }
 
+
+@worker_process_init.connect
+def warmup_vector_service(**kwargs):
+    """Precarga el modelo de embeddings en cada proceso worker (no en el proceso padre)."""
+    from django.conf import settings
+
+    if getattr(settings, 'VECTOR_WARMUP_ON_BOOT', True):
+        from apps.resources.services import vector_service
+        vector_service.warmup()
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -0,0 +1,20 @@
+"""
+Configuración de gunicorn para SIGRP.
+
+Uso:
+    gunicorn config.wsgi:application -c config/gunicorn.conf.py
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+
+
+def post_worker_init(worker):
+    """Precarga el modelo de embeddings en cada worker antes de aceptar requests."""
+    from django.conf import settings
+
+    if getattr(settings, 'VECTOR_WARMUP_ON_BOOT', True):
+        from apps.resources.services import vector_service
+        vector_service.warmup()
@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party
     'django_htmx',
@@ -46,6 +47,7 @@ if DEBUG:
     INSTALLED_APPS += ['debug_toolbar']
 
 MIDDLEWARE = [
+    'apps.core.performance.PerformanceMonitoringMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -139,18 +141,57 @@ CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 # Redis Cache
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'apps.core.cache.InstrumentedRedisCache',
         'LOCATION': os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
     }
 }
 
+# Dashboard ejecutivo: TTL de las secciones cacheadas (se invalidan por signals)
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', str(60 * 60 * 24)))
+
+# Performance Monitoring (apps.core.performance)
+PERF_MONITORING_ENABLED = os.getenv('PERF_MONITORING_ENABLED', 'True') == 'True'
+PERF_SAMPLE_RATE = float(os.getenv('PERF_SAMPLE_RATE', '0.1'))  # Fracción de requests instrumentados
+PERF_QUERY_BUDGET = int(os.getenv('PERF_QUERY_BUDGET', '50'))
+PERF_DB_TIME_BUDGET_MS = int(os.getenv('PERF_DB_TIME_BUDGET_MS', '500'))
+PERF_WALL_TIME_BUDGET_MS = int(os.getenv('PERF_WALL_TIME_BUDGET_MS', '1000'))
+PERF_TOP_DUPLICATES = 5
+PERF_METRICS_ALLOWED_IPS = os.getenv('PERF_METRICS_ALLOWED_IPS', '127.0.0.1').split(',')
+PERF_METRICS_PUBLISH_INTERVAL = int(os.getenv('PERF_METRICS_PUBLISH_INTERVAL', '10'))  # Segundos entre publicaciones de cada worker
+PERF_METRICS_WORKER_TTL = int(os.getenv('PERF_METRICS_WORKER_TTL', '300'))  # Expiración de la instantánea de un worker
+
 # NLP Settings
 SPACY_MODEL = os.getenv('SPACY_MODEL', 'es_core_news_sm')
 ENABLE_SENTIMENT_ANALYSIS = os.getenv('ENABLE_SENTIMENT_ANALYSIS', 'True') == 'True'
+NLP_CACHE_ENABLED = os.getenv('NLP_CACHE_ENABLED', 'True') == 'True'
+NLP_CACHE_TIMEOUT = int(os.getenv('NLP_CACHE_TIMEOUT', str(60 * 60 * 24 * 30)))  # Resultados por hash de texto
+SENTIMENT_BACKEND = os.getenv('SENTIMENT_BACKEND', 'lexicon')  # 'lexicon' (solo tokenizador) o 'spacy' (pipeline completo)
+SENTIMENT_LEXICON_NORMALIZE = os.getenv('SENTIMENT_LEXICON_NORMALIZE', 'False') == 'True'  # Tildes y formas flexionadas
+ENABLE_DUPLICATE_DETECTION = os.getenv('ENABLE_DUPLICATE_DETECTION', 'True') == 'True'
+DUPLICATE_STANDUP_THRESHOLD = float(os.getenv('DUPLICATE_STANDUP_THRESHOLD', '0.8'))  # Jaccard estimado (MinHash)
+DUPLICATE_STANDUP_WEIGHT = float(os.getenv('DUPLICATE_STANDUP_WEIGHT', '0.25'))  # Peso de un duplicado en agregaciones
+BLOCKER_LEXICONS = {}  # Reemplaza léxicos por severidad del detector (ver apps.standups.blockers)
 
 # Qdrant Vector Store
 QDRANT_HOST = os.getenv('QDRANT_HOST', 'localhost')
 QDRANT_PORT = int(os.getenv('QDRANT_PORT', '6333'))
+QDRANT_GRPC_PORT = int(os.getenv('QDRANT_GRPC_PORT', '6334'))
+QDRANT_PREFER_GRPC = os.getenv('QDRANT_PREFER_GRPC', 'False') == 'True'
+QDRANT_TIMEOUT = int(os.getenv('QDRANT_TIMEOUT', '10'))  # Segundos por petición
+QDRANT_RETRIES = int(os.getenv('QDRANT_RETRIES', '3'))  # Reintentos ante errores transitorios
+QDRANT_RETRY_BACKOFF = float(os.getenv('QDRANT_RETRY_BACKOFF', '0.5'))  # Backoff inicial (exponencial)
+QDRANT_CONNECT_COOLDOWN = int(os.getenv('QDRANT_CONNECT_COOLDOWN', '30'))  # Segundos sin reintentar tras un fallo de conexión
+QDRANT_HNSW_M = int(os.getenv('QDRANT_HNSW_M', '16'))
+QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv('QDRANT_HNSW_EF_CONSTRUCT', '100'))
+QDRANT_SEARCH_HNSW_EF = int(os.getenv('QDRANT_SEARCH_HNSW_EF')) if os.getenv('QDRANT_SEARCH_HNSW_EF') else None
+QDRANT_QUANTIZATION = os.getenv('QDRANT_QUANTIZATION', '')  # '' (sin cuantizar) o 'scalar' (int8)
+VECTOR_QUERY_CACHE_SIZE = int(os.getenv('VECTOR_QUERY_CACHE_SIZE', '1024'))  # LRU de embeddings de queries
+VECTOR_WARMUP_ON_BOOT = os.getenv('VECTOR_WARMUP_ON_BOOT', 'True') == 'True'  # Cargar modelo al iniciar workers
+ENABLE_BLOCKER_EMBEDDINGS = os.getenv('ENABLE_BLOCKER_EMBEDDINGS', 'True') == 'True'  # Bloqueadores similares
+ENABLE_ROLE_MATCHING = os.getenv('ENABLE_ROLE_MATCHING', 'True') == 'True'  # Candidatos por rol (RoleCandidate)
+ROLE_CANDIDATES_TOP_K = int(os.getenv('ROLE_CANDIDATES_TOP_K', '10'))  # Recursos guardados por rol
+ENABLE_STAFFING_RECOMMENDATIONS = os.getenv('ENABLE_STAFFING_RECOMMENDATIONS', 'True') == 'True'  # Botón "Sugerir recursos" en asignación de tareas
+STAFFING_WEIGHTS = {}  # Reemplaza pesos del recomendador de staffing (skill, margin, capacity), ver apps.projects.staffing
 
 # Authentication URLs
 LOGIN_URL = '/admin/login/'  # Usar login del admin temporalmente
@@ -7,3 +7,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_wsgi_application()
+
+# Los requests no reintentan llamadas a Qdrant (ver apps.resources.qdrant)
+from apps.resources.qdrant import disable_retries  # noqa: E402
+
+disable_retries()
@@ -0,0 +1,56 @@
+"""Fixtures compartidas por los tests de las apps (datos mínimos en la base de tests)."""
+from datetime import date
+from decimal import Decimal
+from itertools import count
+
+import pytest
+
+_codes = count(1)
+
+
+@pytest.fixture
+def make_role(db):
+    from apps.resources.models import Role
+
+    def make(**fields):
+        n = next(_codes)
+        return Role.objects.create(**{
+            'name': f'Rol {n}', 'code': f'R{n}', 'category': 'technical',
+            'standard_rate': Decimal('100.00'), **fields,
+        })
+
+    return make
+
+
+@pytest.fixture
+def make_resource(db, make_role, monkeypatch):
+    from apps.resources.models import Resource
+    from apps.resources.services import vector_service
+
+    # Sin sincronización con Qdrant al guardar (ver apps.resources.signals)
+    monkeypatch.setattr(vector_service, 'upsert_resource', lambda resource: False)
+
+    def make(**fields):
+        n = next(_codes)
+        if 'primary_role' not in fields:
+            fields['primary_role'] = make_role()
+        return Resource.objects.create(**{
+            'employee_id': f'E{n}', 'first_name': 'Recurso', 'last_name': str(n),
+            'email': f'recurso{n}@example.com', 'internal_cost': Decimal('50.00'), **fields,
+        })
+
+    return make
+
+
+@pytest.fixture
+def make_project(db):
+    from apps.projects.models import Project
+
+    def make(**fields):
+        n = next(_codes)
+        return Project.objects.create(**{
+            'code': f'P{n}', 'name': f'Proyecto {n}', 'client_name': 'Cliente',
+            'start_date': date(2025, 1, 1), 'end_date': date(2025, 12, 31), **fields,
+        })
+
+    return make